@@ -1,6 +1,7 @@
 package main
 
 import (
+	"errors"
 	"fmt"
 	"os"
 
@@ -29,6 +30,7 @@ type config struct {
 	Apis struct {
 		Port     uint   `yaml:"port" toml:"port"`
 		Address  string `yaml:"address" toml:"address"`
+		Socket   string `yaml:"socket" toml:"socket"`
 		LogLevel string `yaml:"log_level" toml:"log_level"`
 	} `yaml:"apis" toml:"apis"`
 
@@ -64,6 +66,23 @@ func readConfig(path string) (*config, error) {
 	return &cfg, nil
 }
 
+// removeStaleSocket removes the Unix socket left behind at the given path by a previous run, if any, so that it can be
+// bound again. Files that are not sockets are never removed
+func removeStaleSocket(path string) error {
+	info, err := os.Lstat(path)
+	if errors.Is(err, os.ErrNotExist) {
+		return nil
+	}
+	if err != nil {
+		return err
+	}
+
+	if info.Mode()&os.ModeSocket == 0 {
+		return fmt.Errorf("%s already exists and is not a socket", path)
+	}
+	return os.Remove(path)
+}
+
 func main() {
 	log.Logger = log.Output(zerolog.ConsoleWriter{Out: os.Stdout})
 
@@ -94,6 +113,24 @@ func main() {
 	youtube.RegisterGinHandler(r, cfg.Youtube)
 	instagram.RegisterGinHandler(r, cfg.Instagram)
 
+	// Serve the co-located data sources over a Unix domain socket as well, if configured
+	if cfg.Apis.Socket != "" {
+		// A socket left behind by a crash would make binding fail
+		err = removeStaleSocket(cfg.Apis.Socket)
+		if err != nil {
+			panic(err)
+		}
+
+		go func() {
+			log.Info().Msgf("running on socket %s", cfg.Apis.Socket)
+			err := r.RunUnix(cfg.Apis.Socket)
+			if err != nil {
+				// Do not keep running without the transport the co-located data sources rely on
+				log.Fatal().Err(err).Msg("error while serving on socket")
+			}
+		}()
+	}
+
 	// Run the server
 	port := cfg.Apis.Port
 	if port == 0 {
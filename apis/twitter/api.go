@@ -8,7 +8,7 @@ import (
 )
 
 const (
-	userFields = "user.fields=created_at,description"
+	userFields = "user.fields=created_at,description,entities"
 )
 
 // API allows to query data from the Twitter APIs
@@ -90,15 +90,32 @@ func convertUserResponse(response userResponseJSON) (*User, error) {
 		user.Name,
 		user.Username,
 		user.Bio,
+		convertURLEntities(user.Entities.Description.URLs),
 	), nil
 }
 
+// convertURLEntities converts the given urlEntityJSON objects into URL objects, using the most expanded URL available
+func convertURLEntities(entities []urlEntityJSON) []URL {
+	urls := make([]URL, len(entities))
+	for i, entity := range entities {
+		expandedURL := entity.UnwoundURL
+		if expandedURL == "" {
+			expandedURL = entity.ExpandedURL
+		}
+		if expandedURL == "" {
+			expandedURL = entity.URL
+		}
+		urls[i] = NewURL(entity.URL, expandedURL)
+	}
+	return urls
+}
+
 // GetTweet returns the details of the Tweet having the given id
 func (api *API) GetTweet(id string) (*Tweet, error) {
 	// Build the request endpoint. Example:
-	// https://api.twitter.com/2/tweets?ids=1228393702244134912&tweet.fields=text
+	// https://api.twitter.com/2/tweets?ids=1228393702244134912&tweet.fields=text,entities
 	endpoint := fmt.Sprintf(
-		"%s/2/tweets?ids=%s&tweet.fields=text&expansions=author_id&%s",
+		"%s/2/tweets?ids=%s&tweet.fields=text,entities&expansions=author_id&%s",
 		api.endpoint, id, userFields)
 
 	// Create the request
@@ -143,12 +160,14 @@ func convertTweetResponse(response tweetResponseJSON) (*Tweet, error) {
 	return NewTweet(
 		tweet.ID,
 		tweet.Text,
+		convertURLEntities(tweet.Entities.URLs),
 		tweet.CreatedAt,
 		NewUser(
 			user.ID,
 			user.Name,
 			user.Username,
 			user.Bio,
+			convertURLEntities(user.Entities.Description.URLs),
 		),
 	), nil
 }
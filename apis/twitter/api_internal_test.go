@@ -0,0 +1,66 @@
+package twitter
+
+import (
+	"testing"
+
+	"github.com/stretchr/testify/require"
+)
+
+func TestConvertURLEntities(t *testing.T) {
+	testCases := []struct {
+		name     string
+		entities []urlEntityJSON
+		expected []URL
+	}{
+		{
+			name:     "nil entities return an empty list",
+			entities: nil,
+			expected: []URL{},
+		},
+		{
+			name:     "empty entities return an empty list",
+			entities: []urlEntityJSON{},
+			expected: []URL{},
+		},
+		{
+			name: "unwound URL is preferred",
+			entities: []urlEntityJSON{{
+				URL:         "https://t.co/uD23HgSLJW",
+				ExpandedURL: "https://bit.ly/3tJ8Qk1",
+				UnwoundURL:  "https://pastebin.com/raw/xz4S8WrW",
+			}},
+			expected: []URL{NewURL("https://t.co/uD23HgSLJW", "https://pastebin.com/raw/xz4S8WrW")},
+		},
+		{
+			name: "expanded URL is used without unwound URL",
+			entities: []urlEntityJSON{{
+				URL:         "https://t.co/uD23HgSLJW",
+				ExpandedURL: "https://pastebin.com/raw/xz4S8WrW",
+			}},
+			expected: []URL{NewURL("https://t.co/uD23HgSLJW", "https://pastebin.com/raw/xz4S8WrW")},
+		},
+		{
+			name:     "short URL is used without any expanded URL",
+			entities: []urlEntityJSON{{URL: "https://t.co/uD23HgSLJW"}},
+			expected: []URL{NewURL("https://t.co/uD23HgSLJW", "https://t.co/uD23HgSLJW")},
+		},
+		{
+			name: "order is preserved",
+			entities: []urlEntityJSON{
+				{URL: "https://t.co/uD23HgSLJW", ExpandedURL: "https://pastebin.com/raw/xz4S8WrW"},
+				{URL: "https://t.co/aZ1Ab0cD", UnwoundURL: "https://forbole.com"},
+			},
+			expected: []URL{
+				NewURL("https://t.co/uD23HgSLJW", "https://pastebin.com/raw/xz4S8WrW"),
+				NewURL("https://t.co/aZ1Ab0cD", "https://forbole.com"),
+			},
+		},
+	}
+
+	for _, tc := range testCases {
+		tc := tc
+		t.Run(tc.name, func(t *testing.T) {
+			require.Equal(t, tc.expected, convertURLEntities(tc.entities))
+		})
+	}
+}
@@ -2,12 +2,22 @@ package twitter
 
 import "time"
 
+// urlEntityJSON contains the data of a URL found inside a text, as retrieved from the Twitter APIs
+type urlEntityJSON struct {
+	URL         string `json:"url"`
+	ExpandedURL string `json:"expanded_url"`
+	UnwoundURL  string `json:"unwound_url"`
+}
+
 // tweetJSON contains the data of a tweet that is retrieved from the Twitter APIs
 type tweetJSON struct {
 	AuthorID  string    `json:"author_id"`
 	CreatedAt time.Time `json:"created_at"`
 	ID        string    `json:"id"`
 	Text      string    `json:"text"`
+	Entities  struct {
+		URLs []urlEntityJSON `json:"urls"`
+	} `json:"entities"`
 }
 
 // userJSON contains the data of a user retrieved from the Twitter APIs
@@ -16,6 +26,11 @@ type userJSON struct {
 	Name     string `json:"name"`
 	Username string `json:"username"`
 	Bio      string `json:"description"`
+	Entities struct {
+		Description struct {
+			URLs []urlEntityJSON `json:"urls"`
+		} `json:"description"`
+	} `json:"entities"`
 }
 
 // tweetResponseJSON contains the data that is returned from the Twitter v2 /tweet REST API
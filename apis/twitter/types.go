@@ -2,21 +2,39 @@ package twitter
 
 import "time"
 
+// URL contains the details of a URL found inside a tweet text or a user bio
+type URL struct {
+	URL         string `json:"url"`
+	ExpandedURL string `json:"expanded_url"`
+}
+
+// NewURL allows to build a new URL instance
+func NewURL(url, expandedURL string) URL {
+	return URL{
+		URL:         url,
+		ExpandedURL: expandedURL,
+	}
+}
+
+// -------------------------------------------------------------------------------------------------------------------
+
 // User contains the details of a Twitter user
 type User struct {
 	ID       string `json:"id"`
 	Name     string `json:"name"`
 	Username string `json:"username"`
 	Bio      string `json:"bio"`
+	BioURLs  []URL  `json:"bio_urls,omitempty"`
 }
 
 // NewUser allows to build a new User instance
-func NewUser(id, name, username, bio string) *User {
+func NewUser(id, name, username, bio string, bioURLs []URL) *User {
 	return &User{
 		ID:       id,
 		Name:     name,
 		Username: username,
 		Bio:      bio,
+		BioURLs:  bioURLs,
 	}
 }
 
@@ -26,15 +44,17 @@ func NewUser(id, name, username, bio string) *User {
 type Tweet struct {
 	ID           string    `json:"id"`
 	Text         string    `json:"text"`
+	URLs         []URL     `json:"urls,omitempty"`
 	CreationTime time.Time `json:"creation_time"`
 	Author       *User     `json:"author"`
 }
 
 // NewTweet allows to build a new Tweet instance
-func NewTweet(id, text string, creationTime time.Time, author *User) *Tweet {
+func NewTweet(id, text string, urls []URL, creationTime time.Time, author *User) *Tweet {
 	return &Tweet{
 		ID:           id,
 		Text:         text,
+		URLs:         urls,
 		CreationTime: creationTime,
 		Author:       author,
 	}
@@ -0,0 +1,136 @@
+import asyncio
+import contextvars
+import functools
+import os
+import queue
+import threading
+from concurrent.futures import Executor, Future
+from typing import Callable, List, Optional, TypeVar
+
+import cancellation
+import proofs
+
+# Maximum number of blocking calls (eg. HTTP requests) run at the same time on behalf of the coroutines of the whole
+# process. Each blocking call holds one of these threads until it completes, so this also caps the number of network
+# operations in flight, while the coroutines waiting for a free thread do not hold any
+MAX_WORKERS = int(os.environ.get("THEMIS_ASYNC_WORKERS", "64"))
+
+T = TypeVar("T")
+
+_executor = None
+_lock = threading.Lock()
+
+
+class DaemonExecutor(Executor):
+    """
+    Thread pool whose threads do not keep the process alive. Unlike ThreadPoolExecutor, whose threads are waited for
+    when the interpreter exits, the blocking calls still running at that point (eg. the fetches whose result is not
+    needed anymore) are abandoned, so that the process exits as soon as its result is known.
+    """
+
+    def __init__(self, max_workers: int):
+        self.max_workers = max_workers
+        self._queue = queue.SimpleQueue()
+        self._threads = []
+        self._idle = threading.Semaphore(0)
+        self._lock = threading.Lock()
+
+    def submit(self, fn: Callable[..., T], *args, **kwargs) -> Future:
+        future = Future()
+        with self._lock:
+            self._queue.put((future, fn, args, kwargs))
+            if not self._idle.acquire(blocking=False) and len(self._threads) < self.max_workers:
+                thread = threading.Thread(target=self._work, daemon=True)
+                thread.start()
+                self._threads.append(thread)
+        return future
+
+    def _work(self):
+        while True:
+            future, fn, args, kwargs = self._queue.get()
+            if future is None:
+                return
+
+            if future.set_running_or_notify_cancel():
+                try:
+                    future.set_result(fn(*args, **kwargs))
+                except BaseException as err:
+                    future.set_exception(err)
+            self._idle.release()
+
+    def shutdown(self, wait: bool = True):
+        with self._lock:
+            threads, self._threads = self._threads, []
+            for _ in threads:
+                self._queue.put((None, None, None, None))
+
+        if wait:
+            for thread in threads:
+                thread.join()
+
+
+def get_executor() -> DaemonExecutor:
+    """
+    Returns the executor shared by all the coroutines to run their blocking calls, creating it if needed.
+    """
+    global _executor
+    with _lock:
+        if _executor is None:
+            _executor = DaemonExecutor(max_workers=MAX_WORKERS)
+        return _executor
+
+
+async def run(func: Callable[..., T], *args, **kwargs) -> T:
+    """
+    Runs the given blocking function inside the shared executor, without blocking the event loop.
+    The function runs within a copy of the current context, so that it shares the deadline of the calling coroutine.
+    """
+    context = contextvars.copy_context()
+    call = functools.partial(context.run, func, *args, **kwargs)
+    return await asyncio.get_running_loop().run_in_executor(get_executor(), call)
+
+
+async def find_first_proof(
+        urls: List[str],
+        fetch: Callable[[str], Optional[T]],
+        max_workers: int = proofs.MAX_WORKERS,
+) -> Optional[T]:
+    """
+    Fetches the given URLs concurrently, and returns the result of the earliest one that contains a valid proof.
+    URLs are always checked in the given order, so a valid proof found inside a later URL is used only if all the
+    previous ones do not contain any. Once the result is known, the fetches that have not started yet are dropped,
+    while the ones in progress are cancelled (see cancellation) and stop at their next request or chunk of body, or
+    right away if blocked reading a body. Since the executor threads do not keep the process alive, a process can
+    exit as soon as the result is known.
+    See proofs.fetch_proof for how each URL is fetched.
+    :param urls: List of URLs to be checked, in the order in which they appear.
+    :param fetch: Blocking function returning the proof found inside the given URL, or None if it does not contain any.
+    :param max_workers: Maximum number of URLs that are fetched at the same time, so that a single invocation having
+    many URLs does not take most of the shared executor.
+    :return: The first proof found, or None if no URL contains a valid proof.
+    """
+    semaphore = asyncio.Semaphore(max_workers)
+    cancellations = [cancellation.Cancellation() for _ in urls]
+
+    async def fetch_proof(url: str, fetch_cancellation: cancellation.Cancellation) -> Optional[T]:
+        # Each task runs within its own copy of the context, shared with its blocking calls only
+        cancellation.set_current(fetch_cancellation)
+        async with semaphore:
+            return await run(proofs.fetch_proof, fetch, url)
+
+    tasks = [asyncio.ensure_future(fetch_proof(url, c)) for url, c in zip(urls, cancellations)]
+    try:
+        for task in tasks:
+            result = await task
+            if result is not None:
+                return result
+
+        return None
+    finally:
+        for task, fetch_cancellation in zip(tasks, cancellations):
+            if not task.done():
+                fetch_cancellation.cancel()
+                task.cancel()
+            elif not task.cancelled():
+                # The failures of the fetches whose results are not needed anymore are ignored
+                task.exception()
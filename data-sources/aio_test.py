@@ -0,0 +1,141 @@
+import asyncio
+import os
+import subprocess
+import sys
+import threading
+import time
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import aio
+import cancellation
+import circuit
+import deadline
+import negcache
+import session
+
+# Script racing a fast proof against a host that stalls in the middle of the body, printing the winning proof
+RACE_SCRIPT = """
+import asyncio, sys, threading, time
+from http.server import ThreadingHTTPServer
+import aio, aio_test, session
+
+server = ThreadingHTTPServer(("127.0.0.1", 0), aio_test.StalledBodyHandler)
+threading.Thread(target=server.serve_forever, daemon=True).start()
+stalled = f"http://127.0.0.1:{server.server_address[1]}/proof.json"
+
+def fetch(url):
+    if url == stalled:
+        return session.get_json_object(url)
+    time.sleep(0.3)
+    return url
+
+print(asyncio.run(aio.find_first_proof(["https://a.com", stalled], fetch)))
+"""
+
+
+class StalledBodyHandler(BaseHTTPRequestHandler):
+    """
+    Handler of a host that starts sending a JSON object, and then stalls.
+    """
+
+    def do_GET(self):
+        self.send_response(200)
+        self.send_header("Content-Length", "1024")
+        self.end_headers()
+        self.wfile.write(b"{")
+        self.wfile.flush()
+        time.sleep(5)
+
+    def log_message(self, *args):
+        pass
+
+
+class AioTest(unittest.TestCase):
+
+    def tearDown(self):
+        negcache.urls.clear()
+
+    def test_run(self):
+        @deadline.with_deadline
+        async def verify():
+            # Blocking calls share the deadline of the calling coroutine
+            return await aio.run(lambda: (threading.current_thread(), deadline.current())), deadline.current()
+
+        (thread, blocking_deadline), coroutine_deadline = asyncio.run(verify())
+        self.assertIsNot(threading.main_thread(), thread)
+        self.assertIsNotNone(coroutine_deadline)
+        self.assertIs(coroutine_deadline, blocking_deadline)
+
+    def test_find_first_proof(self):
+        # The first URL is the slowest one, but it should still win over the later ones
+        delays = {'https://a.com': 0.2, 'https://b.com': 0, 'https://c.com': None}
+
+        def fetch(url):
+            if delays[url] is None:
+                raise ValueError("Not a proof")
+            time.sleep(delays[url])
+            return url
+
+        self.assertEqual('https://a.com', asyncio.run(aio.find_first_proof(list(delays.keys()), fetch)))
+        self.assertIsNone(asyncio.run(aio.find_first_proof([], fetch)))
+        self.assertIsNone(asyncio.run(aio.find_first_proof(['https://d.com'], lambda url: None)))
+
+    def test_find_first_proof_cancels_fetches(self):
+        server = ThreadingHTTPServer(("127.0.0.1", 0), StalledBodyHandler)
+        server.daemon_threads = True
+        threading.Thread(target=server.serve_forever, args=(0.05,), daemon=True).start()
+        self.addCleanup(server.server_close)
+        self.addCleanup(server.shutdown)
+        self.addCleanup(circuit.reset)
+        stalled = f"http://127.0.0.1:{server.server_address[1]}/proof.json"
+
+        outcome = {}
+        done = threading.Event()
+
+        def fetch(url):
+            if url != stalled:
+                time.sleep(0.3)
+                return url
+
+            try:
+                return session.get_json_object(url)
+            except Exception as err:
+                outcome['error'] = err
+                done.set()
+                raise
+
+        start = time.monotonic()
+        self.assertEqual('https://a.com', asyncio.run(aio.find_first_proof(['https://a.com', stalled], fetch)))
+
+        # The stalled download is interrupted as soon as its result is not needed anymore
+        self.assertTrue(done.wait(1))
+        self.assertIsInstance(outcome['error'], cancellation.CancelledError)
+        self.assertLess(time.monotonic() - start, 1.5)
+        self.assertFalse(negcache.urls.contains(stalled))
+
+    def test_find_first_proof_process_exit(self):
+        # The process exits as soon as the proof is found, without waiting for the fetches in progress
+        start = time.monotonic()
+        result = subprocess.run([sys.executable, '-c', RACE_SCRIPT], capture_output=True, text=True, timeout=30,
+                                cwd=os.path.dirname(os.path.abspath(aio.__file__)))
+        self.assertEqual(0, result.returncode, result.stderr)
+        self.assertEqual('https://a.com', result.stdout.strip())
+        self.assertLess(time.monotonic() - start, 2)
+
+    def test_concurrency(self):
+        async def verify(index):
+            await aio.run(time.sleep, 0.1)
+            return index
+
+        async def verify_all():
+            return await asyncio.gather(*[verify(index) for index in range(50)])
+
+        # Verifications share the executor threads, rather than holding one each for their whole duration
+        start = time.monotonic()
+        self.assertEqual(list(range(50)), asyncio.run(verify_all()))
+        self.assertLess(time.monotonic() - start, 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
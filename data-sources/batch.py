@@ -0,0 +1,281 @@
+#!/usr/bin/env python3
+import argparse
+import json
+import os
+import sys
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, ThreadPoolExecutor, wait
+from typing import Iterable, Iterator, Optional
+
+import ratelimit
+import themis
+import verifier
+
+STATUS_OK = "ok"
+STATUS_ERROR = "error"
+
+EXECUTORS = {
+    "thread": ThreadPoolExecutor,
+    "process": ProcessPoolExecutor,
+}
+
+
+class Checkpoint:
+    """
+    Append-only file keeping track of the records that have already been verified, so that an interrupted batch run
+    can be resumed without verifying them again.
+
+    Each verified record result is appended to the file as soon as it is available. Every given number of results,
+    an {"offset": N} line is appended as well, telling that all the records before the N-th one have been verified.
+    """
+
+    def __init__(self, path: str, interval: int = 100):
+        self.path = path
+        self.interval = interval
+        self.offset = 0
+        self.done = set()
+        self.resumed = False
+        self._load()
+
+        self._file = open(path, "a")
+        self._unsaved = 0
+
+    def _load(self):
+        if not os.path.exists(self.path):
+            return
+
+        with open(self.path) as file:
+            for line in file:
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    # The last line might have been partially written before the run was interrupted
+                    continue
+
+                self.resumed = True
+                if "index" in entry:
+                    if entry["index"] >= self.offset:
+                        self.done.add(entry["index"])
+                elif "offset" in entry and entry["offset"] > self.offset:
+                    # Only keep the records verified after the offset, so that memory does not grow with the run size
+                    self.offset = entry["offset"]
+                    self.done = {index for index in self.done if index >= self.offset}
+
+        self._advance()
+
+    def _advance(self):
+        while self.offset in self.done:
+            self.done.remove(self.offset)
+            self.offset += 1
+
+    def is_done(self, index: int) -> bool:
+        """
+        Tells whether the record having the given index has already been verified.
+        """
+        return index < self.offset or index in self.done
+
+    def skip(self, index: int):
+        """
+        Marks the record having the given index as one that does not need to be verified (eg. an empty line).
+        """
+        self.done.add(index)
+        self._advance()
+
+    def record(self, result: dict):
+        """
+        Appends the given result to the checkpoint file, saving the current offset if needed.
+        """
+        self._file.write(json.dumps(result) + "\n")
+        self._file.flush()
+        self.done.add(result["index"])
+        self._advance()
+
+        self._unsaved += 1
+        if self._unsaved >= self.interval:
+            self.save()
+
+    def save(self):
+        """
+        Appends the current offset to the checkpoint file, and makes sure everything is written to disk.
+        """
+        self._file.write(json.dumps({"offset": self.offset}) + "\n")
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self._unsaved = 0
+
+    def close(self):
+        self.save()
+        self._file.close()
+
+
+def verify_record(index: int, line: str) -> dict:
+    """
+    Verifies a single JSONL record, formed as {"application": "...", "call_data": "..."}.
+    :param index: Position of the record inside the input.
+    :param line: JSON encoded record.
+    :return: A dictionary containing the record index, application, call data, status, result or error, and the
+    number of seconds the verification took.
+    """
+    start = time.monotonic()
+    output = {"index": index}
+    try:
+        record = json.loads(line)
+        for key in ["application", "call_data"]:
+            if key not in record:
+                raise Exception(f"Missing '{key}' value")
+
+        output["application"] = record["application"]
+        output["call_data"] = record["call_data"]
+        output["result"] = themis.run(record["application"], record["call_data"])
+        output["status"] = STATUS_OK
+    except Exception as err:
+        output["status"] = STATUS_ERROR
+        output["error"] = str(err)
+
+    output["duration"] = round(time.monotonic() - start, 6)
+    return output
+
+
+def run_batch(
+        lines: Iterable[str],
+        workers: int = 8,
+        executor: str = "thread",
+        ordered: bool = True,
+        checkpoint: Optional[Checkpoint] = None,
+) -> Iterator[dict]:
+    """
+    Verifies all the given JSONL records using a pool of workers, yielding the results as soon as they are available.
+    At most twice as many records as workers are read ahead, so memory usage does not depend on the input size.
+    :param lines: JSONL records to be verified. Empty lines are skipped.
+    :param workers: Number of workers verifying the records at the same time.
+    :param executor: Kind of workers to be used, either "thread" or "process".
+    :param ordered: If True, results are yielded in input order. Otherwise, they are yielded in completion order.
+    :param checkpoint: Optional checkpoint used to skip the records that have already been verified, and to which
+    the new results are appended.
+    :return: An iterator over the results of verify_record.
+    """
+    if executor not in EXECUTORS:
+        raise Exception(f"Invalid executor: {executor}")
+
+    window = workers * 2
+    with EXECUTORS[executor](max_workers=workers) as pool:
+        pending = deque()
+        for index, line in enumerate(lines):
+            if checkpoint is not None and checkpoint.is_done(index):
+                continue
+
+            if not line.strip():
+                if checkpoint is not None:
+                    checkpoint.skip(index)
+                continue
+
+            pending.append(pool.submit(verify_record, index, line))
+            while len(pending) >= window:
+                yield from _checkpointed(_collect(pending, ordered), checkpoint)
+
+        while pending:
+            yield from _checkpointed(_collect(pending, ordered), checkpoint)
+
+
+def _checkpointed(results: Iterator[dict], checkpoint: Optional[Checkpoint]) -> Iterator[dict]:
+    """
+    Appends each of the given results to the given checkpoint, if any, before yielding it.
+    """
+    for result in results:
+        if checkpoint is not None:
+            checkpoint.record(result)
+        yield result
+
+
+def _collect(pending: deque, ordered: bool) -> Iterator[dict]:
+    """
+    Waits for at least one of the pending futures to complete, and yields the results that can be emitted.
+    """
+    if ordered:
+        yield pending.popleft().result()
+        while pending and pending[0].done():
+            yield pending.popleft().result()
+        return
+
+    done, _ = wait(pending, return_when=FIRST_COMPLETED)
+    for future in done:
+        pending.remove(future)
+        yield future.result()
+
+
+def main(argv=None):
+    """
+    Re-verifies, in bulk, the JSONL records read from a file or from the standard input.
+
+    Each input line must contain a JSON object formed as follows:
+
+    ```json
+    {
+      "application": "Name of the application (twitter, github, discord, twitch, domain, youtube, telegram, instagram)",
+      "call_data": "Hex encoded call data to be passed to the data source"
+    }
+    ```
+
+    For each record, a JSON object containing its "index", "application", "call_data", "status" ("ok" or "error"),
+    "result" or "error", and "duration" in seconds is written to the output.
+
+    With --adaptive, the number of requests in flight towards each upstream host adapts to its health: it grows while
+    the host answers quickly and without errors, and is cut upon timeouts, 429 and 5xx responses. In this case,
+    --workers is the upper bound of the records verified at the same time.
+
+    When using thread workers, the signatures are verified inside a pool of processes (one per CPU core unless
+    --verification-workers is given), so that they do not compete for the GIL with the workers fetching the proofs.
+
+    If a checkpoint file is given, all the results are appended to it as well. When the same command is run again
+    with the same checkpoint file, the records that have already been verified are skipped, so that an interrupted
+    run resumes where it stopped. In this case, the new results are appended to the output file instead of replacing
+    the ones written by the interrupted run.
+
+    Example:
+    python batch.py --input links.jsonl --output results.jsonl --workers 16 --unordered --checkpoint run.checkpoint
+    """
+    parser = argparse.ArgumentParser(description="Re-verify JSONL records of {application, call_data} in bulk")
+    parser.add_argument("--input", default="-", help="Input JSONL file, or - to read from the standard input")
+    parser.add_argument("--output", default="-", help="Output JSONL file, or - to write to the standard output")
+    parser.add_argument("--workers", type=int, default=8, help="Number of records verified at the same time")
+    parser.add_argument("--executor", choices=sorted(EXECUTORS.keys()), default="thread", help="Kind of workers")
+    parser.add_argument("--unordered", action="store_true", help="Write results in completion order")
+    parser.add_argument("--adaptive", action="store_true", help="Adapt the concurrency of each host to its health")
+    parser.add_argument("--checkpoint", help="Append-only file used to resume interrupted runs")
+    parser.add_argument("--checkpoint-interval", type=int, default=100, help="Number of results between checkpoints")
+    parser.add_argument("--verification-workers", type=int, default=verifier.WORKERS,
+                        help="Number of processes verifying the signatures, 0 for one per CPU core")
+    args = parser.parse_args(argv)
+
+    if args.adaptive:
+        # Set the variable as well, so that the setting is picked up by process workers too
+        os.environ["THEMIS_ADAPTIVE_LIMITS"] = "1"
+        ratelimit.configure(adaptive=True)
+
+    # Process workers already verify the signatures outside of the main process
+    if verifier.ENABLED and args.executor == "thread":
+        verifier.start(args.verification_workers)
+
+    checkpoint = Checkpoint(args.checkpoint, args.checkpoint_interval) if args.checkpoint else None
+
+    input_file = sys.stdin if args.input == "-" else open(args.input)
+    # Keep the results written by the interrupted run when resuming it
+    output_mode = "a" if checkpoint is not None and checkpoint.resumed else "w"
+    output_file = sys.stdout if args.output == "-" else open(args.output, output_mode)
+    try:
+        for result in run_batch(input_file, args.workers, args.executor, not args.unordered, checkpoint):
+            output_file.write(json.dumps(result) + "\n")
+            output_file.flush()
+    finally:
+        verifier.stop()
+        if checkpoint is not None:
+            checkpoint.close()
+        if input_file is not sys.stdin:
+            input_file.close()
+        if output_file is not sys.stdout:
+            output_file.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,165 @@
+import json
+import os
+import tempfile
+import time
+import types
+import unittest
+from unittest import mock
+
+import batch
+import themis
+
+
+def fake_main(args: str):
+    time.sleep(int(args, 16) / 1000)
+    if args == "00":
+        raise Exception("Invalid signature")
+    return f"value,signature,{args}"
+
+
+FAKE_APPLICATIONS = {'twitter': types.SimpleNamespace(main=fake_main)}
+
+
+def record(call_data: str) -> str:
+    return json.dumps({'application': 'twitter', 'call_data': call_data})
+
+
+class BatchTest(unittest.TestCase):
+
+    def test_verify_record(self):
+        tests = [
+            {
+                'name': 'Valid record',
+                'line': record('01'),
+                'status': 'ok',
+                'result': 'value,signature,01',
+            },
+            {
+                'name': 'Invalid signature',
+                'line': record('00'),
+                'status': 'error',
+                'error': 'Invalid signature',
+            },
+            {
+                'name': 'Invalid JSON',
+                'line': 'twitter,01',
+                'status': 'error',
+            },
+            {
+                'name': 'Missing call data',
+                'line': '{"application":"twitter"}',
+                'status': 'error',
+                'error': "Missing 'call_data' value",
+            },
+        ]
+
+        with mock.patch.dict(themis.APPLICATIONS, FAKE_APPLICATIONS):
+            for test in tests:
+                result = batch.verify_record(3, test['line'])
+                self.assertEqual(3, result['index'], test['name'])
+                self.assertEqual(test['status'], result['status'], test['name'])
+                self.assertIn('duration', result, test['name'])
+                if 'result' in test:
+                    self.assertEqual(test['result'], result['result'], test['name'])
+                if 'error' in test:
+                    self.assertEqual(test['error'], result['error'], test['name'])
+
+    def test_run_batch(self):
+        # The first records are the slowest ones
+        lines = [record('32'), record('14'), '', record('00'), record('01')]
+
+        with mock.patch.dict(themis.APPLICATIONS, FAKE_APPLICATIONS):
+            results = list(batch.run_batch(lines, workers=4, ordered=True))
+            self.assertEqual([0, 1, 3, 4], [r['index'] for r in results])
+            self.assertEqual(['ok', 'ok', 'error', 'ok'], [r['status'] for r in results])
+
+            results = list(batch.run_batch(lines, workers=4, ordered=False))
+            self.assertEqual([0, 1, 3, 4], sorted(r['index'] for r in results))
+            self.assertNotEqual(0, results[0]['index'])
+
+    def test_checkpoint(self):
+        path = os.path.join(tempfile.mkdtemp(), 'run.checkpoint')
+        lines = [record(f'{i:02x}') for i in range(1, 11)]
+        lines.insert(3, '')
+
+        calls = []
+
+        def counting_main(args: str):
+            calls.append(args)
+            return fake_main(args)
+
+        with mock.patch.dict(themis.APPLICATIONS, {'twitter': types.SimpleNamespace(main=counting_main)}):
+            # Interrupt the first run after 5 results
+            checkpoint = batch.Checkpoint(path, interval=2)
+            results = batch.run_batch(lines, workers=2, checkpoint=checkpoint)
+            first = [next(results) for _ in range(5)]
+            results.close()
+            checkpoint.close()
+
+            # Simulate a partially written line
+            with open(path, 'a') as file:
+                file.write('{"index": 9, "sta')
+
+            calls.clear()
+            checkpoint = batch.Checkpoint(path, interval=2)
+            second = list(batch.run_batch(lines, workers=2, checkpoint=checkpoint))
+            checkpoint.close()
+
+        # None of the records verified during the first run should have been verified again
+        self.assertEqual(set(), {r['call_data'] for r in first} & set(calls))
+        self.assertEqual([0, 1, 2, 4, 5, 6, 7, 8, 9, 10], sorted(r['index'] for r in first + second))
+
+        checkpoint = batch.Checkpoint(path)
+        self.assertEqual(11, checkpoint.offset)
+        checkpoint.close()
+
+    def test_checkpoint_load(self):
+        path = os.path.join(tempfile.mkdtemp(), 'run.checkpoint')
+        with open(path, 'w') as file:
+            for index in [0, 1, 3, 2, 14]:
+                file.write(json.dumps({'index': index}) + '\n')
+            file.write(json.dumps({'offset': 4}) + '\n')
+            file.write(json.dumps({'index': 12}) + '\n')
+
+        # Records before the offset are not kept in memory
+        checkpoint = batch.Checkpoint(path)
+        self.assertTrue(checkpoint.resumed)
+        self.assertEqual(4, checkpoint.offset)
+        self.assertEqual({12, 14}, checkpoint.done)
+        checkpoint.close()
+
+    def test_main_resume(self):
+        directory = tempfile.mkdtemp()
+        input_path = os.path.join(directory, 'input.jsonl')
+        output_path = os.path.join(directory, 'output.jsonl')
+        checkpoint_path = os.path.join(directory, 'run.checkpoint')
+        with open(input_path, 'w') as file:
+            file.write('\n'.join(record(f'{i:02x}') for i in range(1, 11)))
+
+        args = ['--input', input_path, '--output', output_path, '--checkpoint', checkpoint_path]
+        with mock.patch.dict(themis.APPLICATIONS, FAKE_APPLICATIONS):
+            batch.main(args)
+            # Running again must keep the results written by the previous run
+            batch.main(args)
+
+        with open(output_path) as file:
+            results = [json.loads(line) for line in file]
+        self.assertEqual(list(range(10)), [r['index'] for r in results])
+
+    def test_main(self):
+        directory = tempfile.mkdtemp()
+        input_path = os.path.join(directory, 'input.jsonl')
+        output_path = os.path.join(directory, 'output.jsonl')
+        with open(input_path, 'w') as file:
+            file.write('\n'.join(record(f'{i:02x}') for i in range(1, 21)))
+
+        with mock.patch.dict(themis.APPLICATIONS, FAKE_APPLICATIONS):
+            batch.main(['--input', input_path, '--output', output_path, '--workers', '3'])
+
+        with open(output_path) as file:
+            results = [json.loads(line) for line in file]
+        self.assertEqual(list(range(20)), [r['index'] for r in results])
+
+
+if __name__ == '__main__':
+    unittest.main()
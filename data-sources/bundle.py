@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+import argparse
+import ast
+import os
+import sys
+from typing import Dict, Optional
+
+# Code placed at the top of each bundled script, making the embedded modules importable before any other one
+LOADER = '''
+import importlib.abc
+import importlib.util
+import sys
+
+
+class _BundledModules(importlib.abc.MetaPathFinder, importlib.abc.Loader):
+    """
+    Imports the shared modules embedded inside this script, so that it does not need any file next to it.
+    """
+
+    def find_spec(self, name, path, target=None):
+        if name in _MODULES:
+            return importlib.util.spec_from_loader(name, self)
+        return None
+
+    def create_module(self, spec):
+        return None
+
+    def exec_module(self, module):
+        exec(compile(_MODULES[module.__name__], f"<bundled {module.__name__}>", "exec"), module.__dict__)
+
+
+sys.meta_path.insert(0, _BundledModules())
+'''
+
+
+def local_imports(source: str, directory: str) -> set:
+    """
+    Returns the names of the modules imported by the given source code that live inside the given directory.
+    """
+    names = set()
+    for node in ast.walk(ast.parse(source)):
+        if isinstance(node, ast.Import):
+            names.update(alias.name for alias in node.names)
+        elif isinstance(node, ast.ImportFrom) and node.level == 0 and node.module is not None:
+            names.add(node.module)
+
+    return {name for name in names if os.path.isfile(os.path.join(directory, f"{name}.py"))}
+
+
+def collect_modules(script: str) -> Dict[str, str]:
+    """
+    Returns the source code of all the shared modules the given script depends on, directly or not.
+    :param script: Path of the data source script.
+    :return: A dictionary associating each module name with its source code.
+    """
+    directory = os.path.dirname(os.path.abspath(script))
+    entry = os.path.splitext(os.path.basename(script))[0]
+    with open(script) as file:
+        pending = local_imports(file.read(), directory)
+
+    modules = {}
+    while pending:
+        name = pending.pop()
+        if name in modules or name == entry:
+            continue
+
+        with open(os.path.join(directory, f"{name}.py")) as file:
+            modules[name] = file.read()
+        pending.update(local_imports(modules[name], directory))
+
+    return modules
+
+
+def bundle(script: str) -> str:
+    """
+    Returns a self-contained version of the given data source script, embedding all the shared modules it depends on
+    so that it can be uploaded to Band Protocol as a single file. Third party packages (eg. requests) are still
+    imported from the executor environment.
+    """
+    with open(script) as file:
+        source = file.read()
+
+    modules = collect_modules(script)
+    lines = ["#!/usr/bin/env python3", f"# Bundled from {os.path.basename(script)}, do not edit", ""]
+    lines.append("_MODULES = {")
+    for name in sorted(modules):
+        lines.append(f"    {name!r}: {modules[name]!r},")
+    lines.append("}")
+    lines.append(LOADER)
+
+    # The script shebang is replaced by the bundle one
+    if source.startswith("#!"):
+        source = source.split("\n", 1)[1]
+    lines.append(source)
+    return "\n".join(lines)
+
+
+def main(argv: Optional[list] = None):
+    """
+    Bundles the given data source scripts into the output directory, so that each of them can be uploaded as a single
+    file using bandd tx oracle create-data-source --script <output>/<script>.
+
+    Example:
+    python bundle.py --output dist twitter.py github.py
+    """
+    parser = argparse.ArgumentParser(description="Bundle data sources into self-contained scripts")
+    parser.add_argument("scripts", nargs="+", help="Data source scripts to be bundled")
+    parser.add_argument("--output", default="dist", help="Directory where the bundled scripts are written")
+    args = parser.parse_args(argv)
+
+    os.makedirs(args.output, exist_ok=True)
+    for script in args.scripts:
+        path = os.path.join(args.output, os.path.basename(script))
+        with open(path, "w") as file:
+            file.write(bundle(script))
+        os.chmod(path, 0o755)
+        print(path, file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,33 @@
+import os
+import subprocess
+import sys
+import tempfile
+import unittest
+
+import bundle
+
+
+class BundleTest(unittest.TestCase):
+
+    def test_collect_modules(self):
+        modules = bundle.collect_modules(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'twitter.py'))
+        for name in ['aio', 'proofs', 'session', 'verification', 'verifier']:
+            self.assertIn(name, modules)
+        self.assertNotIn('twitter', modules)
+        self.assertNotIn('requests', modules)
+
+    def test_bundle(self):
+        directory = os.path.dirname(os.path.abspath(__file__))
+        with tempfile.TemporaryDirectory() as output:
+            bundle.main(['--output', output, os.path.join(directory, 'twitter.py')])
+
+            # The bundled script runs alone, without the shared modules next to it
+            result = subprocess.run([sys.executable, '-I', 'twitter.py', '7B7D'], cwd=output,
+                                    capture_output=True, text=True)
+
+        self.assertEqual(1, result.returncode)
+        self.assertEqual("Missing 'method' value\n", result.stderr)
+
+
+if __name__ == '__main__':
+    unittest.main()
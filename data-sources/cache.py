@@ -0,0 +1,66 @@
+import threading
+from collections import OrderedDict
+from typing import Any, Hashable, List, Tuple
+
+
+class LRUCache:
+    """
+    Thread-safe cache holding at most a given number of entries, evicting the least recently used ones first.
+    It keeps track of the number of hits and misses, so that its effectiveness can be monitored.
+    """
+
+    def __init__(self, max_size: int):
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """
+        Returns the value associated with the given key, or the given default value if the key is not cached.
+        """
+        with self._lock:
+            if key not in self._entries:
+                self.misses += 1
+                return default
+
+            self.hits += 1
+            self._entries.move_to_end(key)
+            return self._entries[key]
+
+    def put(self, key: Hashable, value: Any):
+        """
+        Associates the given value with the given key, evicting the least recently used entry if the cache is full.
+        """
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def items(self) -> List[Tuple[Hashable, Any]]:
+        """
+        Returns all the cached entries, from the least to the most recently used one.
+        """
+        with self._lock:
+            return list(self._entries.items())
+
+    def clear(self):
+        """
+        Removes all the cached entries and resets the counters.
+        """
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self) -> dict:
+        """
+        Returns the number of hits, misses and entries of the cache.
+        """
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses, "size": len(self._entries), "max_size": self.max_size}
+
+    def __len__(self):
+        return len(self._entries)
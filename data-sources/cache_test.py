@@ -0,0 +1,36 @@
+import unittest
+
+import cache
+
+
+class LRUCacheTest(unittest.TestCase):
+
+    def test_get_and_put(self):
+        lru = cache.LRUCache(2)
+        self.assertIsNone(lru.get('a'))
+
+        lru.put('a', 1)
+        lru.put('b', 2)
+        self.assertEqual(1, lru.get('a'))
+
+        # 'b' is now the least recently used entry, so it should be evicted first
+        lru.put('c', 3)
+        self.assertIsNone(lru.get('b'))
+        self.assertEqual(1, lru.get('a'))
+        self.assertEqual(3, lru.get('c'))
+        self.assertEqual([('a', 1), ('c', 3)], lru.items())
+
+    def test_stats(self):
+        lru = cache.LRUCache(10)
+        lru.put('a', 1)
+        lru.get('a')
+        lru.get('a')
+        lru.get('b')
+        self.assertEqual({'hits': 2, 'misses': 1, 'size': 1, 'max_size': 10}, lru.stats())
+
+        lru.clear()
+        self.assertEqual({'hits': 0, 'misses': 0, 'size': 0, 'max_size': 10}, lru.stats())
+
+
+if __name__ == '__main__':
+    unittest.main()
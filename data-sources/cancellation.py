@@ -0,0 +1,107 @@
+import contextlib
+import contextvars
+import threading
+from typing import Callable, Optional
+
+
+class CancelledError(Exception):
+    """
+    Raised by the blocking calls of an operation whose result is not needed anymore.
+    """
+
+    def __init__(self):
+        super().__init__("Operation cancelled")
+
+
+class Cancellation:
+    """
+    Tells the blocking calls of an operation, running inside another thread, that its result is not needed anymore so
+    that they can stop as soon as possible instead of running to completion.
+    """
+
+    def __init__(self):
+        self._cancelled = False
+        self._callbacks = []
+        self._lock = threading.Lock()
+
+    def cancel(self):
+        """
+        Cancels the operation, running the callbacks registered by the blocking calls currently in progress.
+        """
+        with self._lock:
+            self._cancelled = True
+            callbacks, self._callbacks = self._callbacks, []
+
+        for callback in callbacks:
+            callback()
+
+    def cancelled(self) -> bool:
+        """
+        Tells whether the operation has been cancelled.
+        """
+        return self._cancelled
+
+    def check(self):
+        """
+        Makes sure the operation has not been cancelled.
+        :raise CancelledError if the operation has been cancelled.
+        """
+        if self._cancelled:
+            raise CancelledError()
+
+    @contextlib.contextmanager
+    def on_cancel(self, callback: Callable[[], None]):
+        """
+        Context manager running the given callback if the operation is cancelled while inside it, eg. to interrupt a
+        blocking read.
+        :raise CancelledError if the operation has already been cancelled.
+        """
+        with self._lock:
+            self.check()
+            self._callbacks.append(callback)
+
+        try:
+            yield
+        finally:
+            with self._lock:
+                if callback in self._callbacks:
+                    self._callbacks.remove(callback)
+
+
+_current = contextvars.ContextVar("cancellation", default=None)
+
+
+def current() -> Optional[Cancellation]:
+    """
+    Returns the cancellation of the operation that is currently running, if any.
+    """
+    return _current.get()
+
+
+def set_current(cancellation: Cancellation):
+    """
+    Makes the given cancellation the one of the operation running within the current context, and of the blocking
+    calls run on its behalf by aio.run.
+    """
+    _current.set(cancellation)
+
+
+def check():
+    """
+    Makes sure the current operation, if any, has not been cancelled.
+    :raise CancelledError if the operation has been cancelled.
+    """
+    cancellation = current()
+    if cancellation is not None:
+        cancellation.check()
+
+
+def on_cancel(callback: Callable[[], None]):
+    """
+    Context manager running the given callback if the current operation, if any, is cancelled while inside it.
+    :raise CancelledError if the operation has already been cancelled.
+    """
+    cancellation = current()
+    if cancellation is None:
+        return contextlib.nullcontext()
+    return cancellation.on_cancel(callback)
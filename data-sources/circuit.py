@@ -0,0 +1,133 @@
+import contextlib
+import os
+import threading
+import time
+import urllib.parse
+
+import metrics
+
+# Number of consecutive failures after which the requests towards a host start failing fast
+FAILURE_THRESHOLD = int(os.environ.get("THEMIS_BREAKER_FAILURES", "5"))
+
+# Number of seconds after which a probe request is let through towards a host whose requests are failing fast
+RESET_TIMEOUT = float(os.environ.get("THEMIS_BREAKER_RESET_TIMEOUT", "30"))
+
+STATE_CLOSED = "closed"
+STATE_OPEN = "open"
+STATE_HALF_OPEN = "half-open"
+
+_breakers = {}
+_lock = threading.Lock()
+
+
+class CircuitOpenError(Exception):
+    """
+    Raised when a request is not performed because its host is currently considered unhealthy.
+    """
+
+    def __init__(self, host: str):
+        super().__init__(f"Circuit open: {host} is unhealthy, request not performed")
+        self.host = host
+
+
+class CircuitBreaker:
+    """
+    Keeps track of the health of a single host.
+
+    While closed, all the requests are performed. After the given number of consecutive failures the circuit opens,
+    and all the requests fail immediately. Once the reset timeout has passed the circuit becomes half-open, and a
+    single probe request is performed: if it succeeds the circuit closes again, otherwise it opens again.
+    """
+
+    def __init__(self, host: str, failure_threshold: int = FAILURE_THRESHOLD, reset_timeout: float = RESET_TIMEOUT):
+        self.host = host
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = STATE_CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self._probing = False
+        self._lock = threading.Lock()
+
+    def before_request(self) -> bool:
+        """
+        Makes sure a request can be performed towards the host.
+        :return: True if the request is a probe that must report its outcome, False otherwise.
+        :raise CircuitOpenError if the request must not be performed.
+        """
+        with self._lock:
+            if self.state == STATE_OPEN and time.monotonic() - self.opened_at >= self.reset_timeout:
+                self._set_state(STATE_HALF_OPEN)
+
+            if self.state == STATE_CLOSED:
+                return False
+
+            if self.state == STATE_HALF_OPEN and not self._probing:
+                self._probing = True
+                return True
+
+        metrics.increment(f"circuit.{self.host}.rejected")
+        raise CircuitOpenError(self.host)
+
+    def record(self, failed: bool):
+        """
+        Reports the outcome of a request performed towards the host.
+        :param failed: Whether the request failed because of a network error or a 5xx response.
+        """
+        with self._lock:
+            self._probing = False
+            if not failed:
+                self.failures = 0
+                self._set_state(STATE_CLOSED)
+                return
+
+            self.failures += 1
+            if self.state == STATE_HALF_OPEN or self.failures >= self.failure_threshold:
+                self.opened_at = time.monotonic()
+                self._set_state(STATE_OPEN)
+
+    def release(self):
+        """
+        Lets another probe through, after a probe request ended without telling anything about the host health.
+        """
+        with self._lock:
+            self._probing = False
+
+    def _set_state(self, state: str):
+        if self.state != state:
+            self.state = state
+            metrics.increment(f"circuit.{self.host}.{state}")
+
+
+def get_breaker(host: str) -> CircuitBreaker:
+    """
+    Returns the circuit breaker shared by all the requests performed towards the given host.
+    """
+    with _lock:
+        if host not in _breakers:
+            _breakers[host] = CircuitBreaker(host)
+        return _breakers[host]
+
+
+@contextlib.contextmanager
+def guard(url: str):
+    """
+    Context manager that makes sure a request towards the given URL can be performed, yielding the breaker to which
+    its outcome should be reported using record.
+    :raise CircuitOpenError if the host of the URL is currently unhealthy.
+    """
+    breaker = get_breaker(urllib.parse.urlsplit(url).hostname or "")
+    probe = breaker.before_request()
+    try:
+        yield breaker
+    finally:
+        if probe:
+            breaker.release()
+
+
+def reset():
+    """
+    Forgets the health of all the hosts.
+    """
+    with _lock:
+        _breakers.clear()
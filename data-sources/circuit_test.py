@@ -0,0 +1,80 @@
+import unittest
+from unittest import mock
+
+import circuit
+import metrics
+
+
+class CircuitTest(unittest.TestCase):
+
+    def tearDown(self):
+        circuit.reset()
+
+    def test_get_breaker(self):
+        breaker = circuit.get_breaker('themis.mainnet.desmos.network')
+        self.assertIs(breaker, circuit.get_breaker('themis.mainnet.desmos.network'))
+        self.assertIsNot(breaker, circuit.get_breaker('pastebin.com'))
+
+    def test_open(self):
+        breaker = circuit.CircuitBreaker('pastebin.com', failure_threshold=3, reset_timeout=30)
+
+        # Successes reset the count of consecutive failures
+        for failed in [True, True, False, True, True]:
+            breaker.before_request()
+            breaker.record(failed)
+        self.assertEqual(circuit.STATE_CLOSED, breaker.state)
+
+        breaker.record(True)
+        self.assertEqual(circuit.STATE_OPEN, breaker.state)
+
+        metrics.reset()
+        with self.assertRaisesRegex(circuit.CircuitOpenError, 'pastebin.com is unhealthy'):
+            breaker.before_request()
+        self.assertEqual(1, metrics.snapshot()['counters']['circuit.pastebin.com.rejected'])
+
+    def test_half_open(self):
+        breaker = circuit.CircuitBreaker('pastebin.com', failure_threshold=1, reset_timeout=30)
+
+        with mock.patch('time.monotonic', return_value=100):
+            breaker.record(True)
+            self.assertEqual(circuit.STATE_OPEN, breaker.state)
+
+        with mock.patch('time.monotonic', return_value=130):
+            # A single probe is let through once the reset timeout has passed
+            self.assertTrue(breaker.before_request())
+            self.assertEqual(circuit.STATE_HALF_OPEN, breaker.state)
+            with self.assertRaises(circuit.CircuitOpenError):
+                breaker.before_request()
+
+            # A failed probe opens the circuit again
+            breaker.record(True)
+            self.assertEqual(circuit.STATE_OPEN, breaker.state)
+            with self.assertRaises(circuit.CircuitOpenError):
+                breaker.before_request()
+
+        with mock.patch('time.monotonic', return_value=160):
+            self.assertTrue(breaker.before_request())
+            breaker.record(False)
+            self.assertEqual(circuit.STATE_CLOSED, breaker.state)
+            self.assertFalse(breaker.before_request())
+
+    def test_guard(self):
+        breaker = circuit.get_breaker('pastebin.com')
+        breaker.failure_threshold = 1
+        breaker.reset_timeout = 0
+        breaker.record(True)
+
+        # Probes that end without an outcome let another probe through
+        with self.assertRaises(KeyError):
+            with circuit.guard('https://pastebin.com/raw/xz4S8WrW'):
+                raise KeyError()
+        self.assertEqual(circuit.STATE_HALF_OPEN, breaker.state)
+
+        with circuit.guard('https://pastebin.com/raw/xz4S8WrW') as guarded:
+            self.assertIs(breaker, guarded)
+            guarded.record(False)
+        self.assertEqual(circuit.STATE_CLOSED, breaker.state)
+
+
+if __name__ == '__main__':
+    unittest.main()
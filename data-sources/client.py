@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+import json
+import os
+import socket
+import sys
+
+# Name of the application whose data source should be used.
+# This must be changed before uploading the script (eg. "github", "discord", etc).
+APPLICATION = "twitter"
+
+SOCKET_PATH = os.environ.get("THEMIS_SOCKET", "/run/themis/themis.sock")
+
+
+def request(application: str, args: str, path: str = SOCKET_PATH) -> str:
+    """
+    Sends the given call data to the daemon listening on the given path, and returns its result.
+    :param application: Name of the application whose data source should be used (eg. "twitter").
+    :param args: Hex encoded call data to be forwarded to the data source.
+    :param path: Path of the Unix socket the daemon is listening on.
+    :return: The value returned by the data source main function.
+    :raise Exception if the data source returned an error.
+    """
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.connect(path)
+        sock.sendall(json.dumps({"application": application, "call_data": args}).encode() + b"\n")
+
+        response = b""
+        while True:
+            chunk = sock.recv(4096)
+            if not chunk:
+                break
+            response += chunk
+
+    response = json.loads(response)
+    if "error" in response:
+        raise Exception(response["error"])
+
+    return response["result"]
+
+
+def main(args: str):
+    """
+    Forwards the given call data to the data source daemon (see daemon.py) running on the same host.
+    This script does not depend on anything but the standard library, so it starts much faster than the data sources.
+
+    :param args: Hex encoded JSON object containing the arguments to be used during the execution.
+    :return The signed value, the signature and the username as a single comma separated string.
+    :raise Exception if the daemon is not reachable or the data source returned an error.
+    """
+    return request(APPLICATION, args)
+
+
+if __name__ == "__main__":
+    try:
+        print(main(*sys.argv[1:]))
+    except Exception as e:
+        print(str(e), file=sys.stderr)
+        sys.exit(1)
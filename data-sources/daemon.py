@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+import json
+import os
+import signal
+import socketserver
+import stat
+import sys
+
+import themis
+import verification
+import verifier
+
+# The socket lives inside a directory only the service can write to, so that no other user can bind it first
+SOCKET_PATH = os.environ.get("THEMIS_SOCKET", "/run/themis/themis.sock")
+
+# Permissions of the socket. Only the service user and its group (eg. the one of the Band executor) can connect to it
+SOCKET_MODE = int(os.environ.get("THEMIS_SOCKET_MODE", "660"), 8)
+
+# Path of the file where the signature verification results are persisted across restarts, if any
+VERIFICATION_CACHE_PATH = os.environ.get("THEMIS_VERIFICATION_CACHE")
+
+
+def handle_request(request: dict) -> dict:
+    """
+    Runs the data source associated with the given request, and returns the response that should be sent back.
+    :param request: Dictionary containing the "application" name and the hex encoded "call_data".
+    :return: A dictionary containing either the "result" of the data source or the "error" that has been raised.
+    """
+    for key in ["application", "call_data"]:
+        if key not in request:
+            return {"error": f"Missing '{key}' value"}
+
+    try:
+        return {"result": themis.run(request["application"], request["call_data"])}
+    except Exception as err:
+        return {"error": str(err)}
+
+
+class RequestHandler(socketserver.StreamRequestHandler):
+    """
+    Reads a single JSON encoded request from the connection, and writes back the JSON encoded response.
+    """
+
+    def handle(self):
+        try:
+            request = json.loads(self.rfile.readline())
+        except ValueError:
+            response = {"error": "Invalid request"}
+        else:
+            response = handle_request(request)
+
+        self.wfile.write(json.dumps(response).encode() + b"\n")
+
+
+class Server(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    """
+    Unix socket server that keeps all the data sources loaded, and serves each connection inside its own thread.
+    """
+
+    daemon_threads = True
+
+    def server_bind(self):
+        directory = os.path.dirname(os.path.abspath(self.server_address))
+        os.makedirs(directory, mode=0o755, exist_ok=True)
+        if os.stat(directory).st_mode & (stat.S_IWGRP | stat.S_IWOTH):
+            raise PermissionError(f"Socket directory {directory} must be writable only by its owner")
+
+        # Remove any socket left behind by a previous run
+        if os.path.exists(self.server_address):
+            os.unlink(self.server_address)
+
+        # Create the socket with its final permissions, so that it is never reachable by anyone else
+        umask = os.umask(0o777 & ~SOCKET_MODE)
+        try:
+            super().server_bind()
+        finally:
+            os.umask(umask)
+        os.chmod(self.server_address, SOCKET_MODE)
+
+    def server_close(self):
+        super().server_close()
+        if os.path.exists(self.server_address):
+            os.unlink(self.server_address)
+
+
+def main(path: str = SOCKET_PATH):
+    """
+    Starts the daemon, serving the requests received on the given Unix socket until interrupted.
+
+    Each request must be a single line containing a JSON object formed as follows:
+
+    ```json
+    {
+      "application": "Name of the application (twitter, github, discord, twitch, domain, youtube, telegram, instagram)",
+      "call_data": "Hex encoded call data to be passed to the data source"
+    }
+    ```
+
+    The response is a single line containing either {"result": "..."} or {"error": "..."}.
+
+    :param path: Path of the Unix socket to listen on.
+    """
+    if VERIFICATION_CACHE_PATH:
+        verification.load_cache(VERIFICATION_CACHE_PATH)
+
+    if verifier.ENABLED:
+        verifier.start()
+
+    # Stop gracefully when terminated, the same way as when interrupted
+    signal.signal(signal.SIGTERM, signal.default_int_handler)
+
+    with Server(path, RequestHandler) as server:
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            verifier.stop()
+            if VERIFICATION_CACHE_PATH:
+                verification.save_cache(VERIFICATION_CACHE_PATH)
+
+
+if __name__ == "__main__":
+    main(*sys.argv[1:])
@@ -0,0 +1,83 @@
+import os
+import stat
+import tempfile
+import threading
+import types
+import unittest
+from unittest import mock
+
+import client
+import daemon
+import themis
+
+
+def fake_main(args: str):
+    if args == "00":
+        raise Exception("Invalid signature")
+    return f"value,signature,{args}"
+
+
+class DaemonTest(unittest.TestCase):
+
+    def setUp(self):
+        self.path = os.path.join(tempfile.mkdtemp(), "themis.sock")
+        self.server = daemon.Server(self.path, daemon.RequestHandler)
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.thread.start()
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+        self.thread.join()
+
+    def test_handle_request(self):
+        tests = [
+            {
+                'name': 'Missing application',
+                'request': {'call_data': '7B7D'},
+                'response': {'error': "Missing 'application' value"},
+            },
+            {
+                'name': 'Missing call data',
+                'request': {'application': 'twitter'},
+                'response': {'error': "Missing 'call_data' value"},
+            },
+            {
+                'name': 'Invalid application',
+                'request': {'application': 'facebook', 'call_data': '7B7D'},
+                'response': {'error': 'Invalid application: facebook'},
+            },
+            {
+                'name': 'Invalid call data',
+                'request': {'application': 'twitter', 'call_data': '7B7D'},
+                'response': {'error': "Missing 'method' value"},
+            },
+        ]
+
+        for test in tests:
+            self.assertEqual(test['response'], daemon.handle_request(test['request']), test['name'])
+
+    def test_request(self):
+        with mock.patch.dict(themis.APPLICATIONS, {'twitter': types.SimpleNamespace(main=fake_main)}):
+            result = client.request('twitter', 'ricmontagnin', self.path)
+            self.assertEqual('value,signature,ricmontagnin', result)
+
+            with self.assertRaisesRegex(Exception, 'Invalid signature'):
+                client.request('twitter', '00', self.path)
+
+            with self.assertRaisesRegex(Exception, 'Invalid application: facebook'):
+                client.request('facebook', 'ricmontagnin', self.path)
+
+    def test_socket_permissions(self):
+        self.assertEqual(daemon.SOCKET_MODE, stat.S_IMODE(os.stat(self.path).st_mode))
+
+        # Directories other users can write to are refused, since anyone could bind the socket there first
+        directory = tempfile.mkdtemp()
+        os.chmod(directory, 0o777)
+        with self.assertRaisesRegex(PermissionError, 'must be writable only by its owner'):
+            daemon.Server(os.path.join(directory, 'themis.sock'), daemon.RequestHandler)
+        os.rmdir(directory)
+
+
+if __name__ == '__main__':
+    unittest.main()
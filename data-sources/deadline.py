@@ -0,0 +1,117 @@
+import asyncio
+import contextvars
+import functools
+import os
+import time
+from typing import Optional
+
+# Overall time budget, in seconds, of a single data source invocation
+BUDGET = float(os.environ.get("THEMIS_DEADLINE", "8"))
+
+# Maximum time, in seconds, that can be spent on a single call to the Themis APIs
+API_TIMEOUT = float(os.environ.get("THEMIS_API_TIMEOUT", "4"))
+
+# Maximum time, in seconds, that can be spent downloading a single proof URL
+PROOF_TIMEOUT = float(os.environ.get("THEMIS_PROOF_TIMEOUT", "3"))
+
+
+class DeadlineExceededError(Exception):
+    """
+    Raised when the time budget of an invocation has been spent.
+    """
+
+    def __init__(self, budget: float):
+        super().__init__(f"Deadline exceeded: invocation took more than {budget:g} seconds")
+        self.budget = budget
+
+
+class Deadline:
+    """
+    Keeps track of the time left to a single invocation.
+    """
+
+    def __init__(self, budget: float):
+        self.budget = budget
+        self.expires_at = time.monotonic() + budget
+
+    def remaining(self) -> float:
+        """
+        Returns the number of seconds left before the deadline expires.
+        """
+        return self.expires_at - time.monotonic()
+
+    def check(self):
+        """
+        Makes sure the deadline has not expired yet.
+        :raise DeadlineExceededError if the deadline has expired.
+        """
+        if self.remaining() <= 0:
+            raise DeadlineExceededError(self.budget)
+
+
+_current = contextvars.ContextVar("deadline", default=None)
+
+
+def current() -> Optional[Deadline]:
+    """
+    Returns the deadline of the invocation that is currently running, if any.
+    """
+    return _current.get()
+
+
+def check():
+    """
+    Makes sure the deadline of the current invocation, if any, has not expired yet.
+    :raise DeadlineExceededError if the deadline has expired.
+    """
+    deadline = current()
+    if deadline is not None:
+        deadline.check()
+
+
+def timeout(stage_timeout: float) -> float:
+    """
+    Returns the timeout that should be used by a request, making sure it does not exceed the current deadline.
+    :param stage_timeout: Maximum time that the request can take.
+    :return: The given timeout, capped to the time left before the current deadline expires.
+    :raise DeadlineExceededError if the current deadline has already expired.
+    """
+    deadline = current()
+    if deadline is None:
+        return stage_timeout
+
+    deadline.check()
+    return min(stage_timeout, deadline.remaining())
+
+
+def with_deadline(func):
+    """
+    Decorator that runs each call of the given function within its own deadline, unless one is already running.
+    Coroutine functions are supported as well, in which case the deadline starts when the coroutine starts running.
+    """
+    if asyncio.iscoroutinefunction(func):
+        @functools.wraps(func)
+        async def async_wrapper(*args, **kwargs):
+            if current() is not None:
+                return await func(*args, **kwargs)
+
+            token = _current.set(Deadline(BUDGET))
+            try:
+                return await func(*args, **kwargs)
+            finally:
+                _current.reset(token)
+
+        return async_wrapper
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        if current() is not None:
+            return func(*args, **kwargs)
+
+        token = _current.set(Deadline(BUDGET))
+        try:
+            return func(*args, **kwargs)
+        finally:
+            _current.reset(token)
+
+    return wrapper
@@ -0,0 +1,115 @@
+import threading
+import time
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest import mock
+
+import httpretty
+
+import circuit
+import deadline
+import session
+import twitter
+
+
+class StalledHandler(BaseHTTPRequestHandler):
+    """
+    Handler of a host that never answers in time.
+    """
+
+    def do_GET(self):
+        time.sleep(5)
+
+    def log_message(self, *args):
+        pass
+
+
+class DeadlineTest(unittest.TestCase):
+
+    def test_timeout(self):
+        # No deadline running
+        self.assertEqual(3, deadline.timeout(3))
+
+        @deadline.with_deadline
+        def run():
+            return deadline.timeout(3)
+
+        with mock.patch.object(deadline, 'BUDGET', 1):
+            self.assertLessEqual(run(), 1)
+
+        with mock.patch.object(deadline, 'BUDGET', 10):
+            self.assertEqual(3, run())
+
+    def test_with_deadline(self):
+        @deadline.with_deadline
+        def run():
+            time.sleep(0.02)
+            deadline.check()
+
+        with mock.patch.object(deadline, 'BUDGET', 0.01):
+            with self.assertRaises(deadline.DeadlineExceededError):
+                run()
+
+        # The deadline must not leak outside of the decorated function
+        self.assertIsNone(deadline.current())
+
+    @httpretty.activate(verbose=True, allow_net_connect=False)
+    def test_main_deadline_exceeded(self):
+        httpretty.register_uri(
+            httpretty.GET,
+            "https://themis.mainnet.desmos.network/twitter/tweets/1392033585675317252",
+            status=200,
+            body='{"author":{"username":"ricmontagnin"},"text":"https://t.co/uD23HgSLJW"}',
+        )
+
+        args = '7B226D6574686F64223A227477656574222C2276616C7565223A2231333932303333353835363735333137323532227D'
+        with mock.patch.object(deadline, 'BUDGET', 0):
+            with self.assertRaisesRegex(deadline.DeadlineExceededError, 'Deadline exceeded'):
+                twitter.main(args)
+
+    def stalled_host(self) -> str:
+        server = ThreadingHTTPServer(("127.0.0.1", 0), StalledHandler)
+        server.daemon_threads = True
+        threading.Thread(target=server.serve_forever, args=(0.05,), daemon=True).start()
+
+        def close():
+            server.shutdown()
+            server.server_close()
+            session.configure()
+            circuit.reset()
+
+        self.addCleanup(close)
+        return f"http://127.0.0.1:{server.server_address[1]}/proof.json"
+
+    def test_stalled_host(self):
+        url = self.stalled_host()
+
+        @deadline.with_deadline
+        def run():
+            return session.get_json_object(url, timeout=1)
+
+        # Retried attempts must not run past the deadline
+        start = time.monotonic()
+        with mock.patch.object(deadline, 'BUDGET', 1.5):
+            with self.assertRaises(deadline.DeadlineExceededError):
+                run()
+
+        self.assertLess(time.monotonic() - start, 2)
+
+    def test_stalled_host_health(self):
+        url = self.stalled_host()
+
+        @deadline.with_deadline
+        def run():
+            return session.get_json_object(url, timeout=1)
+
+        # Timeouts cut short by the deadline are not counted against the host
+        session.configure(max_retries=0)
+        with mock.patch.object(deadline, 'BUDGET', 0.2):
+            with self.assertRaises(deadline.DeadlineExceededError):
+                run()
+
+        self.assertEqual(0, circuit.get_breaker('127.0.0.1').failures)
+
+if __name__ == '__main__':
+    unittest.main()
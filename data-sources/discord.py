@@ -1,15 +1,20 @@
 #!/usr/bin/env python3
+import asyncio
 import json
 import sys
 import urllib.parse
-import requests
 from typing import Optional
-import cryptography.hazmat.primitives.asymmetric.utils as crypto
-from cryptography.hazmat.primitives.asymmetric import ec
-from cryptography.hazmat.primitives import hashes
-import hashlib
+
+import aio
+import deadline
+import mirrors
+import resultcache
+import verifier
+from verification import VerificationData, validate_json
+from verification import verify_address, verify_signature  # noqa: F401 (re-exported, used by the tests)
 
 ENDPOINT = "https://themis.mainnet.desmos.network/discord"
+ENDPOINTS = mirrors.endpoints("discord", ENDPOINT)
 HEADERS = {"Content-Type": "application/json"}
 
 
@@ -22,18 +27,6 @@ class CallData:
         self.username = username
 
 
-class VerificationData:
-    """
-    Contains the data needed to verify the proof submitted by the user.
-    """
-
-    def __init__(self, address: str, pub_key: str, value: str, signature: str):
-        self.address = address
-        self.pub_key = pub_key
-        self.signature = signature
-        self.value = value
-
-
 def get_user_data(data: CallData) -> Optional[VerificationData]:
     """
     Tries getting the verification data for the user having the given Discord username.
@@ -42,7 +35,7 @@ def get_user_data(data: CallData) -> Optional[VerificationData]:
     """
     try:
         url_encoded_username = urllib.parse.quote(data.username)
-        result = requests.request("GET", f"{ENDPOINT}/{url_encoded_username}", headers=HEADERS).json()
+        result = mirrors.request(ENDPOINTS, f"/{url_encoded_username}", headers=HEADERS).json()
         if validate_json(result):
             return VerificationData(
                 result['address'],
@@ -56,59 +49,43 @@ def get_user_data(data: CallData) -> Optional[VerificationData]:
         return None
 
 
-def validate_json(json: dict) -> bool:
+def check_values(values: dict) -> CallData:
     """
-    Tells whether or not the given JSON is a valid signature JSON object.
-    :param json: JSON object to be checked.
-    :return: True if the provided JSON has a valid signature schema, or False otherwise.
+    Checks the validity of the given dictionary making sure it contains the proper data.
+    :param values: Dictionary that should be checked.
+    :return: A CallData instance.
     """
-    return all(key in json for key in ['value', 'pub_key', 'signature', 'address'])
+    if "username" not in values:
+        raise Exception("Missing 'username' value")
+
+    return CallData(values["username"])
 
 
-def verify_signature(data: VerificationData) -> bool:
+@resultcache.cached("discord")
+@deadline.with_deadline
+async def main_async(args: str):
     """
-    Verifies the signature using the given pubkey and value.
-    :param data: Data used to verify the signature.
-    :return True if the signature is valid, False otherwise
+    Asynchronous version of main, allowing a single event loop to keep many verifications in flight.
+    Blocking requests run inside the executor shared by all the coroutines, see the aio module.
     """
-    if len(data.signature) != 128:
-        return False
-
-    try:
-        # Create signature for dss signature
-        (r, s) = int(data.signature[:64], 16), int(data.signature[64:], 16)
-        sig = crypto.encode_dss_signature(r, s)
-
-        # Create public key instance
-        public_key = ec.EllipticCurvePublicKey.from_encoded_point(ec.SECP256K1(), bytes.fromhex(data.pub_key))
-
-        # Verify the signature
-        public_key.verify(sig, bytes.fromhex(data.value), ec.ECDSA(hashes.SHA256()))
-        return True
-    except Exception:
-        return False
 
+    decoded = bytes.fromhex(args)
+    json_obj = json.loads(decoded)
+    call_data = check_values(json_obj)
 
-def verify_address(data: VerificationData) -> bool:
-    """
-    Verifies that the given address is the one associated with the provided HEX encoded compact public key.
-    :param data: Data used to verify the address
-    """
-    s = hashlib.new("sha256", bytes.fromhex(data.pub_key)).digest()
-    r = hashlib.new("ripemd160", s).digest()
-    return data.address.upper() == r.hex().upper()
+    result = await aio.run(get_user_data, call_data)
+    if result is None:
+        raise Exception(f"No valid signature data found for user with username {call_data.username}")
 
+    # Verify the signature and the address, inside the process pool if running
+    signature_valid, address_valid = await verifier.verify_async(result)
+    if not signature_valid:
+        raise Exception("Invalid signature")
 
-def check_values(values: dict) -> CallData:
-    """
-    Checks the validity of the given dictionary making sure it contains the proper data.
-    :param values: Dictionary that should be checked.
-    :return: A CallData instance.
-    """
-    if "username" not in values:
-        raise Exception("Missing 'username' value")
+    if not address_valid:
+        raise Exception("Invalid address")
 
-    return CallData(values["username"])
+    return f"{result.value},{result.signature},{call_data.username}"
 
 
 def main(args: str):
@@ -137,26 +114,7 @@ def main(args: str):
             2. The provided signature is not valid
             3. The provided address is not linked to the provided public key
     """
-
-    decoded = bytes.fromhex(args)
-    json_obj = json.loads(decoded)
-    call_data = check_values(json_obj)
-
-    result = get_user_data(call_data)
-    if result is None:
-        raise Exception(f"No valid signature data found for user with username {call_data.username}")
-
-    # Verify the signature
-    signature_valid = verify_signature(result)
-    if not signature_valid:
-        raise Exception("Invalid signature")
-
-    # Verify the address
-    address_valid = verify_address(result)
-    if not address_valid:
-        raise Exception("Invalid address")
-
-    return f"{result.value},{result.signature},{call_data.username}"
+    return asyncio.run(main_async(args))
 
 
 if __name__ == "__main__":
@@ -1,15 +1,22 @@
 #!/usr/bin/env python3
+import asyncio
 import json
 import sys
 import urllib.parse
-import requests
 from typing import Optional
-import cryptography.hazmat.primitives.asymmetric.utils as crypto
-from cryptography.hazmat.primitives.asymmetric import ec
-from cryptography.hazmat.primitives import hashes
-import hashlib
+
+import aio
+import deadline
+import mirrors
+import resultcache
+import rewrite
+import session
+import verifier
+from verification import VerificationData, validate_json
+from verification import verify_address, verify_signature  # noqa: F401 (re-exported, used by the tests)
 
 ENDPOINT = "https://themis.mainnet.desmos.network/nslookup"
+ENDPOINTS = mirrors.endpoints("domain", ENDPOINT)
 HEADERS = {"Content-Type": "application/json"}
 
 
@@ -22,18 +29,6 @@ class CallData:
         self.domain = domain
 
 
-class VerificationData:
-    """
-    Contains the data needed to verify the proof submitted by the user.
-    """
-
-    def __init__(self, address: str, pub_key: str, value: str, signature: str):
-        self.address = address
-        self.pub_key = pub_key
-        self.signature = signature
-        self.value = value
-
-
 def try_reading_json(json_value: dict) -> Optional[VerificationData]:
     """
     Tries reading the given param as a JSON object.
@@ -71,7 +66,7 @@ def get_data_from_txt_record(record: str) -> Optional[VerificationData]:
 
     except ValueError:
         try:
-            content = requests.request("GET", record, headers=HEADERS).json()
+            content = session.get_json_object(rewrite.rewrite_url(record), headers=HEADERS)
             value = try_reading_json(content)
             if value is not None:
                 return value
@@ -90,7 +85,7 @@ def get_user_data(data: CallData) -> Optional[VerificationData]:
     """
     try:
         url_encoded_domain = urllib.parse.quote(data.domain)
-        response = requests.request("GET", f"{ENDPOINT}/{url_encoded_domain}", headers=HEADERS)
+        response = mirrors.request(ENDPOINTS, f"/{url_encoded_domain}", headers=HEADERS)
         if response.status_code != 200:
             return None
 
@@ -105,60 +100,43 @@ def get_user_data(data: CallData) -> Optional[VerificationData]:
         return None
 
 
-def validate_json(json: dict) -> bool:
+def check_values(values: dict) -> CallData:
     """
-    Tells whether or not the given JSON is a valid signature JSON object.
-    :param json: JSON object to be checked.
-    :return: True if the provided JSON has a valid signature schema, or False otherwise.
+    Checks the validity of the given dictionary making sure it contains the proper data.
+    :param values: Dictionary that should be checked.
+    :return: A CallData instance.
     """
+    if "domain" not in values:
+        raise Exception("Missing 'domain' value")
 
-    return all(key in json for key in ['value', 'pub_key', 'signature', 'address'])
+    return CallData(values["domain"])
 
 
-def verify_signature(data: VerificationData) -> bool:
+@resultcache.cached("domain")
+@deadline.with_deadline
+async def main_async(args: str):
     """
-    Verifies the signature using the given pubkey and value.
-    :param data: Data used to verify the signature.
-    :return True if the signature is valid, False otherwise
+    Asynchronous version of main, allowing a single event loop to keep many verifications in flight.
+    Blocking requests run inside the executor shared by all the coroutines, see the aio module.
     """
-    if len(data.signature) != 128:
-        return False
-
-    try:
-        # Create signature for dss signature
-        (r, s) = int(data.signature[:64], 16), int(data.signature[64:], 16)
-        sig = crypto.encode_dss_signature(r, s)
-
-        # Create public key instance
-        public_key = ec.EllipticCurvePublicKey.from_encoded_point(ec.SECP256K1(), bytes.fromhex(data.pub_key))
-
-        # Verify the signature
-        public_key.verify(sig, bytes.fromhex(data.value), ec.ECDSA(hashes.SHA256()))
-        return True
-    except Exception:
-        return False
 
+    decoded = bytes.fromhex(args)
+    json_obj = json.loads(decoded)
+    call_data = check_values(json_obj)
 
-def verify_address(data: VerificationData) -> bool:
-    """
-    Verifies that the given address is the one associated with the provided HEX encoded compact public key.
-    :param data: Data used to verify the address
-    """
-    s = hashlib.new("sha256", bytes.fromhex(data.pub_key)).digest()
-    r = hashlib.new("ripemd160", s).digest()
-    return data.address.upper() == r.hex().upper()
+    result = await aio.run(get_user_data, call_data)
+    if result is None:
+        raise Exception(f"No valid signature data found for domain {call_data.domain}")
 
+    # Verify the signature and the address, inside the process pool if running
+    signature_valid, address_valid = await verifier.verify_async(result)
+    if not signature_valid:
+        raise Exception("Invalid signature")
 
-def check_values(values: dict) -> CallData:
-    """
-    Checks the validity of the given dictionary making sure it contains the proper data.
-    :param values: Dictionary that should be checked.
-    :return: A CallData instance.
-    """
-    if "domain" not in values:
-        raise Exception("Missing 'domain' value")
+    if not address_valid:
+        raise Exception("Invalid address")
 
-    return CallData(values["domain"])
+    return f"{result.value},{result.signature},{call_data.domain}"
 
 
 def main(args: str):
@@ -191,26 +169,7 @@ def main(args: str):
             2. The provided signature is not valid
             3. The provided address is not linked to the provided public key
     """
-
-    decoded = bytes.fromhex(args)
-    json_obj = json.loads(decoded)
-    call_data = check_values(json_obj)
-
-    result = get_user_data(call_data)
-    if result is None:
-        raise Exception(f"No valid signature data found for domain {call_data.domain}")
-
-    # Verify the signature
-    signature_valid = verify_signature(result)
-    if not signature_valid:
-        raise Exception("Invalid signature")
-
-    # Verify the address
-    address_valid = verify_address(result)
-    if not address_valid:
-        raise Exception("Invalid address")
-
-    return f"{result.value},{result.signature},{call_data.domain}"
+    return asyncio.run(main_async(args))
 
 
 if __name__ == "__main__":
@@ -1,13 +1,16 @@
 #!/usr/bin/env python3
+import asyncio
 import json
 import sys
-import requests
 from typing import Optional
-import cryptography.hazmat.primitives.asymmetric.utils as crypto
-from cryptography.hazmat.primitives.asymmetric import ec
-from cryptography.hazmat.primitives import hashes
 
-import hashlib
+import aio
+import deadline
+import resultcache
+import session
+import verifier
+from verification import VerificationData, validate_json
+from verification import verify_address, verify_signature  # noqa: F401 (re-exported, used by the tests)
 
 HEADERS = {"Content-Type": "application/json"}
 
@@ -22,18 +25,6 @@ class CallData:
         self.gist_id = gist_id
 
 
-class VerificationData:
-    """
-    Contains the data needed to verify the proof submitted by the user.
-    """
-
-    def __init__(self, address: str, pub_key: str, value: str, signature: str):
-        self.address = address
-        self.pub_key = pub_key
-        self.signature = signature
-        self.value = value
-
-
 def get_data_from_gist(data: CallData) -> Optional[VerificationData]:
     """
     Tries getting the signature object from within the Gist having the given id.
@@ -42,7 +33,7 @@ def get_data_from_gist(data: CallData) -> Optional[VerificationData]:
     """
     try:
         url = f"https://gist.githubusercontent.com/{data.username}/{data.gist_id}/raw/"
-        result = requests.request("GET", url, headers=HEADERS).json()
+        result = session.get_json_object(url, headers=HEADERS)
         if validate_json(result):
             return VerificationData(
                 result['address'],
@@ -56,49 +47,6 @@ def get_data_from_gist(data: CallData) -> Optional[VerificationData]:
         return None
 
 
-def validate_json(json: dict) -> bool:
-    """
-    Tells whether or not the given JSON is a valid signature JSON object.
-    :param json: JSON object to be checked.
-    :return: True if the provided JSON has a valid signature schema, or False otherwise.
-    """
-    return all(key in json for key in ['value', 'pub_key', 'signature', 'address'])
-
-
-def verify_signature(data: VerificationData) -> bool:
-    """
-    Verifies the signature using the given pubkey and value.
-    :param data: Data used to verify the signature.
-    :return True if the signature is valid, False otherwise
-    """
-    if len(data.signature) != 128:
-        return False
-
-    try:
-        # Create signature for dss signature
-        (r, s) = int(data.signature[:64], 16), int(data.signature[64:], 16)
-        sig = crypto.encode_dss_signature(r, s)
-
-        # Create public key instance
-        public_key = ec.EllipticCurvePublicKey.from_encoded_point(ec.SECP256K1(), bytes.fromhex(data.pub_key))
-
-        # Verify the signature
-        public_key.verify(sig, bytes.fromhex(data.value), ec.ECDSA(hashes.SHA256()))
-        return True
-    except Exception:
-        return False
-
-
-def verify_address(data: VerificationData) -> bool:
-    """
-    Verifies that the given address is the one associated with the provided HEX encoded compact public key.
-    :param data: Data used to verify the address
-    """
-    s = hashlib.new("sha256", bytes.fromhex(data.pub_key)).digest()
-    r = hashlib.new("ripemd160", s).digest()
-    return data.address.upper() == r.hex().upper()
-
-
 def check_values(values: dict) -> CallData:
     """
     Checks the validity of the given dictionary making sure it contains the proper data.
@@ -114,6 +62,34 @@ def check_values(values: dict) -> CallData:
     return CallData(values["username"], values["gist_id"])
 
 
+@resultcache.cached("github")
+@deadline.with_deadline
+async def main_async(args: str):
+    """
+    Asynchronous version of main, allowing a single event loop to keep many verifications in flight.
+    Blocking requests run inside the executor shared by all the coroutines, see the aio module.
+    """
+
+    decoded = bytes.fromhex(args)
+    json_obj = json.loads(decoded)
+    call_data = check_values(json_obj)
+
+    # Get the URLs to check inside the tweet or the bio
+    data = await aio.run(get_data_from_gist, call_data)
+    if data is None:
+        raise Exception(f"No valid signature data found for gist with id {call_data.gist_id}")
+
+    # Verify the signature and the address, inside the process pool if running
+    signature_valid, address_valid = await verifier.verify_async(data)
+    if not signature_valid:
+        raise Exception("Invalid signature")
+
+    if not address_valid:
+        raise Exception("Invalid address")
+
+    return f"{data.value},{data.signature},{call_data.username}"
+
+
 def main(args: str):
     """
     Gets the signature data from GitHub, using a public Gist.
@@ -153,27 +129,7 @@ def main(args: str):
             2. The provided signature is not valid
             3. The provided address is not linked to the provided public key
     """
-
-    decoded = bytes.fromhex(args)
-    json_obj = json.loads(decoded)
-    call_data = check_values(json_obj)
-
-    # Get the URLs to check inside the tweet or the bio
-    data = get_data_from_gist(call_data)
-    if data is None:
-        raise Exception(f"No valid signature data found for gist with id {call_data.gist_id}")
-
-    # Verify the signature
-    signature_valid = verify_signature(data)
-    if not signature_valid:
-        raise Exception("Invalid signature")
-
-    # Verify the address
-    address_valid = verify_address(data)
-    if not address_valid:
-        raise Exception("Invalid address")
-
-    return f"{data.value},{data.signature},{call_data.username}"
+    return asyncio.run(main_async(args))
 
 
 if __name__ == "__main__":
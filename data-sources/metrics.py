@@ -0,0 +1,38 @@
+import threading
+
+_counters = {}
+_gauges = {}
+_lock = threading.Lock()
+
+
+def increment(name: str, value: float = 1):
+    """
+    Increments the counter having the given name by the given value.
+    """
+    with _lock:
+        _counters[name] = _counters.get(name, 0) + value
+
+
+def set_gauge(name: str, value: float):
+    """
+    Sets the gauge having the given name to the given value.
+    """
+    with _lock:
+        _gauges[name] = value
+
+
+def snapshot() -> dict:
+    """
+    Returns the current values of all the counters and gauges.
+    """
+    with _lock:
+        return {"counters": dict(_counters), "gauges": dict(_gauges)}
+
+
+def reset():
+    """
+    Removes all the counters and gauges.
+    """
+    with _lock:
+        _counters.clear()
+        _gauges.clear()
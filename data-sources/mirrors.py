@@ -0,0 +1,185 @@
+import contextvars
+import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import List, Optional, Sequence, Tuple
+
+import requests
+
+import deadline
+import metrics
+import session
+import store
+import unixsocket
+
+# Number of seconds waited for a mirror to answer before sending the same request to the next one, used until enough
+# latencies have been observed to compute their p95
+HEDGE_DELAY = float(os.environ.get("THEMIS_HEDGE_DELAY", "1"))
+
+# Number of recent latencies used to compute the hedge delay, and minimum number required before using their p95
+HEDGE_WINDOW = 100
+HEDGE_MIN_SAMPLES = 20
+
+# Maximum number of requests towards the mirrors performed at the same time by the whole process
+MAX_WORKERS = int(os.environ.get("THEMIS_HEDGE_WORKERS", "16"))
+
+_latencies = {}
+_executor = None
+_lock = threading.Lock()
+
+
+def endpoints(name: str, default: str) -> List[str]:
+    """
+    Returns the base URLs of the Themis API mirrors that should be used by the given data source.
+    :param name: Name of the data source. Its mirrors are read from the THEMIS_<NAME>_ENDPOINTS variable, as a comma
+    separated list of base URLs (eg. "https://themis.mainnet.desmos.network/twitter,http://localhost:8080/twitter").
+    An API co-located on the same host can be reached over its Unix domain socket using a
+    "unix://<socket path>:<base path>" URL (eg. "unix:///run/themis/apis.sock:/twitter").
+    :param default: Base URL to be used when the variable is not set.
+    :return: List of base URLs, in order of preference.
+    """
+    value = os.environ.get(f"THEMIS_{name.upper()}_ENDPOINTS", "")
+    urls = [unixsocket.to_url(url.strip().rstrip("/")) for url in value.split(",") if url.strip()]
+    return urls if urls else [default]
+
+
+def hedge_delay(urls: Sequence[str]) -> float:
+    """
+    Returns how many seconds should be waited for a mirror of the given list to answer before hedging the request.
+    """
+    with _lock:
+        latencies = sorted(_latencies.get(tuple(urls), []))
+
+    if len(latencies) < HEDGE_MIN_SAMPLES:
+        return HEDGE_DELAY
+    return latencies[int(len(latencies) * 0.95)]
+
+
+def _record_latency(urls: Sequence[str], latency: float):
+    with _lock:
+        _latencies.setdefault(tuple(urls), deque(maxlen=HEDGE_WINDOW)).append(latency)
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    global _executor
+    with _lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=MAX_WORKERS)
+        return _executor
+
+
+def _timed_request(method: str, url: str, kwargs: dict) -> Tuple[requests.Response, float]:
+    start = time.monotonic()
+    response = session.request(method, url, **kwargs)
+    return response, time.monotonic() - start
+
+
+def request(urls: Sequence[str], path: str, method: str = "GET", **kwargs) -> requests.Response:
+    """
+    Performs the same request against a list of Themis API mirrors, returning the first good response.
+
+    The request is sent to the first mirror. If it has not answered within the p95 latency of the recent requests, the
+    same request is sent to the next mirror as well, and the first one answering wins. Whenever a mirror fails with a
+    connection error, a timeout or a 5xx response, the request is sent to the next mirror that has not been tried yet.
+    Successful GET responses are shared with the other processes through the response store, if enabled, and reused
+    until they expire.
+    :param urls: Base URLs of the mirrors, in order of preference.
+    :param path: Path to be appended to the base URL of each mirror.
+    :param method: HTTP method to be used.
+    :return: The first response having a status lower than 500. If all the mirrors fail, the last 5xx response.
+    :raise Exception if all the mirrors fail without any response.
+    :raise DeadlineExceededError if the deadline of the current invocation expires before any mirror has answered.
+    """
+    key = urls[0] + path
+    if method == "GET":
+        body = store.get(key)
+        if body is not None:
+            return _stored_response(key, body)
+
+    response = _request(urls, path, method, **kwargs)
+    if method == "GET" and response.status_code == 200:
+        store.put(key, response.content, store.API_TTL)
+    return response
+
+
+def _stored_response(url: str, body: bytes) -> requests.Response:
+    response = requests.Response()
+    response.status_code = 200
+    response.url = url
+    response.encoding = "utf-8"
+    response._content = body
+    return response
+
+
+def _request(urls: Sequence[str], path: str, method: str, **kwargs) -> requests.Response:
+    if len(urls) == 1:
+        return session.request(method, urls[0] + path, **kwargs)
+
+    pool = _get_executor()
+    remaining = deque(urls)
+    pending = set()
+
+    def submit():
+        # Each request must see the deadline of the current invocation
+        context = contextvars.copy_context()
+        pending.add(pool.submit(context.run, _timed_request, method, remaining.popleft() + path, kwargs))
+
+    submit()
+    hedged = False
+    failed_response: Optional[requests.Response] = None
+    error: Optional[Exception] = None
+
+    while pending:
+        timeout = hedge_delay(urls) if remaining and not hedged else None
+        done, _ = wait(pending, timeout=timeout, return_when=FIRST_COMPLETED)
+        if not done:
+            hedged = True
+            metrics.increment("mirrors.hedged")
+            submit()
+            continue
+
+        for future in done:
+            pending.remove(future)
+            response, err = _outcome(urls, future)
+            if err is not None:
+                error = err
+            elif response.status_code < 500:
+                return response
+            else:
+                failed_response = response
+
+            if remaining:
+                metrics.increment("mirrors.failovers")
+                submit()
+
+    if failed_response is not None:
+        return failed_response
+    raise error
+
+
+def _outcome(urls: Sequence[str], future: Future) -> Tuple[Optional[requests.Response], Optional[Exception]]:
+    """
+    Returns either the response of the given mirror request or the exception it raised, recording its latency if the
+    mirror answered successfully.
+    :raise DeadlineExceededError if the deadline of the current invocation expired, since no other mirror can answer.
+    """
+    try:
+        response, latency = future.result()
+    except deadline.DeadlineExceededError:
+        raise
+    except Exception as err:
+        return None, err
+
+    if response.status_code < 500:
+        _record_latency(urls, latency)
+    return response, None
+
+
+def reset():
+    """
+    Forgets the latencies observed so far.
+    """
+    with _lock:
+        _latencies.clear()
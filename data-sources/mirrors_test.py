@@ -0,0 +1,147 @@
+import json
+import os
+import tempfile
+import threading
+import time
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest import mock
+
+import circuit
+import metrics
+import mirrors
+import session
+import store
+
+
+class StandIn:
+    """
+    Local stand-in of a Themis API mirror, answering after the given delay with the given status.
+    """
+
+    def __init__(self, name: str, delay: float = 0, status: int = 200):
+        stand_in = self
+        self.name = name
+        self.delay = delay
+        self.status = status
+        self.requests = 0
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                stand_in.requests += 1
+                time.sleep(stand_in.delay)
+                body = json.dumps({"mirror": stand_in.name, "path": self.path}).encode()
+                self.send_response(stand_in.status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.server.daemon_threads = True
+        threading.Thread(target=self.server.serve_forever, args=(0.05,), daemon=True).start()
+
+    def url(self, host: str = "127.0.0.1") -> str:
+        return f"http://{host}:{self.server.server_address[1]}/twitter"
+
+    def close(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+class MirrorsTest(unittest.TestCase):
+
+    def setUp(self):
+        session.configure(max_retries=0)
+        metrics.reset()
+        self.stand_ins = []
+
+    def tearDown(self):
+        for stand_in in self.stand_ins:
+            stand_in.close()
+        session.configure()
+        circuit.reset()
+        mirrors.reset()
+
+    def stand_in(self, *args, **kwargs) -> StandIn:
+        stand_in = StandIn(*args, **kwargs)
+        self.stand_ins.append(stand_in)
+        return stand_in
+
+    def test_endpoints(self):
+        self.assertEqual(['https://themis.mainnet.desmos.network/twitter'],
+                         mirrors.endpoints('twitter', 'https://themis.mainnet.desmos.network/twitter'))
+
+        value = 'https://themis.mainnet.desmos.network/twitter/, http://localhost:8080/twitter'
+        with mock.patch.dict('os.environ', {'THEMIS_TWITTER_ENDPOINTS': value}):
+            self.assertEqual(
+                ['https://themis.mainnet.desmos.network/twitter', 'http://localhost:8080/twitter'],
+                mirrors.endpoints('twitter', 'https://themis.mainnet.desmos.network/twitter'),
+            )
+
+    def test_hedge_delay(self):
+        urls = ['http://127.0.0.1/twitter', 'http://localhost/twitter']
+        with mock.patch('mirrors.HEDGE_DELAY', 0.5):
+            self.assertEqual(0.5, mirrors.hedge_delay(urls))
+
+            for latency in range(100):
+                mirrors._record_latency(urls, latency / 100)
+            self.assertEqual(0.95, mirrors.hedge_delay(urls))
+
+    def test_primary(self):
+        primary, secondary = self.stand_in('primary'), self.stand_in('secondary')
+
+        response = mirrors.request([primary.url(), secondary.url('localhost')], '/users/ricmontagnin')
+        self.assertEqual({'mirror': 'primary', 'path': '/twitter/users/ricmontagnin'}, response.json())
+        self.assertEqual(0, secondary.requests)
+
+    def test_hedged(self):
+        primary, secondary = self.stand_in('primary', delay=1), self.stand_in('secondary')
+
+        start = time.monotonic()
+        with mock.patch('mirrors.HEDGE_DELAY', 0.1):
+            response = mirrors.request([primary.url(), secondary.url('localhost')], '/users/ricmontagnin')
+
+        self.assertEqual('secondary', response.json()['mirror'])
+        self.assertLess(time.monotonic() - start, 1)
+        self.assertEqual(1, metrics.snapshot()['counters']['mirrors.hedged'])
+
+    def test_failover(self):
+        primary, secondary = self.stand_in('primary', status=503), self.stand_in('secondary')
+
+        response = mirrors.request([primary.url(), secondary.url('localhost')], '/users/ricmontagnin')
+        self.assertEqual('secondary', response.json()['mirror'])
+        self.assertEqual(1, metrics.snapshot()['counters']['mirrors.failovers'])
+
+        # Unreachable mirrors are skipped as well
+        primary.close()
+        self.stand_ins.remove(primary)
+        response = mirrors.request([primary.url(), secondary.url('localhost')], '/users/ricmontagnin')
+        self.assertEqual('secondary', response.json()['mirror'])
+
+    def test_store(self):
+        primary = self.stand_in('primary')
+
+        with tempfile.TemporaryDirectory() as directory:
+            store.configure(os.path.join(directory, 'responses.db'))
+            try:
+                for _ in range(2):
+                    response = mirrors.request([primary.url()], '/users/ricmontagnin')
+                    self.assertEqual({'mirror': 'primary', 'path': '/twitter/users/ricmontagnin'}, response.json())
+            finally:
+                store.configure()
+
+        self.assertEqual(1, primary.requests)
+
+    def test_all_failed(self):
+        primary, secondary = self.stand_in('primary', status=503), self.stand_in('secondary', status=500)
+
+        response = mirrors.request([primary.url(), secondary.url('localhost')], '/users/ricmontagnin')
+        self.assertEqual(500, response.status_code)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,101 @@
+import os
+import threading
+import time
+import urllib.parse
+from collections import OrderedDict
+from typing import Optional
+
+import metrics
+
+# Number of seconds a URL is remembered as not containing any proof, when it served something other than JSON
+# (eg. an HTML page or an image)
+TTL = float(os.environ.get("THEMIS_NEGATIVE_CACHE_TTL", "3600"))
+
+# Number of seconds a URL is remembered as not containing any proof, when it served a JSON object that is not a valid
+# proof or its content type is unknown. This is shorter since such URLs might be edited to contain a proof
+JSON_TTL = float(os.environ.get("THEMIS_NEGATIVE_CACHE_JSON_TTL", "300"))
+
+# Maximum number of URLs remembered at the same time
+MAX_SIZE = int(os.environ.get("THEMIS_NEGATIVE_CACHE_SIZE", "4096"))
+
+
+def normalize_url(url: str) -> str:
+    """
+    Normalizes the given URL so that different ways of writing the same one share the same cache entry: the scheme
+    and host are lowercased, default ports and fragments are removed, and an empty path becomes "/".
+    """
+    parts = urllib.parse.urlsplit(url.strip())
+    scheme = parts.scheme.lower()
+    netloc = parts.netloc.lower()
+    if (scheme, parts.port) in [("http", 80), ("https", 443)]:
+        netloc = netloc.rsplit(":", 1)[0]
+
+    return urllib.parse.urlunsplit((scheme, netloc, parts.path or "/", parts.query, ""))
+
+
+class NegativeCache:
+    """
+    Thread-safe cache of the URLs known not to contain any proof, each one remembered for a limited amount of time
+    that depends on the content type it served. It keeps track of how many fetches were saved thanks to it.
+    """
+
+    def __init__(self, max_size: int = MAX_SIZE):
+        self.max_size = max_size
+        self.saved = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def add(self, url: str, content_type: Optional[str] = None):
+        """
+        Remembers that the given URL does not contain any proof.
+        :param url: URL that has been fetched.
+        :param content_type: Optional content type served by the URL, used to decide for how long it is remembered.
+        """
+        ttl = JSON_TTL if content_type is None or "json" in content_type.lower() else TTL
+        with self._lock:
+            key = normalize_url(url)
+            self._entries[key] = (time.monotonic() + ttl, content_type)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def contains(self, url: str) -> bool:
+        """
+        Tells whether the given URL is known not to contain any proof. Each positive answer is counted as a saved fetch.
+        """
+        key = normalize_url(url)
+        with self._lock:
+            if key not in self._entries:
+                return False
+
+            expires_at, _ = self._entries[key]
+            if expires_at <= time.monotonic():
+                del self._entries[key]
+                return False
+
+            self.saved += 1
+
+        metrics.increment("negcache.saved")
+        return True
+
+    def clear(self):
+        """
+        Removes all the cached entries and resets the counter of saved fetches.
+        """
+        with self._lock:
+            self._entries.clear()
+            self.saved = 0
+
+    def stats(self) -> dict:
+        """
+        Returns the number of saved fetches and of entries of the cache.
+        """
+        with self._lock:
+            return {"saved": self.saved, "size": len(self._entries), "max_size": self.max_size}
+
+    def __len__(self):
+        return len(self._entries)
+
+
+# URLs known not to contain any proof, shared by all the data sources
+urls = NegativeCache()
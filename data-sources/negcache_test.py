@@ -0,0 +1,61 @@
+import unittest
+from unittest import mock
+
+import negcache
+
+
+class NegativeCacheTest(unittest.TestCase):
+
+    def test_normalize_url(self):
+        tests = [
+            ('https://LinkTr.ee/RicMontagnin', 'https://linktr.ee/RicMontagnin'),
+            ('https://forbole.com:443', 'https://forbole.com/'),
+            ('http://forbole.com:8080/', 'http://forbole.com:8080/'),
+            ('https://pastebin.com/raw/xz4S8WrW#top', 'https://pastebin.com/raw/xz4S8WrW'),
+            ('https://youtube.com/watch?v=dQw4w9WgXcQ', 'https://youtube.com/watch?v=dQw4w9WgXcQ'),
+        ]
+
+        for url, expected in tests:
+            self.assertEqual(expected, negcache.normalize_url(url), url)
+
+    def test_contains(self):
+        cache = negcache.NegativeCache()
+        self.assertFalse(cache.contains('https://linktr.ee/ricmontagnin'))
+
+        cache.add('https://LINKTR.EE/ricmontagnin', 'text/html; charset=utf-8')
+        self.assertTrue(cache.contains('https://linktr.ee/ricmontagnin'))
+        self.assertTrue(cache.contains('https://linktr.ee/ricmontagnin#about'))
+        self.assertEqual({'saved': 2, 'size': 1, 'max_size': negcache.MAX_SIZE}, cache.stats())
+
+        cache.clear()
+        self.assertEqual({'saved': 0, 'size': 0, 'max_size': negcache.MAX_SIZE}, cache.stats())
+
+    def test_ttl(self):
+        cache = negcache.NegativeCache()
+        with mock.patch('time.monotonic', return_value=1000):
+            cache.add('https://forbole.com', 'text/html')
+            cache.add('https://pastebin.com/raw/xz4S8WrW', 'application/json')
+            cache.add('https://bitcoin.org')
+
+        # JSON objects and unknown content types are remembered for a shorter time, since they might be edited
+        with mock.patch('time.monotonic', return_value=1000 + negcache.JSON_TTL):
+            self.assertTrue(cache.contains('https://forbole.com'))
+            self.assertFalse(cache.contains('https://pastebin.com/raw/xz4S8WrW'))
+            self.assertFalse(cache.contains('https://bitcoin.org'))
+
+        with mock.patch('time.monotonic', return_value=1000 + negcache.TTL):
+            self.assertFalse(cache.contains('https://forbole.com'))
+        self.assertEqual(0, len(cache))
+
+    def test_max_size(self):
+        cache = negcache.NegativeCache(max_size=2)
+        cache.add('https://a.com')
+        cache.add('https://b.com')
+        cache.add('https://c.com')
+
+        self.assertFalse(cache.contains('https://a.com'))
+        self.assertTrue(cache.contains('https://c.com'))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,24 @@
+import os
+from typing import Callable, Optional, TypeVar
+
+import negcache
+import rewrite
+import shortlinks
+
+# Maximum number of proof URLs of the same invocation that are fetched at the same time
+MAX_WORKERS = int(os.environ.get("THEMIS_PROOF_WORKERS", "4"))
+
+T = TypeVar("T")
+
+
+def fetch_proof(fetch: Callable[[str], Optional[T]], url: str) -> Optional[T]:
+    """
+    Fetches the proof served at the final location of the given URL, unless it is known not to contain any.
+    Short links are resolved to their targets, links to the pages of known proof hosts are rewritten to their raw
+    content, and URLs that are known not to contain any proof are not fetched at all.
+    """
+    url = rewrite.rewrite_url(shortlinks.resolve(url))
+    if negcache.urls.contains(url):
+        return None
+
+    return fetch(url)
@@ -0,0 +1,112 @@
+import asyncio
+import threading
+import time
+import unittest
+
+import aio
+import negcache
+
+
+class ProofsTest(unittest.TestCase):
+
+    def tearDown(self):
+        negcache.urls.clear()
+
+    def test_find_first_proof(self):
+        tests = [
+            {
+                'name': 'No URLs',
+                'urls': [],
+                'proofs': {},
+                'result': None,
+            },
+            {
+                'name': 'No valid proof',
+                'urls': ['https://a.com', 'https://b.com'],
+                'proofs': {},
+                'result': None,
+            },
+            {
+                'name': 'Single valid proof',
+                'urls': ['https://a.com', 'https://b.com', 'https://c.com'],
+                'proofs': {'https://b.com': 'b'},
+                'result': 'b',
+            },
+            {
+                'name': 'Multiple valid proofs',
+                'urls': ['https://a.com', 'https://b.com', 'https://c.com'],
+                'proofs': {'https://b.com': 'b', 'https://c.com': 'c'},
+                'result': 'b',
+            },
+        ]
+
+        for test in tests:
+            result = asyncio.run(aio.find_first_proof(test['urls'], test['proofs'].get))
+            self.assertEqual(test['result'], result, test['name'])
+
+    def test_find_first_proof_keeps_text_order(self):
+        # The first URL is the slowest one, but it should still win over the later ones
+        delays = {'https://a.com': 0.2, 'https://b.com': 0, 'https://c.com': 0}
+
+        def fetch(url):
+            time.sleep(delays[url])
+            return url
+
+        result = asyncio.run(aio.find_first_proof(list(delays.keys()), fetch))
+        self.assertEqual('https://a.com', result)
+
+    def test_find_first_proof_cancels_pending_fetches(self):
+        fetched = []
+        lock = threading.Lock()
+
+        def fetch(url):
+            with lock:
+                fetched.append(url)
+            return url if url == 'https://a.com' else None
+
+        urls = ['https://a.com', 'https://b.com', 'https://c.com', 'https://d.com']
+        result = asyncio.run(aio.find_first_proof(urls, fetch, max_workers=1))
+        self.assertEqual('https://a.com', result)
+        self.assertLess(len(fetched), len(urls))
+
+    def test_find_first_proof_bounds_fetches(self):
+        in_flight = []
+        peak = []
+        lock = threading.Lock()
+
+        def fetch(url):
+            with lock:
+                in_flight.append(url)
+                peak.append(len(in_flight))
+            time.sleep(0.02)
+            with lock:
+                in_flight.remove(url)
+            return None
+
+        # Many URLs of the same invocation do not take more than their share of the executor
+        urls = [f'https://{index}.com' for index in range(20)]
+        self.assertIsNone(asyncio.run(aio.find_first_proof(urls, fetch, max_workers=3)))
+        self.assertEqual(20, len(peak))
+        self.assertLessEqual(max(peak), 3)
+
+    def test_find_first_proof_skips_known_urls(self):
+        fetched = []
+        negcache.urls.add('https://linktr.ee/ricmontagnin', 'text/html')
+
+        def fetch(url):
+            fetched.append(url)
+            return None
+
+        urls = ['https://linktr.ee/ricmontagnin', 'https://pastebin.com/raw/xz4S8WrW']
+        result = asyncio.run(aio.find_first_proof(urls, fetch))
+        self.assertIsNone(result)
+        self.assertEqual(['https://pastebin.com/raw/xz4S8WrW'], fetched)
+        self.assertEqual(1, negcache.urls.stats()['saved'])
+
+    def test_find_first_proof_rewrites_urls(self):
+        result = asyncio.run(aio.find_first_proof(['https://pastebin.com/xz4S8WrW'], lambda url: url))
+        self.assertEqual('https://pastebin.com/raw/xz4S8WrW', result)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,223 @@
+import contextlib
+import fnmatch
+import os
+import threading
+import time
+import urllib.parse
+from collections import deque
+from typing import List, Optional, Tuple
+
+import deadline
+import metrics
+
+
+def parse_rules(value: str) -> List[Tuple[str, float, int]]:
+    """
+    Parses the given limits configuration, formed as a comma separated list of "pattern=rate:max_in_flight" entries.
+    :param value: Limits configuration (eg. "themis.mainnet.desmos.network=20:8,*.pastebin.com=2:2,*=0:16").
+    :return: A list of (host pattern, requests per second, maximum in-flight requests) tuples. A rate or maximum of 0
+    means no limit.
+    """
+    rules = []
+    for entry in value.split(","):
+        if not entry.strip():
+            continue
+
+        pattern, limits = entry.strip().rsplit("=", 1)
+        rate, max_in_flight = limits.split(":")
+        rules.append((pattern, float(rate), int(max_in_flight)))
+
+    return rules
+
+
+# Limits applied to each host. The first rule whose pattern matches the host is used
+RULES = parse_rules(os.environ.get("THEMIS_HOST_LIMITS", "*=0:16"))
+
+# Whether the maximum number of in-flight requests of each host should adapt to its latency and errors (AIMD)
+ADAPTIVE = os.environ.get("THEMIS_ADAPTIVE_LIMITS", "0") == "1"
+
+# Adaptive limits: the limit grows by one while the p95 latency and error rate of the recent requests stay below
+# the given thresholds, and is multiplied by the decrease factor upon each timeout, 429 or 5xx response
+ADAPTIVE_INITIAL_LIMIT = 4
+ADAPTIVE_MAX_LIMIT = 64
+ADAPTIVE_DECREASE_FACTOR = 0.5
+ADAPTIVE_LATENCY_TARGET = float(os.environ.get("THEMIS_ADAPTIVE_LATENCY_TARGET", "2"))
+ADAPTIVE_ERROR_RATE_TARGET = 0.05
+ADAPTIVE_WINDOW = 100
+
+_limiters = {}
+_lock = threading.Lock()
+
+
+class HostLimiter:
+    """
+    Limits the requests performed towards a single host, using a token bucket to cap the number of requests per
+    second and a cap on the number of requests in flight.
+
+    When adaptive, the cap on the requests in flight changes over time following an additive-increase
+    multiplicative-decrease policy, based on the outcome of the requests reported through observe.
+    """
+
+    def __init__(self, host: str, rate: float, max_in_flight: int, adaptive: bool = False):
+        self.host = host
+        self.rate = rate
+        self.max_in_flight = max_in_flight
+        self.adaptive = adaptive
+        self.capacity = max(1.0, rate)
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self.in_flight = 0
+        self._lock = threading.Lock()
+        self._condition = threading.Condition()
+
+        if adaptive:
+            self.max_limit = max_in_flight if max_in_flight > 0 else ADAPTIVE_MAX_LIMIT
+            self.limit = float(min(ADAPTIVE_INITIAL_LIMIT, self.max_limit))
+            self._samples = deque(maxlen=ADAPTIVE_WINDOW)
+            self._successes = 0
+            self._last_decrease = 0.0
+            metrics.set_gauge(f"ratelimit.{host}.limit", self.limit)
+        else:
+            self.max_limit = max_in_flight
+            self.limit = float(max_in_flight)
+
+    def _reserve(self) -> float:
+        """
+        Takes a token from the bucket, and returns how many seconds must be waited before it can be used.
+        """
+        with self._lock:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            self.tokens -= 1
+            return 0 if self.tokens >= 0 else -self.tokens / self.rate
+
+    def _refund(self):
+        with self._lock:
+            self.tokens += 1
+
+    def _take_slot(self, timeout: Optional[float]) -> bool:
+        """
+        Waits until the number of requests in flight is below the current limit, and takes a slot.
+        :return: False if no slot became available within the given timeout, True otherwise.
+        """
+        with self._condition:
+            if self.limit > 0:
+                available = self._condition.wait_for(lambda: self.in_flight < int(self.limit), timeout=timeout)
+                if not available:
+                    return False
+
+            self.in_flight += 1
+            return True
+
+    def _release_slot(self):
+        with self._condition:
+            self.in_flight -= 1
+            self._condition.notify()
+
+    @contextlib.contextmanager
+    def acquire(self):
+        """
+        Waits until a request can be performed towards the host, and holds its slot until the context is exited.
+        The number of seconds waited is recorded inside the metrics.
+        :return: This limiter, so that the outcome of the request can be reported using observe.
+        :raise DeadlineExceededError if the deadline of the current invocation expires while waiting.
+        """
+        start = time.monotonic()
+        current = deadline.current()
+
+        timeout = None if current is None else max(0.0, current.remaining())
+        if not self._take_slot(timeout):
+            raise deadline.DeadlineExceededError(current.budget)
+
+        try:
+            if self.rate > 0:
+                delay = self._reserve()
+                if current is not None and delay > current.remaining():
+                    self._refund()
+                    raise deadline.DeadlineExceededError(current.budget)
+                if delay > 0:
+                    time.sleep(delay)
+
+            metrics.increment(f"ratelimit.{self.host}.requests")
+            metrics.increment(f"ratelimit.{self.host}.wait_seconds", time.monotonic() - start)
+            yield self
+        finally:
+            self._release_slot()
+
+    def observe(self, latency: float, failed: bool):
+        """
+        Reports the outcome of a request, adapting the limit of requests in flight if needed.
+        :param latency: Number of seconds the request took.
+        :param failed: Whether the request timed out or the host answered with a 429 or 5xx status.
+        """
+        if not self.adaptive:
+            return
+
+        with self._condition:
+            self._samples.append((latency, failed))
+            if failed:
+                # Requests sent before the previous decrease might still be failing, so wait for them to complete
+                now = time.monotonic()
+                if now - self._last_decrease >= self._p95_latency():
+                    self.limit = max(1.0, self.limit * ADAPTIVE_DECREASE_FACTOR)
+                    self._last_decrease = now
+                    self._successes = 0
+            else:
+                self._successes += 1
+                if self._successes >= self.limit and self._healthy():
+                    self.limit = min(float(self.max_limit), self.limit + 1)
+                    self._successes = 0
+                    self._condition.notify()
+
+            metrics.set_gauge(f"ratelimit.{self.host}.limit", self.limit)
+
+    def _p95_latency(self) -> float:
+        latencies = sorted(latency for latency, _ in self._samples)
+        return latencies[int(len(latencies) * 0.95)] if latencies else 0.0
+
+    def _healthy(self) -> bool:
+        errors = sum(1 for _, failed in self._samples if failed)
+        return (self._p95_latency() <= ADAPTIVE_LATENCY_TARGET and
+                errors <= len(self._samples) * ADAPTIVE_ERROR_RATE_TARGET)
+
+
+def get_limiter(host: str) -> HostLimiter:
+    """
+    Returns the limiter shared by all the requests performed towards the given host.
+    """
+    with _lock:
+        if host not in _limiters:
+            rate, max_in_flight = 0.0, 0
+            for pattern, rule_rate, rule_max_in_flight in RULES:
+                if fnmatch.fnmatch(host, pattern):
+                    rate, max_in_flight = rule_rate, rule_max_in_flight
+                    break
+
+            _limiters[host] = HostLimiter(host, rate, max_in_flight, ADAPTIVE)
+
+        return _limiters[host]
+
+
+def limit(url: str):
+    """
+    Returns a context manager that waits until a request towards the given URL can be performed, and holds its slot.
+    """
+    return get_limiter(urllib.parse.urlsplit(url).hostname or "").acquire()
+
+
+def configure(value: Optional[str] = None, adaptive: Optional[bool] = None):
+    """
+    Replaces the limits applied to each host.
+    :param value: Limits configuration, using the same format of the THEMIS_HOST_LIMITS variable. If None, the
+    current rules are kept.
+    :param adaptive: Whether the maximum number of in-flight requests of each host should adapt over time. If None,
+    the current setting is kept.
+    """
+    global RULES, ADAPTIVE
+    with _lock:
+        if value is not None:
+            RULES = parse_rules(value)
+        if adaptive is not None:
+            ADAPTIVE = adaptive
+        _limiters.clear()
@@ -0,0 +1,126 @@
+import threading
+import time
+import unittest
+from unittest import mock
+
+import deadline
+import metrics
+import ratelimit
+
+
+class RateLimitTest(unittest.TestCase):
+
+    def tearDown(self):
+        ratelimit.configure('*=0:16', adaptive=False)
+
+    def test_parse_rules(self):
+        rules = ratelimit.parse_rules('themis.mainnet.desmos.network=20:8, *.pastebin.com=2.5:2,*=0:16')
+        self.assertEqual([
+            ('themis.mainnet.desmos.network', 20.0, 8),
+            ('*.pastebin.com', 2.5, 2),
+            ('*', 0.0, 16),
+        ], rules)
+
+    def test_get_limiter(self):
+        ratelimit.configure('themis.mainnet.desmos.network=20:8,*.pastebin.com=2:2')
+
+        limiter = ratelimit.get_limiter('themis.mainnet.desmos.network')
+        self.assertEqual((20, 8), (limiter.rate, limiter.max_in_flight))
+        self.assertIs(limiter, ratelimit.get_limiter('themis.mainnet.desmos.network'))
+
+        limiter = ratelimit.get_limiter('www.pastebin.com')
+        self.assertEqual((2, 2), (limiter.rate, limiter.max_in_flight))
+
+        # Hosts not matching any rule are not limited
+        limiter = ratelimit.get_limiter('bitcoin.org')
+        self.assertEqual((0, 0), (limiter.rate, limiter.max_in_flight))
+
+    def test_rate(self):
+        ratelimit.configure('*=50:0')
+        metrics.reset()
+
+        start = time.monotonic()
+        for _ in range(60):
+            with ratelimit.limit('https://pastebin.com/raw/xz4S8WrW'):
+                pass
+
+        # The first 50 requests are served by the bucket capacity, the other 10 must wait for new tokens
+        self.assertGreaterEqual(time.monotonic() - start, 0.18)
+        counters = metrics.snapshot()['counters']
+        self.assertEqual(60, counters['ratelimit.pastebin.com.requests'])
+        self.assertGreater(counters['ratelimit.pastebin.com.wait_seconds'], 0)
+
+    def test_max_in_flight(self):
+        ratelimit.configure('*=0:2')
+        in_flight = []
+        peak = []
+        lock = threading.Lock()
+
+        def run():
+            with ratelimit.limit('https://pastebin.com/raw/xz4S8WrW'):
+                with lock:
+                    in_flight.append(1)
+                    peak.append(len(in_flight))
+                time.sleep(0.02)
+                with lock:
+                    in_flight.pop()
+
+        threads = [threading.Thread(target=run) for _ in range(6)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(2, max(peak))
+
+    def test_deadline(self):
+        ratelimit.configure('*=1:0')
+
+        @deadline.with_deadline
+        def run():
+            for _ in range(3):
+                with ratelimit.limit('https://pastebin.com/raw/xz4S8WrW'):
+                    pass
+
+        with mock.patch.object(deadline, 'BUDGET', 0.5):
+            with self.assertRaises(deadline.DeadlineExceededError):
+                run()
+
+    def test_adaptive(self):
+        metrics.reset()
+        limiter = ratelimit.HostLimiter('themis.mainnet.desmos.network', 0, 10, adaptive=True)
+        self.assertEqual(ratelimit.ADAPTIVE_INITIAL_LIMIT, limiter.limit)
+
+        # Fast successful requests increase the limit, up to its maximum
+        for _ in range(100):
+            limiter.observe(0.1, False)
+        self.assertEqual(10, limiter.limit)
+
+        # A failure halves the limit, but failures of requests sent before that do not cut it again
+        limiter.observe(0.1, True)
+        self.assertEqual(5, limiter.limit)
+        limiter.observe(0.1, True)
+        self.assertEqual(5, limiter.limit)
+        self.assertEqual(5, metrics.snapshot()['gauges']['ratelimit.themis.mainnet.desmos.network.limit'])
+
+        # Slow requests do not increase the limit
+        limiter = ratelimit.HostLimiter('themis.mainnet.desmos.network', 0, 10, adaptive=True)
+        for _ in range(100):
+            limiter.observe(ratelimit.ADAPTIVE_LATENCY_TARGET + 1, False)
+        self.assertEqual(ratelimit.ADAPTIVE_INITIAL_LIMIT, limiter.limit)
+
+    def test_adaptive_max_in_flight(self):
+        limiter = ratelimit.HostLimiter('pastebin.com', 0, 0, adaptive=True)
+        limiter.limit = 1
+
+        with limiter.acquire():
+            self.assertEqual(1, limiter.in_flight)
+
+            # No other slot is available until the first one is released
+            self.assertFalse(limiter._take_slot(timeout=0.01))
+
+        self.assertEqual(0, limiter.in_flight)
+
+
+if __name__ == '__main__':
+    unittest.main()
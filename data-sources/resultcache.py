@@ -0,0 +1,185 @@
+import functools
+import hashlib
+import json
+import os
+import threading
+import time
+from typing import Optional
+
+import metrics
+
+# Directory where the results of the invocations are shared by all the processes of the same host, if any
+PATH = os.environ.get("THEMIS_RESULT_CACHE")
+
+# Number of seconds the result of a successful invocation is reused for
+TTL = float(os.environ.get("THEMIS_RESULT_CACHE_TTL", "300"))
+
+# Number of seconds the error of a failed invocation is reused for. This is shorter since the failure might be fixed
+# (eg. by editing the proof) or be temporary
+ERROR_TTL = float(os.environ.get("THEMIS_RESULT_CACHE_ERROR_TTL", "30"))
+
+# Name of the file whose modification time tells when the cache has last been pruned, by any of the processes
+PRUNE_MARKER = ".pruned"
+
+_lock = threading.Lock()
+
+
+def call_key(application: str, args: str) -> tuple:
+    """
+    Returns the key identifying the invocation of the given application with the given call data, so that the same
+    arguments share the same key however they are encoded (hex case, JSON keys order and whitespaces).
+    Call data that cannot be decoded is identified by its hex string, ignoring its case.
+    """
+    try:
+        decoded = json.loads(bytes.fromhex(args))
+    except ValueError:
+        return application, args.strip().lower()
+
+    return application, json.dumps(decoded, sort_keys=True, separators=(",", ":"))
+
+
+def _entry_path(key: tuple) -> str:
+    digest = hashlib.sha256(json.dumps(key).encode()).hexdigest()
+    return os.path.join(PATH, f"{digest}.json")
+
+
+def get(key: tuple) -> Optional[dict]:
+    """
+    Returns the cached outcome of the invocation having the given key, as a dictionary containing either its "result"
+    or its "error", or None if it is not cached or has expired.
+    """
+    try:
+        with open(_entry_path(key)) as file:
+            entry = json.load(file)
+    except (OSError, ValueError):
+        return None
+
+    # The file name is a hash, so make sure it really belongs to this invocation
+    if entry.get("key") != list(key) or entry.get("expires_at", 0) <= time.time():
+        return None
+
+    return entry
+
+
+def put(key: tuple, result: Optional[str] = None, error: Optional[str] = None):
+    """
+    Caches the outcome of the invocation having the given key, either its result or its error.
+    The entry is written to a temporary file and then renamed, so that concurrent processes never read a partial one.
+    """
+    ttl = ERROR_TTL if error is not None else TTL
+    entry = {"key": list(key), "expires_at": time.time() + ttl, "result": result, "error": error}
+
+    path = _entry_path(key)
+    temp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    try:
+        os.makedirs(PATH, exist_ok=True)
+        with open(temp_path, "w") as file:
+            json.dump(entry, file)
+        os.replace(temp_path, path)
+    except OSError:
+        # Caching is only an optimization, the invocation result is still valid
+        if os.path.exists(temp_path):
+            os.unlink(temp_path)
+        return
+
+    if _should_prune():
+        # Pruning takes time proportional to the cache size, so it never runs inside the invocation
+        threading.Thread(target=_prune, args=(PATH,), daemon=True).start()
+
+
+def _should_prune() -> bool:
+    """
+    Tells whether the expired entries should be removed, which happens at most once every TTL seconds across all the
+    processes sharing the cache. The caller that gets True is the one that should prune.
+    """
+    marker = os.path.join(PATH, PRUNE_MARKER)
+    now = time.time()
+    with _lock:
+        try:
+            if now - os.stat(marker).st_mtime < TTL:
+                return False
+            os.utime(marker, (now, now))
+        except FileNotFoundError:
+            try:
+                open(marker, "a").close()
+            except OSError:
+                return False
+        except OSError:
+            return False
+
+    return True
+
+
+def _prune(directory: str):
+    """
+    Removes the expired entries from the given cache directory.
+    """
+    now = time.time()
+    try:
+        names = os.listdir(directory)
+    except OSError:
+        return
+
+    for name in names:
+        if not name.endswith(".json"):
+            continue
+
+        path = os.path.join(directory, name)
+        try:
+            with open(path) as file:
+                expired = json.load(file).get("expires_at", 0) <= now
+        except (OSError, ValueError):
+            continue
+
+        if expired:
+            try:
+                os.unlink(path)
+            except OSError:
+                # Already removed by another process
+                pass
+
+
+def cached(application: str):
+    """
+    Decorator caching the outcome of the main_async coroutine of the given application into the directory set using
+    THEMIS_RESULT_CACHE, so that invocations having the same call data reuse it until it expires, even when running
+    inside separate processes. Both results and errors are cached, the latter for a shorter time.
+    Nothing is cached if THEMIS_RESULT_CACHE is not set.
+    """
+
+    def decorator(func):
+        @functools.wraps(func)
+        async def wrapper(args: str):
+            if not PATH:
+                return await func(args)
+
+            key = call_key(application, args)
+            entry = get(key)
+            if entry is not None:
+                metrics.increment("resultcache.hits")
+                if entry["error"] is not None:
+                    raise Exception(entry["error"])
+                return entry["result"]
+
+            metrics.increment("resultcache.misses")
+            try:
+                result = await func(args)
+            except Exception as err:
+                put(key, error=str(err))
+                raise
+
+            put(key, result=result)
+            return result
+
+        return wrapper
+
+    return decorator
+
+
+def configure(path: Optional[str] = None):
+    """
+    Sets the directory where the results are cached. If None, results are not cached at all.
+    """
+    global PATH
+    with _lock:
+        PATH = path
@@ -0,0 +1,134 @@
+import asyncio
+import os
+import subprocess
+import sys
+import tempfile
+import time
+import unittest
+from unittest import mock
+
+import metrics
+import resultcache
+
+TWEET_ARGS = '7B226D6574686F64223A227477656574222C2276616C7565223A2231333932303333353835363735333137323532227D'
+
+
+class ResultCacheTest(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        resultcache.configure(self.directory.name)
+        metrics.reset()
+
+    def tearDown(self):
+        resultcache.configure()
+        self.directory.cleanup()
+
+    def test_call_key(self):
+        expected = ('twitter', '{"method":"tweet","value":"1392033585675317252"}')
+        tests = [
+            '7B226D6574686F64223A227477656574222C2276616C7565223A2231333932303333353835363735333137323532227D',
+            '7b226d6574686f64223a227477656574222c2276616c7565223a2231333932303333353835363735333137323532227d',
+            '7B2276616C7565223A202231333932303333353835363735333137323532222C20226D6574686F64223A20227477656574227D',
+        ]
+
+        for args in tests:
+            self.assertEqual(expected, resultcache.call_key('twitter', args), args)
+
+        self.assertEqual(('twitter', 'zz'), resultcache.call_key('twitter', 'ZZ'))
+
+    def test_cached(self):
+        calls = []
+
+        @resultcache.cached('twitter')
+        async def main_async(args: str):
+            calls.append(args)
+            if args == '00':
+                raise Exception('Invalid signature')
+            return 'value,signature,RiccardoM'
+
+        for _ in range(2):
+            self.assertEqual('value,signature,RiccardoM', asyncio.run(main_async(TWEET_ARGS)))
+            with self.assertRaisesRegex(Exception, 'Invalid signature'):
+                asyncio.run(main_async('00'))
+
+        # The same call data encoded differently shares the same entry
+        self.assertEqual('value,signature,RiccardoM', asyncio.run(main_async(TWEET_ARGS.lower())))
+
+        self.assertEqual([TWEET_ARGS, '00'], calls)
+        counters = metrics.snapshot()['counters']
+        self.assertEqual(3, counters['resultcache.hits'])
+        self.assertEqual(2, counters['resultcache.misses'])
+
+    def test_cached_disabled(self):
+        resultcache.configure()
+        calls = []
+
+        @resultcache.cached('twitter')
+        async def main_async(args: str):
+            calls.append(args)
+            return 'value,signature,RiccardoM'
+
+        asyncio.run(main_async(TWEET_ARGS))
+        asyncio.run(main_async(TWEET_ARGS))
+        self.assertEqual(2, len(calls))
+        self.assertEqual([], os.listdir(self.directory.name))
+
+    def test_expiration(self):
+        key = resultcache.call_key('twitter', TWEET_ARGS)
+        resultcache.put(key, error='Invalid signature')
+        self.assertEqual('Invalid signature', resultcache.get(key)['error'])
+
+        # Errors expire before results
+        future = time.time() + resultcache.ERROR_TTL + 1
+        with mock.patch('time.time', return_value=future):
+            self.assertIsNone(resultcache.get(key))
+
+        resultcache.put(key, result='value,signature,RiccardoM')
+        with mock.patch('time.time', return_value=future):
+            self.assertEqual('value,signature,RiccardoM', resultcache.get(key)['result'])
+
+    def test_unwritable_directory(self):
+        resultcache.configure('/proc/themis-cache')
+
+        @resultcache.cached('twitter')
+        async def main_async(args: str):
+            return 'value,signature,RiccardoM'
+
+        # Caching failures never fail the invocation
+        self.assertEqual('value,signature,RiccardoM', asyncio.run(main_async(TWEET_ARGS)))
+
+    def test_prune(self):
+        expired = resultcache.call_key('twitter', '00')
+        valid = resultcache.call_key('twitter', TWEET_ARGS)
+        resultcache.put(expired, error='Invalid signature')
+        resultcache.put(valid, result='value,signature,RiccardoM')
+
+        # Pruning happens at most once every TTL seconds, across all the processes
+        self.assertFalse(resultcache._should_prune())
+        marker = os.path.join(self.directory.name, resultcache.PRUNE_MARKER)
+        os.utime(marker, (0, 0))
+        self.assertTrue(resultcache._should_prune())
+        self.assertFalse(resultcache._should_prune())
+
+        with mock.patch('time.time', return_value=time.time() + resultcache.ERROR_TTL + 1):
+            resultcache._prune(self.directory.name)
+
+        self.assertEqual(2, len(os.listdir(self.directory.name)))
+        self.assertEqual('value,signature,RiccardoM', resultcache.get(valid)['result'])
+
+    def test_shared_across_processes(self):
+        script = (
+            'import resultcache, sys;'
+            'resultcache.configure(sys.argv[1]);'
+            f'resultcache.put(resultcache.call_key("twitter", "{TWEET_ARGS}"), result="value,signature,RiccardoM")'
+        )
+        subprocess.run([sys.executable, '-c', script, self.directory.name], check=True,
+                       cwd=os.path.dirname(os.path.abspath(resultcache.__file__)))
+
+        entry = resultcache.get(resultcache.call_key('twitter', TWEET_ARGS.lower()))
+        self.assertEqual('value,signature,RiccardoM', entry['result'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,82 @@
+import json
+import os
+import re
+import threading
+from typing import List, Optional, Tuple
+
+# Rules rewriting the links to the pages of known proof hosts into the links to their raw content, as a list of
+# (pattern, replacement) tuples. Each pattern must match the whole URL, and the replacement can refer to its groups
+DEFAULT_RULES = [
+    (r"https?://(?:www\.)?pastebin\.com/(?!raw/)(\w+)/?", r"https://pastebin.com/raw/\1"),
+    (r"https?://gist\.github\.com/([\w-]+)/([0-9a-fA-F]+)/?", r"https://gist.githubusercontent.com/\1/\2/raw/"),
+    (r"https?://github\.com/([\w.-]+)/([\w.-]+)/blob/(.+)", r"https://raw.githubusercontent.com/\1/\2/\3"),
+]
+
+
+def parse_rules(value: str) -> List[Tuple[str, str]]:
+    """
+    Parses the given rewrite rules configuration, formed as a JSON list of [pattern, replacement] pairs.
+    :param value: Rules configuration (eg. '[["https://hastebin.com/(\\\\w+)", "https://hastebin.com/raw/\\\\1"]]').
+    :return: A list of (pattern, replacement) tuples.
+    :raise ValueError if the configuration is not a list of pairs, or if any pattern is not a valid regex.
+    """
+    if not value.strip():
+        return []
+
+    entries = json.loads(value)
+    if not isinstance(entries, list):
+        raise ValueError(f"Invalid rewrite rules: {value}")
+
+    rules = []
+    for entry in entries:
+        if not isinstance(entry, list) or len(entry) != 2:
+            raise ValueError(f"Invalid rewrite rule: {entry}")
+
+        pattern, replacement = entry
+        try:
+            re.compile(pattern)
+        except re.error as err:
+            raise ValueError(f"Invalid rewrite rule pattern {pattern}: {err}")
+        rules.append((pattern, replacement))
+
+    return rules
+
+
+# Additional rules, tried before the default ones
+RULES = parse_rules(os.environ.get("THEMIS_PROOF_REWRITES", ""))
+
+_compiled = None
+_lock = threading.Lock()
+
+
+def _get_rules() -> List[Tuple[re.Pattern, str]]:
+    global _compiled
+    with _lock:
+        if _compiled is None:
+            _compiled = [(re.compile(pattern), replacement) for pattern, replacement in RULES + DEFAULT_RULES]
+        return _compiled
+
+
+def rewrite_url(url: str) -> str:
+    """
+    Returns the URL serving the raw content of the given proof URL, using the first rule whose pattern matches it.
+    URLs not matching any rule are returned as they are.
+    """
+    for pattern, replacement in _get_rules():
+        match = pattern.fullmatch(url)
+        if match is not None:
+            return match.expand(replacement)
+
+    return url
+
+
+def configure(value: Optional[str] = None):
+    """
+    Replaces the additional rewrite rules.
+    :param value: Rules configuration, using the same format of the THEMIS_PROOF_REWRITES variable. If None, only the
+    default rules are used.
+    """
+    global RULES, _compiled
+    with _lock:
+        RULES = parse_rules(value) if value is not None else []
+        _compiled = None
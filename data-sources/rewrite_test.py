@@ -0,0 +1,47 @@
+import unittest
+
+import rewrite
+
+
+class RewriteTest(unittest.TestCase):
+
+    def tearDown(self):
+        rewrite.configure()
+
+    def test_rewrite_url(self):
+        tests = [
+            ('https://pastebin.com/xz4S8WrW', 'https://pastebin.com/raw/xz4S8WrW'),
+            ('https://www.pastebin.com/xz4S8WrW/', 'https://pastebin.com/raw/xz4S8WrW'),
+            ('https://pastebin.com/raw/xz4S8WrW', 'https://pastebin.com/raw/xz4S8WrW'),
+            (
+                'https://gist.github.com/RiccardoM/720e0072390a901bb80e59fd60d7fded',
+                'https://gist.githubusercontent.com/RiccardoM/720e0072390a901bb80e59fd60d7fded/raw/',
+            ),
+            (
+                'https://github.com/RiccardoM/proofs/blob/main/desmos.json',
+                'https://raw.githubusercontent.com/RiccardoM/proofs/main/desmos.json',
+            ),
+            ('https://gist.github.com/RiccardoM', 'https://gist.github.com/RiccardoM'),
+            ('https://t.co/uD23HgSLJW', 'https://t.co/uD23HgSLJW'),
+        ]
+
+        for url, expected in tests:
+            self.assertEqual(expected, rewrite.rewrite_url(url), url)
+
+    def test_configure(self):
+        rewrite.configure('[["https://hastebin.com/(\\\\w+)", "https://hastebin.com/raw/\\\\1"]]')
+        self.assertEqual('https://hastebin.com/raw/abcdef', rewrite.rewrite_url('https://hastebin.com/abcdef'))
+
+        # Default rules are still applied
+        self.assertEqual('https://pastebin.com/raw/xz4S8WrW', rewrite.rewrite_url('https://pastebin.com/xz4S8WrW'))
+
+    def test_parse_rules(self):
+        self.assertEqual([], rewrite.parse_rules(''))
+
+        for value in ['[["https://hastebin.com/(\\\\w+"]]', '[["(", "\\\\1"]]', '{}']:
+            with self.assertRaises(ValueError, msg=value):
+                rewrite.parse_rules(value)
+
+
+if __name__ == '__main__':
+    unittest.main()
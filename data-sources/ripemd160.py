@@ -0,0 +1,121 @@
+import hashlib
+import struct
+
+# Message word selection, rotation amounts and constants of the left and right lines
+_R_LEFT = [
+    0, 1, 2, 3, 4, 5, 6, 7, 8, 9, 10, 11, 12, 13, 14, 15,
+    7, 4, 13, 1, 10, 6, 15, 3, 12, 0, 9, 5, 2, 14, 11, 8,
+    3, 10, 14, 4, 9, 15, 8, 1, 2, 7, 0, 6, 13, 11, 5, 12,
+    1, 9, 11, 10, 0, 8, 12, 4, 13, 3, 7, 15, 14, 5, 6, 2,
+    4, 0, 5, 9, 7, 12, 2, 10, 14, 1, 3, 8, 11, 6, 15, 13,
+]
+_R_RIGHT = [
+    5, 14, 7, 0, 9, 2, 11, 4, 13, 6, 15, 8, 1, 10, 3, 12,
+    6, 11, 3, 7, 0, 13, 5, 10, 14, 15, 8, 12, 4, 9, 1, 2,
+    15, 5, 1, 3, 7, 14, 6, 9, 11, 8, 12, 2, 10, 0, 4, 13,
+    8, 6, 4, 1, 3, 11, 15, 0, 5, 12, 2, 13, 9, 7, 10, 14,
+    12, 15, 10, 4, 1, 5, 8, 7, 6, 2, 13, 14, 0, 3, 9, 11,
+]
+_S_LEFT = [
+    11, 14, 15, 12, 5, 8, 7, 9, 11, 13, 14, 15, 6, 7, 9, 8,
+    7, 6, 8, 13, 11, 9, 7, 15, 7, 12, 15, 9, 11, 7, 13, 12,
+    11, 13, 6, 7, 14, 9, 13, 15, 14, 8, 13, 6, 5, 12, 7, 5,
+    11, 12, 14, 15, 14, 15, 9, 8, 9, 14, 5, 6, 8, 6, 5, 12,
+    9, 15, 5, 11, 6, 8, 13, 12, 5, 12, 13, 14, 11, 8, 5, 6,
+]
+_S_RIGHT = [
+    8, 9, 9, 11, 13, 15, 15, 5, 7, 7, 8, 11, 14, 14, 12, 6,
+    9, 13, 15, 7, 12, 8, 9, 11, 7, 7, 12, 7, 6, 15, 13, 11,
+    9, 7, 15, 11, 8, 6, 6, 14, 12, 13, 5, 14, 13, 13, 7, 5,
+    15, 5, 8, 11, 14, 14, 6, 14, 6, 9, 12, 9, 12, 5, 15, 8,
+    8, 5, 12, 9, 12, 5, 14, 6, 8, 13, 6, 5, 15, 13, 11, 11,
+]
+_K_LEFT = [0x00000000, 0x5A827999, 0x6ED9EBA1, 0x8F1BBCDC, 0xA953FD4E]
+_K_RIGHT = [0x50A28BE6, 0x5C4DD124, 0x6D703EF3, 0x7A6D76E9, 0x00000000]
+
+_INITIAL_STATE = (0x67452301, 0xEFCDAB89, 0x98BADCFE, 0x10325476, 0xC3D2E1F0)
+
+_MASK = 0xFFFFFFFF
+
+# Per-step tables, so that the compression function does not need to compute indexes while running
+_LEFT_STEPS = [(j // 16, _R_LEFT[j], _S_LEFT[j], _K_LEFT[j // 16]) for j in range(80)]
+_RIGHT_STEPS = [(4 - j // 16, _R_RIGHT[j], _S_RIGHT[j], _K_RIGHT[j // 16]) for j in range(80)]
+
+
+def _f(round_number: int, x: int, y: int, z: int) -> int:
+    if round_number == 0:
+        return x ^ y ^ z
+    if round_number == 1:
+        return (x & y) | (~x & z)
+    if round_number == 2:
+        return (x | ~y) ^ z
+    if round_number == 3:
+        return (x & z) | (y & ~z)
+    return x ^ (y | ~z)
+
+
+def _compress(state: tuple, block: bytes) -> tuple:
+    x = struct.unpack("<16I", block)
+    mask = _MASK
+    f = _f
+
+    al, bl, cl, dl, el = state
+    for round_number, r, s, k in _LEFT_STEPS:
+        t = (al + f(round_number, bl, cl, dl) + x[r] + k) & mask
+        t = (((t << s) | (t >> (32 - s))) + el) & mask
+        al, el, dl, cl, bl = el, dl, ((cl << 10) | (cl >> 22)) & mask, bl, t
+
+    ar, br, cr, dr, er = state
+    for round_number, r, s, k in _RIGHT_STEPS:
+        t = (ar + f(round_number, br, cr, dr) + x[r] + k) & mask
+        t = (((t << s) | (t >> (32 - s))) + er) & mask
+        ar, er, dr, cr, br = er, dr, ((cr << 10) | (cr >> 22)) & mask, br, t
+
+    h0, h1, h2, h3, h4 = state
+    return (
+        (h1 + cl + dr) & mask,
+        (h2 + dl + er) & mask,
+        (h3 + el + ar) & mask,
+        (h4 + al + br) & mask,
+        (h0 + bl + cr) & mask,
+    )
+
+
+def ripemd160_python(data: bytes) -> bytes:
+    """
+    Computes the RIPEMD-160 digest of the given data, without relying on the hashing algorithms provided by OpenSSL.
+    :param data: Data to be hashed.
+    :return: The 20 bytes digest.
+    """
+    padding = b"\x80" + b"\x00" * ((55 - len(data)) % 64) + struct.pack("<Q", (len(data) * 8) & 0xFFFFFFFFFFFFFFFF)
+    message = data + padding
+
+    state = _INITIAL_STATE
+    for offset in range(0, len(message), 64):
+        state = _compress(state, message[offset:offset + 64])
+
+    return struct.pack("<5I", *state)
+
+
+def _has_hashlib_ripemd160() -> bool:
+    try:
+        hashlib.new("ripemd160")
+        return True
+    except ValueError:
+        return False
+
+
+# OpenSSL 3 does not provide RIPEMD-160 unless its legacy provider is loaded, so check only once whether it is there
+HASHLIB_RIPEMD160 = _has_hashlib_ripemd160()
+
+
+def ripemd160(data: bytes) -> bytes:
+    """
+    Computes the RIPEMD-160 digest of the given data, using hashlib when it supports it.
+    :param data: Data to be hashed.
+    :return: The 20 bytes digest.
+    """
+    if HASHLIB_RIPEMD160:
+        return hashlib.new("ripemd160", data).digest()
+
+    return ripemd160_python(data)
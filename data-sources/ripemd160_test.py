@@ -0,0 +1,35 @@
+import unittest
+from unittest import mock
+
+import ripemd160
+
+
+class RIPEMD160Test(unittest.TestCase):
+
+    def test_ripemd160_python(self):
+        tests = [
+            {'data': b'', 'digest': '9c1185a5c5e9fc54612808977ee8f548b2258d31'},
+            {'data': b'a', 'digest': '0bdc9d2d256b3ee9daae347be6f4dc835a467ffe'},
+            {'data': b'abc', 'digest': '8eb208f7e05d987a9b044a8e98c6b087f15a0bfc'},
+            {'data': b'message digest', 'digest': '5d0689ef49d2fae572b881b123a85ffa21595f36'},
+            {'data': b'abcdefghijklmnopqrstuvwxyz', 'digest': 'f71c27109c692c1b56bbdceb5b9d2865b3708dbc'},
+            {
+                'data': b'abcdbcdecdefdefgefghfghighijhijkijkljklmklmnlmnomnopnopq',
+                'digest': '12a053384a9c0c88e405a06c27dcf49ada62eb2b',
+            },
+            {'data': b'1234567890' * 8, 'digest': '9b752e45573d4b39f4dbd3323cab82bf63326bfb'},
+        ]
+
+        for test in tests:
+            self.assertEqual(test['digest'], ripemd160.ripemd160_python(test['data']).hex(), test['data'][:20])
+
+    def test_ripemd160(self):
+        data = bytes.fromhex('033024e9e0ad4f93045ef5a60bb92171e6418cd13b082e7a7bc3ed05312a0b417d')
+        expected = ripemd160.ripemd160_python(data)
+        for available in [True, False]:
+            with mock.patch.object(ripemd160, 'HASHLIB_RIPEMD160', available and ripemd160.HASHLIB_RIPEMD160):
+                self.assertEqual(expected, ripemd160.ripemd160(data))
+
+
+if __name__ == '__main__':
+    unittest.main()
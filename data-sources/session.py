@@ -0,0 +1,288 @@
+import json
+import os
+import socket
+import threading
+import time
+from typing import Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+import cancellation
+import circuit
+import deadline
+import negcache
+import ratelimit
+import store
+import unixsocket
+
+# Maximum number of connections kept alive towards each host
+POOL_SIZE = int(os.environ.get("THEMIS_HTTP_POOL_SIZE", "10"))
+
+# Number of times a failed request is retried, and the backoff factor used between each retry
+MAX_RETRIES = int(os.environ.get("THEMIS_HTTP_MAX_RETRIES", "2"))
+BACKOFF_FACTOR = float(os.environ.get("THEMIS_HTTP_BACKOFF_FACTOR", "0.1"))
+
+# Whether the connections should be kept open once a request has completed
+KEEP_ALIVE = os.environ.get("THEMIS_HTTP_KEEP_ALIVE", "1") != "0"
+
+# Status codes that cause a request to be retried
+RETRY_STATUSES = [502, 503, 504]
+
+# Methods that are retried upon connection errors and timeouts, since sending them twice is harmless
+IDEMPOTENT_METHODS = frozenset({"GET", "HEAD", "OPTIONS"})
+
+# Maximum size, in bytes, of the JSON objects downloaded using get_json_object
+MAX_OBJECT_SIZE = int(os.environ.get("THEMIS_HTTP_MAX_OBJECT_SIZE", "65536"))
+
+# Size of the chunks in which the response bodies are streamed
+CHUNK_SIZE = 1024
+
+UTF8_BOM = b"\xef\xbb\xbf"
+
+_session = None
+_deadline_session = None
+_options = {}
+_lock = threading.Lock()
+
+
+def new_session(
+        pool_size: int = POOL_SIZE,
+        max_retries: int = MAX_RETRIES,
+        backoff_factor: float = BACKOFF_FACTOR,
+        keep_alive: bool = KEEP_ALIVE,
+) -> requests.Session:
+    """
+    Creates a new session that pools the connections towards each host, and that can reach the servers listening on
+    a Unix domain socket through "http+unix://" URLs.
+    :param pool_size: Maximum number of connections kept alive towards each host.
+    :param max_retries: Number of times a request is retried upon a connection error or a 5xx response.
+    :param backoff_factor: Backoff factor used to compute how long to wait between retries.
+    :param keep_alive: Whether the connections should be reused across requests.
+    :return: A new requests.Session instance.
+    """
+    retry = Retry(
+        total=max_retries,
+        backoff_factor=backoff_factor,
+        status_forcelist=RETRY_STATUSES,
+        raise_on_status=False,
+    )
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=retry)
+
+    session = requests.Session()
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    session.mount(f"{unixsocket.SCHEME}://", unixsocket.UnixAdapter(pool_size, max_retries=retry))
+    if not keep_alive:
+        session.headers["Connection"] = "close"
+
+    return session
+
+
+def get_session() -> requests.Session:
+    """
+    Returns the session shared by all the data sources, creating it if needed.
+    """
+    global _session
+    with _lock:
+        if _session is None:
+            _session = new_session()
+        return _session
+
+
+def _get_deadline_session() -> requests.Session:
+    """
+    Returns the session used by the requests bound to a deadline, which never retries on its own so that the timeout
+    of each attempt can be capped to the time left (see _perform).
+    """
+    global _deadline_session
+    with _lock:
+        if _deadline_session is None:
+            _deadline_session = new_session(**{**_options, "max_retries": 0})
+        return _deadline_session
+
+
+def configure(session: Optional[requests.Session] = None, **kwargs):
+    """
+    Replaces the shared session.
+    :param session: Session to be used. If None, a new one is created passing the given kwargs to new_session.
+    """
+    global _session, _deadline_session, _options
+    with _lock:
+        for old in [_session, _deadline_session]:
+            if old is not None:
+                old.close()
+
+        _session = session if session is not None else new_session(**kwargs)
+        # A custom session is used as it is, retrying according to its own policy
+        _deadline_session = session
+        _options = kwargs if session is None else {"max_retries": 0}
+
+
+def request(method: str, url: str, timeout: float = deadline.API_TIMEOUT, **kwargs) -> requests.Response:
+    """
+    Performs an HTTP request using the shared session, respecting the limits of the requested host.
+    :param method: HTTP method to be used.
+    :param url: URL to be requested.
+    :param timeout: Maximum number of seconds the request can take. This is capped to the current deadline, if any.
+    :return: The response returned by the server.
+    :raise CircuitOpenError if the requested host is currently unhealthy, without performing the request.
+    :raise DeadlineExceededError if the deadline of the current invocation expires before the request has completed.
+    """
+    with circuit.guard(url) as breaker, ratelimit.limit(url) as limiter:
+        return _send(breaker, limiter, method, url, timeout, **kwargs)
+
+
+def _send(
+        breaker: circuit.CircuitBreaker,
+        limiter: ratelimit.HostLimiter,
+        method: str,
+        url: str,
+        timeout: float,
+        **kwargs,
+) -> requests.Response:
+    start = time.monotonic()
+    try:
+        response = _perform(method, url, timeout, **kwargs)
+    except (requests.exceptions.Timeout, requests.exceptions.ConnectionError):
+        # A request cut short by the deadline tells nothing about the host health, since the host was not given its
+        # full stage timeout. Such a timeout expires together with the deadline (once retries are exhausted, urllib3
+        # reports it as a ConnectionError), while genuine connection errors are immediate
+        deadline.check()
+
+        breaker.record(True)
+        limiter.observe(time.monotonic() - start, True)
+        raise
+
+    breaker.record(response.status_code >= 500)
+    limiter.observe(time.monotonic() - start, response.status_code == 429 or response.status_code >= 500)
+    return response
+
+
+def _perform(method: str, url: str, timeout: float, **kwargs) -> requests.Response:
+    """
+    Performs the given request, retrying it upon connection errors, timeouts and RETRY_STATUSES responses.
+    """
+    cancellation.check()
+    if deadline.current() is None:
+        return get_session().request(method, url, timeout=timeout, **kwargs)
+
+    # urllib3 would retry using the timeout computed for the first attempt, running past the deadline by up to
+    # (retries + 1) times. Retry here instead, capping the timeout of each attempt to the time left
+    max_retries = _options.get("max_retries", MAX_RETRIES)
+    backoff_factor = _options.get("backoff_factor", BACKOFF_FACTOR)
+    retries = 0
+    while True:
+        try:
+            response = _get_deadline_session().request(method, url, timeout=deadline.timeout(timeout), **kwargs)
+        except (requests.exceptions.Timeout, requests.exceptions.ConnectionError):
+            if retries >= max_retries or method.upper() not in IDEMPOTENT_METHODS:
+                raise
+        else:
+            if retries >= max_retries or response.status_code not in RETRY_STATUSES:
+                return response
+            response.close()
+
+        retries += 1
+        time.sleep(max(0.0, min(backoff_factor * (2 ** (retries - 1)), deadline.current().remaining())))
+        cancellation.check()
+
+
+def get_json_object(url: str, max_size: int = MAX_OBJECT_SIZE, timeout: float = deadline.PROOF_TIMEOUT, **kwargs) -> dict:
+    """
+    Downloads the JSON object served at the given URL, streaming the response body so that the download stops as soon
+    as it is clear that the body is not a JSON object (its first non-whitespace byte is not "{"), or that it is bigger
+    than the given size.
+    An unreachable URL, one whose host is currently unhealthy, or one that does not answer within the given timeout,
+    is treated as not containing any JSON object at all. URLs serving anything else than a JSON object are added to
+    the negative cache, so that they can be skipped by the following invocations, while the bodies of the ones
+    serving a JSON object are shared with the other processes through the response store, if enabled.
+    :param url: URL to be requested.
+    :param max_size: Maximum size of the response body, in bytes.
+    :param timeout: Maximum number of seconds the request can take. This is capped to the current deadline, if any.
+    :return: The downloaded JSON object.
+    :raise ValueError if the response body is not a JSON object, or if it is bigger than max_size.
+    :raise DeadlineExceededError if the deadline of the current invocation expires before the download has completed.
+    :raise CancelledError if the current operation is cancelled before the download has completed. The download is
+    interrupted right away, even if the host is not sending anything.
+    """
+    try:
+        return _get_json_object(url, max_size, timeout, **kwargs)
+    except (requests.exceptions.Timeout, requests.exceptions.ConnectionError, circuit.CircuitOpenError) as err:
+        deadline.check()
+        cancellation.check()
+        raise ValueError(f"Could not download {url}: {err}")
+
+
+def _get_json_object(url: str, max_size: int, timeout: float, **kwargs) -> dict:
+    key = negcache.normalize_url(url)
+    body = store.get(key)
+    if body is not None:
+        return json.loads(body)
+
+    # The host slot is held until the whole body has been downloaded
+    with circuit.guard(url) as breaker, ratelimit.limit(url) as limiter, \
+            _send(breaker, limiter, "GET", url, timeout, stream=True, **kwargs) as response:
+        try:
+            with cancellation.on_cancel(lambda: _interrupt(response)):
+                body = _read_json_body(response, max_size)
+            content = json.loads(body)
+        except ValueError:
+            # Remember the URLs that will never contain a proof, unless the failure might be temporary
+            if response.status_code < 500 and response.status_code != 429:
+                negcache.urls.add(url, response.headers.get("Content-Type"))
+            raise
+
+    if response.status_code == 200:
+        store.put(key, body, store.PROOF_TTL)
+    return content
+
+
+def _read_json_body(response: requests.Response, max_size: int) -> bytes:
+    content_length = response.headers.get("Content-Length")
+    if content_length is not None and content_length.isdigit() and int(content_length) > max_size:
+        raise ValueError(f"Response body is bigger than {max_size} bytes")
+
+    body = b""
+    started = False
+    for chunk in response.iter_content(chunk_size=CHUNK_SIZE):
+        deadline.check()
+        cancellation.check()
+
+        body += chunk
+        if len(body) > max_size:
+            raise ValueError(f"Response body is bigger than {max_size} bytes")
+
+        if not started:
+            start = body.lstrip()
+            if start.startswith(UTF8_BOM):
+                start = start[len(UTF8_BOM):].lstrip()
+
+            if len(start) > 0:
+                if not start.startswith(b"{"):
+                    raise ValueError("Response body is not a JSON object")
+                started = True
+
+    # An interrupted download ends as if the whole body had been read
+    cancellation.check()
+    return body
+
+
+def _interrupt(response: requests.Response):
+    """
+    Interrupts the download of the body of the given streamed response, waking up the thread blocked reading it.
+    Closing the response is not enough, since it does not wake up a blocked read.
+    """
+    # The socket is held by the urllib3 connection, unless the server is going to close it after this response, in
+    # which case http.client has handed it over to the response itself
+    sock = getattr(getattr(response.raw, "_connection", None), "sock", None)
+    if sock is None:
+        reader = getattr(getattr(response.raw, "_fp", None), "fp", None)
+        sock = getattr(getattr(reader, "raw", None), "_sock", None)
+
+    if sock is not None:
+        try:
+            sock.shutdown(socket.SHUT_RDWR)
+        except OSError:
+            pass
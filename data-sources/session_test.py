@@ -0,0 +1,142 @@
+import os
+import tempfile
+import unittest
+
+import httpretty
+
+import circuit
+import negcache
+import session
+import store
+
+
+class SessionTest(unittest.TestCase):
+
+    def tearDown(self):
+        session.configure()
+        circuit.reset()
+        negcache.urls.clear()
+
+    def test_new_session(self):
+        s = session.new_session(pool_size=3, max_retries=5, keep_alive=False)
+        adapter = s.get_adapter('https://themis.mainnet.desmos.network')
+        self.assertEqual(3, adapter._pool_maxsize)
+        self.assertEqual(5, adapter.max_retries.total)
+        self.assertEqual('close', s.headers['Connection'])
+
+        s = session.new_session()
+        self.assertEqual('keep-alive', s.headers['Connection'])
+
+    def test_get_session(self):
+        self.assertIs(session.get_session(), session.get_session())
+
+        old = session.get_session()
+        session.configure(pool_size=1)
+        self.assertIsNot(old, session.get_session())
+
+    @httpretty.activate(verbose=True, allow_net_connect=False)
+    def test_request(self):
+        httpretty.register_uri(
+            httpretty.GET,
+            "https://pastebin.com/raw/xz4S8WrW",
+            responses=[
+                httpretty.Response(body='', status=503),
+                httpretty.Response(body='{"value":"ricmontagnin"}', status=200),
+            ],
+        )
+
+        session.configure(backoff_factor=0)
+        response = session.request("GET", "https://pastebin.com/raw/xz4S8WrW")
+        self.assertEqual(200, response.status_code)
+        self.assertEqual({'value': 'ricmontagnin'}, response.json())
+
+    @httpretty.activate(verbose=True, allow_net_connect=False)
+    def test_get_json_object(self):
+        tests = [
+            {
+                'name': 'Valid JSON object',
+                'body': '{"value":"ricmontagnin"}',
+                'valid': True,
+            },
+            {
+                'name': 'JSON object with leading whitespaces',
+                'body': '\n  {"value":"ricmontagnin"}',
+                'valid': True,
+            },
+            {
+                'name': 'HTML page',
+                'body': '<html>' + 'Bitcoin website' * 1000 + '</html>',
+                'valid': False,
+            },
+            {
+                'name': 'JSON array',
+                'body': '[{"value":"ricmontagnin"}]',
+                'valid': False,
+            },
+            {
+                'name': 'Too big JSON object',
+                'body': '{"value":"' + 'a' * 1000 + '"}',
+                'valid': False,
+            },
+        ]
+
+        for test in tests:
+            httpretty.register_uri(httpretty.GET, "https://bitcoin.org", status=200, body=test['body'])
+            if test['valid']:
+                self.assertEqual({'value': 'ricmontagnin'}, session.get_json_object("https://bitcoin.org", max_size=100))
+            else:
+                with self.assertRaises(ValueError, msg=test['name']):
+                    session.get_json_object("https://bitcoin.org", max_size=100)
+
+    @httpretty.activate(verbose=True, allow_net_connect=False)
+    def test_get_json_object_negative_cache(self):
+        httpretty.register_uri(httpretty.GET, "https://linktr.ee/ricmontagnin", status=200, body='<html></html>',
+                               content_type='text/html')
+        httpretty.register_uri(httpretty.GET, "https://bitcoin.org", status=503, body='<html></html>')
+
+        session.configure(max_retries=0)
+        for url in ["https://linktr.ee/ricmontagnin", "https://bitcoin.org"]:
+            with self.assertRaises(ValueError):
+                session.get_json_object(url)
+
+        # Pages that might be temporarily unavailable are not remembered
+        self.assertTrue(negcache.urls.contains("https://linktr.ee/ricmontagnin"))
+        self.assertFalse(negcache.urls.contains("https://bitcoin.org"))
+
+    @httpretty.activate(verbose=True, allow_net_connect=False)
+    def test_get_json_object_store(self):
+        httpretty.register_uri(httpretty.GET, "https://pastebin.com/raw/xz4S8WrW", status=200,
+                               body='{"value":"ricmontagnin"}')
+
+        with tempfile.TemporaryDirectory() as directory:
+            store.configure(os.path.join(directory, 'responses.db'))
+            try:
+                for _ in range(2):
+                    self.assertEqual({'value': 'ricmontagnin'},
+                                     session.get_json_object("https://pastebin.com/raw/xz4S8WrW#proof"))
+            finally:
+                store.configure()
+
+        self.assertEqual(1, len(httpretty.latest_requests()))
+
+    @httpretty.activate(verbose=True, allow_net_connect=False)
+    def test_circuit_open(self):
+        httpretty.register_uri(httpretty.GET, "https://pastebin.com/raw/xz4S8WrW", status=500, body='')
+
+        session.configure(max_retries=0)
+        for _ in range(circuit.FAILURE_THRESHOLD):
+            self.assertEqual(500, session.request("GET", "https://pastebin.com/raw/xz4S8WrW").status_code)
+
+        requests_count = len(httpretty.latest_requests())
+        with self.assertRaises(circuit.CircuitOpenError):
+            session.request("GET", "https://pastebin.com/raw/xz4S8WrW")
+
+        # Proofs served by unhealthy hosts are skipped
+        with self.assertRaisesRegex(ValueError, 'Circuit open'):
+            session.get_json_object("https://pastebin.com/raw/xz4S8WrW")
+
+        self.assertEqual(requests_count, len(httpretty.latest_requests()))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,140 @@
+import json
+import os
+import threading
+import urllib.parse
+
+import requests
+
+import circuit
+import deadline
+import session
+from cache import LRUCache
+
+# Hosts whose links are short links, resolved to their targets before fetching any proof
+SHORT_HOSTS = [host.strip().lower() for host in os.environ.get("THEMIS_SHORT_LINK_HOSTS", "t.co").split(",")
+               if host.strip()]
+
+# Maximum number of redirects between short link hosts followed while resolving a short link
+MAX_HOPS = int(os.environ.get("THEMIS_SHORT_LINK_MAX_HOPS", "5"))
+
+# Maximum number of short link targets kept in memory
+CACHE_SIZE = int(os.environ.get("THEMIS_SHORT_LINKS_CACHE_SIZE", "65536"))
+
+# Path of the file where the short link targets are persisted across invocations, if any
+CACHE_PATH = os.environ.get("THEMIS_SHORT_LINKS_CACHE")
+
+REDIRECT_STATUSES = [301, 302, 303, 307, 308]
+
+targets = LRUCache(CACHE_SIZE)
+_loaded = False
+_lock = threading.Lock()
+
+
+def is_short_link(url: str) -> bool:
+    """
+    Tells whether the given URL is a short link that should be resolved before being fetched.
+    """
+    return (urllib.parse.urlsplit(url).hostname or "") in SHORT_HOSTS
+
+
+def follow_redirects(url: str, max_hops: int = MAX_HOPS) -> str:
+    """
+    Follows the redirects of the given short link using HEAD requests, so that no response body is downloaded.
+    Only the redirects served by short link hosts are followed: the ones served by any other host might be temporary
+    (eg. a CDN challenge page), so they are left to the proof fetch.
+    :param url: URL to be resolved.
+    :param max_hops: Maximum number of redirects to be followed.
+    :return: The first URL reached that is not a short link, or the last one reached if there are more than max_hops
+    redirects.
+    """
+    for _ in range(max_hops):
+        if not is_short_link(url):
+            return url
+
+        response = session.request("HEAD", url, timeout=deadline.PROOF_TIMEOUT, allow_redirects=False)
+        location = response.headers.get("Location")
+        if response.status_code not in REDIRECT_STATUSES or not location:
+            return url
+
+        url = urllib.parse.urljoin(url, location)
+
+    return url
+
+
+def resolve(url: str) -> str:
+    """
+    Returns the target of the given short link. Since short links never change their target, each one is resolved
+    only once and then cached, persisting it to the file set using THEMIS_SHORT_LINKS_CACHE if any. Only the hops
+    served by short link hosts are cached, since the following ones might change over time.
+    URLs that are not short links, or that cannot be resolved, are returned as they are.
+    """
+    if not is_short_link(url):
+        return url
+
+    _load()
+    target = targets.get(url)
+    if target is not None:
+        return target
+
+    try:
+        target = follow_redirects(url)
+    except (requests.exceptions.RequestException, circuit.CircuitOpenError):
+        # Let the proof fetch follow the redirects instead
+        return url
+
+    if target != url:
+        targets.put(url, target)
+        _append(url, target)
+    return target
+
+
+def _load():
+    """
+    Loads the short link targets persisted by the previous invocations, the first time it is called.
+    """
+    global _loaded
+    with _lock:
+        if _loaded:
+            return
+        _loaded = True
+
+        if not CACHE_PATH or not os.path.exists(CACHE_PATH):
+            return
+
+        lines = 0
+        with open(CACHE_PATH) as file:
+            for line in file:
+                lines += 1
+                try:
+                    url, target = json.loads(line)
+                except ValueError:
+                    # The last line might have been partially written by an interrupted invocation
+                    continue
+                targets.put(url, target)
+
+        # Drop the evicted and duplicated entries once the file grows too much
+        if lines > CACHE_SIZE * 2:
+            temp_path = f"{CACHE_PATH}.{os.getpid()}.tmp"
+            with open(temp_path, "w") as file:
+                for url, target in targets.items():
+                    file.write(json.dumps([url, target]) + "\n")
+            os.replace(temp_path, CACHE_PATH)
+
+
+def _append(url: str, target: str):
+    if not CACHE_PATH:
+        return
+
+    # Lines are appended with a single write, so that concurrent invocations do not interleave them
+    with _lock, open(CACHE_PATH, "a") as file:
+        file.write(json.dumps([url, target]) + "\n")
+
+
+def clear():
+    """
+    Removes all the short link targets kept in memory, so that they are loaded again from the persisted file.
+    """
+    global _loaded
+    with _lock:
+        targets.clear()
+        _loaded = False
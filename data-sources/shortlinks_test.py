@@ -0,0 +1,83 @@
+import asyncio
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+import httpretty
+
+import aio
+import circuit
+import session
+import shortlinks
+
+
+class ShortLinksTest(unittest.TestCase):
+
+    def setUp(self):
+        session.configure(max_retries=0)
+
+    def tearDown(self):
+        session.configure()
+        circuit.reset()
+        shortlinks.clear()
+
+    def test_is_short_link(self):
+        self.assertTrue(shortlinks.is_short_link('https://t.co/uD23HgSLJW'))
+        self.assertFalse(shortlinks.is_short_link('https://pastebin.com/raw/xz4S8WrW'))
+
+    @httpretty.activate(verbose=True, allow_net_connect=False)
+    def test_follow_redirects(self):
+        httpretty.register_uri(httpretty.HEAD, "https://t.co/uD23HgSLJW", status=301,
+                               adding_headers={'Location': 'https://t.co/aZ1Ab0cD'})
+        httpretty.register_uri(httpretty.HEAD, "https://t.co/aZ1Ab0cD", status=301,
+                               adding_headers={'Location': 'http://pastebin.com/xz4S8WrW'})
+        httpretty.register_uri(httpretty.HEAD, "http://pastebin.com/xz4S8WrW", status=302,
+                               adding_headers={'Location': '/raw/xz4S8WrW'})
+
+        # Redirects served by other hosts might be temporary, so they are left to the proof fetch
+        self.assertEqual('http://pastebin.com/xz4S8WrW', shortlinks.follow_redirects('https://t.co/uD23HgSLJW'))
+        self.assertEqual(['HEAD', 'HEAD'], [request.method for request in httpretty.latest_requests()])
+
+        # The number of redirects followed is capped
+        self.assertEqual('https://t.co/aZ1Ab0cD', shortlinks.follow_redirects('https://t.co/uD23HgSLJW', max_hops=1))
+
+    @httpretty.activate(verbose=True, allow_net_connect=False)
+    def test_resolve(self):
+        httpretty.register_uri(httpretty.HEAD, "https://t.co/uD23HgSLJW", status=301,
+                               adding_headers={'Location': 'https://pastebin.com/raw/xz4S8WrW'})
+        httpretty.register_uri(httpretty.HEAD, "https://pastebin.com/raw/xz4S8WrW", status=200)
+
+        path = os.path.join(tempfile.mkdtemp(), 'shortlinks.jsonl')
+        with mock.patch('shortlinks.CACHE_PATH', path):
+            self.assertEqual('https://pastebin.com/raw/xz4S8WrW', shortlinks.resolve('https://t.co/uD23HgSLJW'))
+            requests_count = len(httpretty.latest_requests())
+
+            # Targets are cached, and persisted across invocations
+            shortlinks.clear()
+            self.assertEqual('https://pastebin.com/raw/xz4S8WrW', shortlinks.resolve('https://t.co/uD23HgSLJW'))
+            self.assertEqual(requests_count, len(httpretty.latest_requests()))
+
+        # Other URLs are not resolved
+        self.assertEqual('https://bitcoin.org', shortlinks.resolve('https://bitcoin.org'))
+
+    @httpretty.activate(verbose=True, allow_net_connect=False)
+    def test_resolve_failure(self):
+        httpretty.register_uri(httpretty.HEAD, "https://t.co/uD23HgSLJW", status=503)
+
+        self.assertEqual('https://t.co/uD23HgSLJW', shortlinks.resolve('https://t.co/uD23HgSLJW'))
+        self.assertEqual(0, len(shortlinks.targets))
+
+    @httpretty.activate(verbose=True, allow_net_connect=False)
+    def test_find_first_proof(self):
+        httpretty.register_uri(httpretty.HEAD, "https://t.co/uD23HgSLJW", status=301,
+                               adding_headers={'Location': 'https://pastebin.com/xz4S8WrW'})
+        httpretty.register_uri(httpretty.HEAD, "https://pastebin.com/xz4S8WrW", status=200)
+
+        # The proof is fetched straight from the raw content of the short link target
+        result = asyncio.run(aio.find_first_proof(['https://t.co/uD23HgSLJW'], lambda url: url))
+        self.assertEqual('https://pastebin.com/raw/xz4S8WrW', result)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,92 @@
+import asyncio
+import os
+import threading
+from concurrent.futures import Future
+from typing import Awaitable, Callable, Hashable, Tuple, TypeVar
+
+import metrics
+
+# Whether concurrent identical invocations should share the same execution
+ENABLED = os.environ.get("THEMIS_COALESCING", "1") != "0"
+
+T = TypeVar("T")
+
+
+class Group:
+    """
+    Thread-safe group of calls, where concurrent calls having the same key share a single execution: the first one
+    runs the given function, while the following ones wait for it and get the same result, or the same exception.
+    Once the execution completes, the next call having that key runs the function again.
+    """
+
+    def __init__(self):
+        self.coalesced = 0
+        self._calls = {}
+        self._lock = threading.Lock()
+
+    def _join(self, key: Hashable) -> Tuple[Future, bool]:
+        """
+        Returns the future of the execution in flight for the given key, creating it if there is none.
+        :return: A (future, leader) tuple, where leader tells whether the caller should run the execution.
+        """
+        with self._lock:
+            future = self._calls.get(key)
+            if future is not None:
+                self.coalesced += 1
+                metrics.increment("singleflight.coalesced")
+                return future, False
+
+            future = Future()
+            self._calls[key] = future
+            return future, True
+
+    def _complete(self, key: Hashable):
+        with self._lock:
+            del self._calls[key]
+
+    def do(self, key: Hashable, func: Callable[[], T]) -> T:
+        """
+        Runs the given function, unless a call having the same key is already in flight, in which case its result is
+        returned instead.
+        :raise Exception raised by the function, either by this call or by the one in flight.
+        """
+        future, leader = self._join(key)
+        if not leader:
+            return future.result()
+
+        try:
+            future.set_result(func())
+        except BaseException as err:
+            future.set_exception(err)
+        finally:
+            self._complete(key)
+
+        return future.result()
+
+    async def do_async(self, key: Hashable, func: Callable[[], Awaitable[T]]) -> T:
+        """
+        Asynchronous version of do, awaiting the coroutine returned by the given function. Calls in flight are shared
+        with the synchronous ones, and with the ones of other event loops.
+        """
+        future, leader = self._join(key)
+        if not leader:
+            return await asyncio.wrap_future(future)
+
+        try:
+            future.set_result(await func())
+        except BaseException as err:
+            future.set_exception(err)
+        finally:
+            self._complete(key)
+
+        return future.result()
+
+    def stats(self) -> dict:
+        """
+        Returns the number of calls that shared the execution of another one, and the number of calls in flight.
+        """
+        with self._lock:
+            return {"coalesced": self.coalesced, "in_flight": len(self._calls)}
+
+
+calls = Group()
@@ -0,0 +1,93 @@
+import asyncio
+import threading
+import time
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+
+import metrics
+import singleflight
+
+
+class GroupTest(unittest.TestCase):
+
+    def setUp(self):
+        metrics.reset()
+
+    def test_do(self):
+        group = singleflight.Group()
+        started = threading.Event()
+        release = threading.Event()
+        calls = []
+
+        def fetch():
+            calls.append(1)
+            started.set()
+            release.wait(5)
+            return 'value,signature,RiccardoM'
+
+        with ThreadPoolExecutor(max_workers=5) as executor:
+            leader = executor.submit(group.do, 'key', fetch)
+            started.wait(5)
+            followers = [executor.submit(group.do, 'key', fetch) for _ in range(4)]
+            while group.stats()['coalesced'] < 4:
+                time.sleep(0.001)
+            release.set()
+
+            results = [future.result() for future in [leader] + followers]
+
+        self.assertEqual(['value,signature,RiccardoM'] * 5, results)
+        self.assertEqual(1, len(calls))
+        self.assertEqual({'coalesced': 4, 'in_flight': 0}, group.stats())
+        self.assertEqual(4, metrics.snapshot()['counters']['singleflight.coalesced'])
+
+        # Once completed, the next call runs again
+        self.assertEqual('value,signature,RiccardoM', group.do('key', fetch))
+        self.assertEqual(2, len(calls))
+
+    def test_do_exception(self):
+        group = singleflight.Group()
+        started = threading.Event()
+        release = threading.Event()
+
+        def fetch():
+            started.set()
+            release.wait(5)
+            raise Exception('Invalid signature')
+
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            leader = executor.submit(group.do, 'key', fetch)
+            started.wait(5)
+            follower = executor.submit(group.do, 'key', fetch)
+            while group.stats()['coalesced'] < 1:
+                time.sleep(0.001)
+            release.set()
+
+            for future in [leader, follower]:
+                with self.assertRaisesRegex(Exception, 'Invalid signature'):
+                    future.result()
+
+        self.assertEqual(0, group.stats()['in_flight'])
+
+    def test_do_async(self):
+        group = singleflight.Group()
+        calls = []
+
+        async def fetch():
+            calls.append(1)
+            await asyncio.sleep(0.05)
+            return 'value,signature,RiccardoM'
+
+        async def run():
+            return await asyncio.gather(
+                group.do_async('key', fetch),
+                group.do_async('key', fetch),
+                group.do_async('other', fetch),
+            )
+
+        self.assertEqual(['value,signature,RiccardoM'] * 3, asyncio.run(run()))
+        self.assertEqual(2, len(calls))
+        self.assertEqual({'coalesced': 1, 'in_flight': 0}, group.stats())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,183 @@
+import os
+import sqlite3
+import threading
+import time
+from typing import Optional
+
+import metrics
+
+# Path of the SQLite database where the upstream responses are shared by all the processes of the same host, if any
+PATH = os.environ.get("THEMIS_RESPONSE_STORE")
+
+# Number of seconds the Themis API responses are reused for
+API_TTL = float(os.environ.get("THEMIS_RESPONSE_STORE_API_TTL", "60"))
+
+# Number of seconds the proof bodies are reused for
+PROOF_TTL = float(os.environ.get("THEMIS_RESPONSE_STORE_PROOF_TTL", "300"))
+
+# Maximum total size, in bytes, of the stored response bodies. Once exceeded, the entries expiring first are evicted
+MAX_SIZE = int(os.environ.get("THEMIS_RESPONSE_STORE_SIZE", str(64 * 1024 * 1024)))
+
+# Number of writes performed by each process between two evictions
+EVICTION_INTERVAL = 100
+
+# Maximum number of seconds a write waits for the ones of the other processes to complete
+BUSY_TIMEOUT = 1
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS responses (
+    key TEXT PRIMARY KEY,
+    body BLOB NOT NULL,
+    size INTEGER NOT NULL,
+    expires_at REAL NOT NULL
+)
+"""
+
+_store = None
+_lock = threading.Lock()
+
+
+class ResponseStore:
+    """
+    Response bodies cache backed by a SQLite database in WAL mode, so that it can be shared by concurrent readers and
+    writers running inside separate processes. Each entry expires after its own TTL, and the total size of the bodies
+    is capped by evicting the entries that expire first.
+    Being only an optimization, any database error is treated as a miss, or as a write that did not happen.
+    """
+
+    def __init__(self, path: str, max_size: int = MAX_SIZE):
+        self.path = path
+        self.max_size = max_size
+        self._local = threading.local()
+        self._writes = 0
+        self._lock = threading.Lock()
+
+    def _connect(self) -> sqlite3.Connection:
+        """
+        Returns the connection of the calling thread, opening it if needed. Connections are never shared across
+        threads, nor across processes created by forking this one.
+        """
+        connection = getattr(self._local, "connection", None)
+        if connection is not None and self._local.pid == os.getpid():
+            return connection
+
+        connection = sqlite3.connect(self.path, timeout=BUSY_TIMEOUT, isolation_level=None)
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.execute("PRAGMA synchronous=NORMAL")
+        connection.execute(SCHEMA)
+        connection.execute("CREATE INDEX IF NOT EXISTS responses_expires_at ON responses (expires_at)")
+
+        self._local.connection = connection
+        self._local.pid = os.getpid()
+        return connection
+
+    def get(self, key: str) -> Optional[bytes]:
+        """
+        Returns the body stored with the given key, or None if it is not stored or has expired.
+        """
+        try:
+            row = self._connect().execute(
+                "SELECT body FROM responses WHERE key = ? AND expires_at > ?", (key, time.time()),
+            ).fetchone()
+        except sqlite3.Error:
+            row = None
+
+        metrics.increment("store.hits" if row is not None else "store.misses")
+        return row[0] if row is not None else None
+
+    def put(self, key: str, body: bytes, ttl: float):
+        """
+        Stores the given body with the given key for the given number of seconds, replacing any previous one.
+        """
+        if len(body) > self.max_size:
+            return
+
+        try:
+            self._connect().execute(
+                "INSERT OR REPLACE INTO responses (key, body, size, expires_at) VALUES (?, ?, ?, ?)",
+                (key, sqlite3.Binary(body), len(body), time.time() + ttl),
+            )
+        except sqlite3.Error:
+            return
+
+        with self._lock:
+            evict = self._writes % EVICTION_INTERVAL == 0
+            self._writes += 1
+
+        if evict:
+            self.evict()
+
+    def evict(self):
+        """
+        Removes the expired entries, and then the ones expiring first until the total size is below the cap.
+        """
+        try:
+            connection = self._connect()
+            connection.execute("DELETE FROM responses WHERE expires_at <= ?", (time.time(),))
+            connection.execute(
+                """
+                DELETE FROM responses WHERE key IN (
+                    SELECT key FROM (
+                        SELECT key, SUM(size) OVER (ORDER BY expires_at DESC, key) AS total FROM responses
+                    ) WHERE total > ?
+                )
+                """,
+                (self.max_size,),
+            )
+        except sqlite3.Error:
+            # Another process is writing, it will be evicted later on
+            pass
+
+    def clear(self):
+        """
+        Removes all the stored entries.
+        """
+        self._connect().execute("DELETE FROM responses")
+
+    def stats(self) -> dict:
+        """
+        Returns the number of entries and the total size of the stored bodies.
+        """
+        entries, size = self._connect().execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM responses").fetchone()
+        return {"entries": entries, "size": size, "max_size": self.max_size}
+
+
+def get_store() -> Optional[ResponseStore]:
+    """
+    Returns the store shared by all the data sources, or None if THEMIS_RESPONSE_STORE is not set.
+    """
+    global _store
+    with _lock:
+        if _store is None and PATH:
+            _store = ResponseStore(PATH)
+        return _store
+
+
+def get(key: str) -> Optional[bytes]:
+    """
+    Returns the body stored with the given key inside the shared store, or None if it is not stored or if the store
+    is disabled.
+    """
+    response_store = get_store()
+    return response_store.get(key) if response_store is not None else None
+
+
+def put(key: str, body: bytes, ttl: float):
+    """
+    Stores the given body inside the shared store, if enabled.
+    """
+    response_store = get_store()
+    if response_store is not None:
+        response_store.put(key, body, ttl)
+
+
+def configure(path: Optional[str] = None, max_size: int = MAX_SIZE):
+    """
+    Replaces the shared store.
+    :param path: Path of the SQLite database to be used. If None, the store is disabled.
+    :param max_size: Maximum total size, in bytes, of the stored response bodies.
+    """
+    global PATH, _store
+    with _lock:
+        PATH = path
+        _store = ResponseStore(path, max_size) if path else None
@@ -0,0 +1,81 @@
+import os
+import subprocess
+import sys
+import tempfile
+import time
+import unittest
+from unittest import mock
+
+import metrics
+import store
+
+
+class ResponseStoreTest(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, 'responses.db')
+        metrics.reset()
+
+    def tearDown(self):
+        store.configure()
+        self.directory.cleanup()
+
+    def test_get_put(self):
+        responses = store.ResponseStore(self.path)
+        self.assertIsNone(responses.get('https://pastebin.com/raw/xz4S8WrW'))
+
+        responses.put('https://pastebin.com/raw/xz4S8WrW', b'{"value":"ricmontagnin"}', 60)
+        self.assertEqual(b'{"value":"ricmontagnin"}', responses.get('https://pastebin.com/raw/xz4S8WrW'))
+        self.assertEqual({'entries': 1, 'size': 24, 'max_size': store.MAX_SIZE}, responses.stats())
+
+        counters = metrics.snapshot()['counters']
+        self.assertEqual(1, counters['store.hits'])
+        self.assertEqual(1, counters['store.misses'])
+
+        # Entries expire after their own TTL
+        with mock.patch('time.time', return_value=time.time() + 61):
+            self.assertIsNone(responses.get('https://pastebin.com/raw/xz4S8WrW'))
+
+    def test_evict(self):
+        responses = store.ResponseStore(self.path, max_size=20)
+        responses.put('expired', b'0123456789', -1)
+        responses.put('first', b'0123456789', 10)
+        responses.put('second', b'0123456789', 20)
+        responses.put('third', b'0123456789', 30)
+        responses.put('too big', b'0' * 21, 30)
+
+        responses.evict()
+        self.assertIsNone(responses.get('first'))
+        self.assertEqual(b'0123456789', responses.get('second'))
+        self.assertEqual(b'0123456789', responses.get('third'))
+        self.assertEqual({'entries': 2, 'size': 20, 'max_size': 20}, responses.stats())
+
+    def test_shared_across_processes(self):
+        script = (
+            'import store, sys;'
+            'responses = store.ResponseStore(sys.argv[1]);'
+            '[responses.put(f"{sys.argv[2]}/{i}", b"{}", 60) for i in range(50)]'
+        )
+        cwd = os.path.dirname(os.path.abspath(store.__file__))
+        writers = [subprocess.Popen([sys.executable, '-c', script, self.path, str(i)], cwd=cwd) for i in range(4)]
+        for writer in writers:
+            self.assertEqual(0, writer.wait(30))
+
+        responses = store.ResponseStore(self.path)
+        self.assertEqual(200, responses.stats()['entries'])
+        self.assertEqual(b'{}', responses.get('3/49'))
+
+    def test_disabled(self):
+        store.configure()
+        store.put('https://pastebin.com/raw/xz4S8WrW', b'{}', 60)
+        self.assertIsNone(store.get('https://pastebin.com/raw/xz4S8WrW'))
+        self.assertFalse(os.path.exists(self.path))
+
+        store.configure(self.path)
+        store.put('https://pastebin.com/raw/xz4S8WrW', b'{}', 60)
+        self.assertEqual(b'{}', store.get('https://pastebin.com/raw/xz4S8WrW'))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+import contextlib
+import sys
+import time
+
+import discord
+import domain
+import github
+import instagram
+import metrics
+import negcache
+import resultcache
+import singleflight
+import store
+import telegram
+import twitch
+import twitter
+import verification
+import youtube
+
+# Data sources associated with each application name, as used by the oracle script
+APPLICATIONS = {
+    "twitter": twitter,
+    "github": github,
+    "discord": discord,
+    "twitch": twitch,
+    "domain": domain,
+    "youtube": youtube,
+    "telegram": telegram,
+    "instagram": instagram,
+}
+
+
+def run(application: str, args: str) -> str:
+    """
+    Runs the data source associated with the given application, keeping track of its metrics.
+    :param application: Name of the application (twitter, github, discord, twitch, domain, youtube, telegram, instagram).
+    :param args: Hex encoded call data to be passed to the data source.
+    :return: The value returned by the data source main function.
+    :raise Exception if the application does not exist, or anything is wrong during the data source execution.
+    """
+    if application not in APPLICATIONS:
+        raise Exception(f"Invalid application: {application}")
+
+    with _track(application):
+        if not singleflight.ENABLED:
+            return APPLICATIONS[application].main(args)
+
+        # Concurrent invocations having the same call data share the same fetches and verification
+        key = resultcache.call_key(application, args)
+        return singleflight.calls.do(key, lambda: APPLICATIONS[application].main(args))
+
+
+async def run_async(application: str, args: str) -> str:
+    """
+    Asynchronous version of run, awaiting the main_async coroutine of the data source associated with the given
+    application so that many verifications can be kept in flight by the same event loop.
+    """
+    if application not in APPLICATIONS:
+        raise Exception(f"Invalid application: {application}")
+
+    with _track(application):
+        if not singleflight.ENABLED:
+            return await APPLICATIONS[application].main_async(args)
+
+        key = resultcache.call_key(application, args)
+        return await singleflight.calls.do_async(key, lambda: APPLICATIONS[application].main_async(args))
+
+
+@contextlib.contextmanager
+def _track(application: str):
+    """
+    Keeps track of the number of successes, errors and seconds spent running the data source of the given application.
+    """
+    start = time.monotonic()
+    try:
+        yield
+        metrics.increment(f"{application}.successes")
+    except Exception:
+        metrics.increment(f"{application}.errors")
+        raise
+    finally:
+        metrics.increment(f"{application}.seconds", time.monotonic() - start)
+
+
+def stats() -> dict:
+    """
+    Returns the metrics collected while running the data sources, together with the verification caches, negative
+    cache, coalesced invocations and response store (if enabled) statistics.
+    """
+    response_store = store.get_store()
+    return {
+        **metrics.snapshot(),
+        "verification": verification.cache_stats(),
+        "negative_cache": negcache.urls.stats(),
+        "coalescing": singleflight.calls.stats(),
+        "response_store": response_store.stats() if response_store is not None else None,
+    }
+
+
+def main(application: str, args: str):
+    """
+    Single entry point to all the data sources, dispatching the given call data to the one of the given application.
+
+    :param application: Name of the application whose data source should be used. This is the same name used by the
+    oracle script (twitter, github, discord, twitch, domain, youtube, telegram, instagram).
+    :param args: Hex encoded JSON object containing the arguments to be used during the execution.
+    See the main function of each data source to know which arguments it requires.
+
+    Example:
+    python themis.py twitter 7B226D6574686F64223A227477656574222C2276616C7565223A2231333932303333353835363735333137323532227D
+
+    :return The signed value, the signature and the username as a single comma separated string.
+    :raise Exception if the application does not exist, or anything is wrong during the data source execution.
+    """
+    return run(application, args)
+
+
+if __name__ == "__main__":
+    try:
+        print(main(*sys.argv[1:]))
+    except Exception as e:
+        print(str(e), file=sys.stderr)
+        sys.exit(1)
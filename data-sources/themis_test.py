@@ -0,0 +1,63 @@
+import asyncio
+import types
+import unittest
+from unittest import mock
+
+import metrics
+import themis
+
+
+def fake_main(args: str):
+    if args == "00":
+        raise Exception("Invalid signature")
+    return f"value,signature,{args}"
+
+
+async def fake_main_async(args: str):
+    return fake_main(args)
+
+
+class ThemisTest(unittest.TestCase):
+
+    def setUp(self):
+        metrics.reset()
+
+    def test_applications(self):
+        self.assertEqual(
+            ['discord', 'domain', 'github', 'instagram', 'telegram', 'twitch', 'twitter', 'youtube'],
+            sorted(themis.APPLICATIONS.keys()),
+        )
+
+    def test_run(self):
+        with mock.patch.dict(themis.APPLICATIONS, {'github': types.SimpleNamespace(main=fake_main)}):
+            self.assertEqual('value,signature,RiccardoM', themis.run('github', 'RiccardoM'))
+
+            with self.assertRaisesRegex(Exception, 'Invalid signature'):
+                themis.run('github', '00')
+
+        with self.assertRaisesRegex(Exception, 'Invalid application: facebook'):
+            themis.run('facebook', 'RiccardoM')
+
+        counters = themis.stats()['counters']
+        self.assertEqual(1, counters['github.successes'])
+        self.assertEqual(1, counters['github.errors'])
+        self.assertIn('github.seconds', counters)
+
+    def test_run_async(self):
+        with mock.patch.dict(themis.APPLICATIONS, {'github': types.SimpleNamespace(main_async=fake_main_async)}):
+            self.assertEqual('value,signature,RiccardoM', asyncio.run(themis.run_async('github', 'RiccardoM')))
+
+            with self.assertRaisesRegex(Exception, 'Invalid signature'):
+                asyncio.run(themis.run_async('github', '00'))
+
+        counters = themis.stats()['counters']
+        self.assertEqual(1, counters['github.successes'])
+        self.assertEqual(1, counters['github.errors'])
+
+    def test_main_async(self):
+        for application in themis.APPLICATIONS.values():
+            self.assertTrue(asyncio.iscoroutinefunction(application.main_async), application.__name__)
+
+
+if __name__ == '__main__':
+    unittest.main()
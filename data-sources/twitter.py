@@ -1,19 +1,26 @@
 #!/usr/bin/env python3
+import asyncio
 import json
 import sys
-import requests
 import re
 from typing import Optional
-import cryptography.hazmat.primitives.asymmetric.utils as crypto
-from cryptography.hazmat.primitives.asymmetric import ec
-from cryptography.hazmat.primitives import hashes
-import hashlib
+
+import aio
+import deadline
+import mirrors
+import negcache
+import resultcache
+import session
+import verifier
+from verification import VerificationData, validate_json
+from verification import verify_address, verify_signature  # noqa: F401 (re-exported, used by the tests)
 
 METHOD_TWEET = "tweet"
 METHOD_PROFILE = "bio"
 TYPES = [METHOD_TWEET, METHOD_PROFILE]
 
 ENDPOINT = "https://themis.mainnet.desmos.network/twitter"
+ENDPOINTS = mirrors.endpoints("twitter", ENDPOINT)
 HEADERS = {"Content-Type": "application/json"}
 
 
@@ -27,16 +34,17 @@ class CallData:
         self.value = value
 
 
-class VerificationData:
+def get_urls(entities: Optional[list], text: str) -> [str]:
     """
-    Contains the data needed to verify the proof submitted by the user.
+    Returns all the URLs found inside the given text.
+    :param entities: URL entities returned by the APIs for the text, if any. Older API versions do not return them.
+    :param text: Text in which the URLs should be searched when no entity is available.
+    :return: The expanded URLs of the given entities if any, or the URLs found scanning the text otherwise.
     """
+    if entities:
+        return [entity['expanded_url'] for entity in entities]
 
-    def __init__(self, address: str, pub_key: str, value: str, signature: str):
-        self.address = address
-        self.pub_key = pub_key
-        self.signature = signature
-        self.value = value
+    return re.findall(r'(https?://[^\s]+)', text)
 
 
 def get_data_from_tweet(tweet: str):
@@ -45,8 +53,8 @@ def get_data_from_tweet(tweet: str):
     :param tweet: Id of the Tweet to be fetched
     :return: Username of the Tweet's creator and all the found URLs
     """
-    result = requests.request("GET", f"{ENDPOINT}/tweets/{tweet}", headers=HEADERS).json()
-    return result['author']['username'], re.findall(r'(https?://[^\s]+)', result['text'])
+    result = mirrors.request(ENDPOINTS, f"/tweets/{tweet}", headers=HEADERS).json()
+    return result['author']['username'], get_urls(result.get('urls'), result['text'])
 
 
 def get_data_from_bio(user: str):
@@ -55,8 +63,8 @@ def get_data_from_bio(user: str):
     :param user: Username of the user for whom to check the bio.
     :return: List of URLs found inside the bio of the user.
     """
-    result = requests.request("GET", f"{ENDPOINT}/users/{user}", headers=HEADERS).json()
-    return result['username'], re.findall(r'(https?://[^\s]+)', result['bio'])
+    result = mirrors.request(ENDPOINTS, f"/users/{user}", headers=HEADERS).json()
+    return result['username'], get_urls(result.get('bio_urls'), result['bio'])
 
 
 def get_signature_from_url(url: str) -> Optional[VerificationData]:
@@ -67,7 +75,7 @@ def get_signature_from_url(url: str) -> Optional[VerificationData]:
     the signature object.
     """
     try:
-        result = requests.request("GET", url, headers=HEADERS).json()
+        result = session.get_json_object(url, headers=HEADERS)
         if validate_json(result):
             return VerificationData(
                 result['address'],
@@ -76,67 +84,69 @@ def get_signature_from_url(url: str) -> Optional[VerificationData]:
                 result['signature'],
             )
         else:
+            negcache.urls.add(url, "application/json")
             return None
     except ValueError:
         return None
 
 
-def validate_json(json: dict) -> bool:
+def check_values(values: dict) -> CallData:
     """
-    Tells whether or not the given JSON is a valid signature JSON object.
-    :param json: JSON object to be checked.
-    :return: True if the provided JSON has a valid signature schema, or False otherwise.
+    Checks the validity of the given dictionary making sure it contains the proper data.
+    :param values: Dictionary that should be checked.
+    :return: A CallData instance.
     """
-    return all(key in json for key in ['value', 'pub_key', 'signature', 'address'])
+    if "method" not in values:
+        raise Exception("Missing 'method' value")
+
+    if "value" not in values:
+        raise Exception("Missing 'value' value")
+
+    return CallData(values["method"], values["value"])
 
 
-def verify_signature(data: VerificationData) -> bool:
+@resultcache.cached("twitter")
+@deadline.with_deadline
+async def main_async(args: str):
     """
-    Verifies the signature using the given pubkey and value.
-    :param data: Data used to verify the signature.
-    :return True if the signature is valid, False otherwise
+    Asynchronous version of main, allowing a single event loop to keep many verifications in flight.
+    Blocking requests run inside the executor shared by all the coroutines, see the aio module.
     """
-    if len(data.signature) != 128:
-        return False
 
-    try:
-        # Create signature for dss signature
-        (r, s) = int(data.signature[:64], 16), int(data.signature[64:], 16)
-        sig = crypto.encode_dss_signature(r, s)
+    decoded = bytes.fromhex(args)
+    json_obj = json.loads(decoded)
+    call_data = check_values(json_obj)
 
-        # Create public key instance
-        public_key = ec.EllipticCurvePublicKey.from_encoded_point(ec.SECP256K1(), bytes.fromhex(data.pub_key))
+    verification_method = call_data.method
+    if verification_method not in TYPES:
+        raise Exception(f"Invalid verification method: {verification_method}")
 
-        # Verify the signature
-        public_key.verify(sig, bytes.fromhex(data.value), ec.ECDSA(hashes.SHA256()))
-        return True
-    except Exception:
-        return False
+    # Get the URLs to check inside the tweet or the bio
+    username = ""
+    urls = []
+    if verification_method == METHOD_TWEET:
+        username, urls = await aio.run(get_data_from_tweet, call_data.value)
+    elif verification_method == METHOD_PROFILE:
+        username, urls = await aio.run(get_data_from_bio, call_data.value)
 
+    if len(urls) == 0:
+        raise Exception(f"No URL found inside {verification_method}")
 
-def verify_address(data: VerificationData) -> bool:
-    """
-    Verifies that the given address is the one associated with the provided HEX encoded compact public key.
-    :param data: Data used to verify the address
-    """
-    s = hashlib.new("sha256", bytes.fromhex(data.pub_key)).digest()
-    r = hashlib.new("ripemd160", s).digest()
-    return data.address.upper() == r.hex().upper()
+    # Find the signature following the URLs
+    data = await aio.find_first_proof(urls, get_signature_from_url)
 
+    if data is None:
+        raise Exception(f"No valid signature data found inside {verification_method}")
 
-def check_values(values: dict) -> CallData:
-    """
-    Checks the validity of the given dictionary making sure it contains the proper data.
-    :param values: Dictionary that should be checked.
-    :return: A CallData instance.
-    """
-    if "method" not in values:
-        raise Exception("Missing 'method' value")
+    # Verify the signature and the address, inside the process pool if running
+    signature_valid, address_valid = await verifier.verify_async(data)
+    if not signature_valid:
+        raise Exception("Invalid signature")
 
-    if "value" not in values:
-        raise Exception("Missing 'value' value")
+    if not address_valid:
+        raise Exception("Invalid address")
 
-    return CallData(values["method"], values["value"])
+    return f"{data.value},{data.signature},{username}"
 
 
 def main(args: str):
@@ -188,48 +198,7 @@ def main(args: str):
             2. The provided signature is not valid
             3. The provided address is not linked to the provided public key
     """
-
-    decoded = bytes.fromhex(args)
-    json_obj = json.loads(decoded)
-    call_data = check_values(json_obj)
-
-    verification_method = call_data.method
-    if verification_method not in TYPES:
-        raise Exception(f"Invalid verification method: {verification_method}")
-
-    # Get the URLs to check inside the tweet or the bio
-    username = ""
-    urls = []
-    if verification_method == METHOD_TWEET:
-        username, urls = get_data_from_tweet(call_data.value)
-    elif verification_method == METHOD_PROFILE:
-        username, urls = get_data_from_bio(call_data.value)
-
-    if len(urls) == 0:
-        raise Exception(f"No URL found inside {verification_method}")
-
-    # Find the signature following the URLs
-    data = None
-    for url in urls:
-        result = get_signature_from_url(url)
-        if result is not None:
-            data = result
-            break
-
-    if data is None:
-        raise Exception(f"No valid signature data found inside {verification_method}")
-
-    # Verify the signature
-    signature_valid = verify_signature(data)
-    if not signature_valid:
-        raise Exception("Invalid signature")
-
-    # Verify the address
-    address_valid = verify_address(data)
-    if not address_valid:
-        raise Exception("Invalid address")
-
-    return f"{data.value},{data.signature},{username}"
+    return asyncio.run(main_async(args))
 
 
 if __name__ == "__main__":
@@ -21,6 +21,19 @@ class TestTwitter(unittest.TestCase):
         self.assertEqual('ricmontagnin', username)
         self.assertEqual(['https://t.co/uD23HgSLJW'], urls)
 
+        # Expanded URLs are used when returned by the APIs
+        httpretty.register_uri(
+            httpretty.GET,
+            "https://themis.mainnet.desmos.network/twitter/tweets/1392033585675317252",
+            status=200,
+            body='{"author":{"username":"ricmontagnin"},"text":"https://t.co/uD23HgSLJW",'
+                 '"urls":[{"url":"https://t.co/uD23HgSLJW","expanded_url":"https://pastebin.com/raw/xz4S8WrW"}]}',
+        )
+
+        username, urls = twitter.get_data_from_tweet('1392033585675317252')
+        self.assertEqual('ricmontagnin', username)
+        self.assertEqual(['https://pastebin.com/raw/xz4S8WrW'], urls)
+
     @httpretty.activate(verbose=True, allow_net_connect=False)
     def test_get_data_from_bio(self):
         # Register fake HTTP call
@@ -35,6 +48,19 @@ class TestTwitter(unittest.TestCase):
         self.assertEqual('ricmontagnin', username)
         self.assertEqual(['https://t.co/uD23HgSLJW'], urls)
 
+        # Expanded URLs are used when returned by the APIs
+        httpretty.register_uri(
+            httpretty.GET,
+            "https://themis.mainnet.desmos.network/twitter/users/ricmontagnin",
+            status=200,
+            body='{"username":"ricmontagnin","bio":"Proof: https://t.co/uD23HgSLJW",'
+                 '"bio_urls":[{"url":"https://t.co/uD23HgSLJW","expanded_url":"https://pastebin.com/raw/xz4S8WrW"}]}',
+        )
+
+        username, urls = twitter.get_data_from_bio('ricmontagnin')
+        self.assertEqual('ricmontagnin', username)
+        self.assertEqual(['https://pastebin.com/raw/xz4S8WrW'], urls)
+
     @httpretty.activate(verbose=True, allow_net_connect=False)
     def test_get_signature_from_url(self):
         # Register fake HTTP call
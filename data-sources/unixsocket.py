@@ -0,0 +1,98 @@
+import socket
+import threading
+import urllib.parse
+
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection
+from urllib3.connectionpool import HTTPConnectionPool
+from urllib3.exceptions import ConnectTimeoutError, NewConnectionError
+
+# Scheme of the URLs served over a Unix domain socket, whose host is the percent-encoded path of the socket
+# (eg. "http+unix://%2Frun%2Fthemis%2Fapis.sock/twitter")
+SCHEME = "http+unix"
+
+
+def to_url(value: str) -> str:
+    """
+    Converts a "unix://<socket path>:<base path>" endpoint (eg. "unix:///run/themis/apis.sock:/twitter") to the
+    equivalent URL that can be requested using a session having an UnixAdapter mounted.
+    Any other endpoint is returned as it is.
+    """
+    if not value.startswith("unix://"):
+        return value
+
+    socket_path, _, path = value[len("unix://"):].partition(":")
+    return f"{SCHEME}://{urllib.parse.quote(socket_path, safe='')}{path}"
+
+
+class UnixConnection(HTTPConnection):
+    """
+    HTTP connection established over a Unix domain socket instead of TCP.
+    """
+
+    def __init__(self, socket_path: str, **kwargs):
+        super().__init__("localhost", **kwargs)
+        self.socket_path = socket_path
+
+    def _new_conn(self) -> socket.socket:
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        if isinstance(self.timeout, (int, float)):
+            sock.settimeout(self.timeout)
+
+        try:
+            sock.connect(self.socket_path)
+        except socket.timeout:
+            sock.close()
+            raise ConnectTimeoutError(self, f"Connection to {self.socket_path} timed out")
+        except OSError as err:
+            sock.close()
+            raise NewConnectionError(self, f"Failed to establish a new connection: {err}")
+
+        return sock
+
+
+class UnixConnectionPool(HTTPConnectionPool):
+    """
+    Pool of the connections established towards a single Unix domain socket.
+    """
+
+    def __init__(self, socket_path: str, **kwargs):
+        super().__init__("localhost", **kwargs)
+        self.socket_path = socket_path
+
+    def _new_conn(self) -> UnixConnection:
+        self.num_connections += 1
+        return UnixConnection(self.socket_path, timeout=self.timeout.connect_timeout)
+
+
+class UnixAdapter(HTTPAdapter):
+    """
+    Transport adapter that sends the requests towards "http+unix://" URLs over the Unix domain socket encoded inside
+    their host, keeping a pool of connections for each socket.
+    """
+
+    def __init__(self, pool_size: int = 10, **kwargs):
+        self._socket_pool_size = pool_size
+        self._socket_pools = {}
+        self._socket_pools_lock = threading.Lock()
+        super().__init__(pool_connections=pool_size, pool_maxsize=pool_size, **kwargs)
+
+    def get_connection(self, url, proxies=None) -> UnixConnectionPool:
+        socket_path = urllib.parse.unquote(urllib.parse.urlsplit(url).netloc)
+        with self._socket_pools_lock:
+            if socket_path not in self._socket_pools:
+                self._socket_pools[socket_path] = UnixConnectionPool(socket_path, maxsize=self._socket_pool_size)
+            return self._socket_pools[socket_path]
+
+    def get_connection_with_tls_context(self, request, verify, proxies=None, cert=None) -> UnixConnectionPool:
+        return self.get_connection(request.url, proxies)
+
+    def request_url(self, request, proxies) -> str:
+        return request.path_url
+
+    def close(self):
+        super().close()
+        with self._socket_pools_lock:
+            for pool in self._socket_pools.values():
+                pool.close()
+            self._socket_pools.clear()
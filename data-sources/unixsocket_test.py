@@ -0,0 +1,79 @@
+import json
+import os
+import socketserver
+import tempfile
+import threading
+import unittest
+from http.server import BaseHTTPRequestHandler
+from unittest import mock
+
+import requests
+
+import mirrors
+import session
+import unixsocket
+
+
+class Handler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        body = json.dumps({"path": self.path}).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+class Server(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+
+class UnixSocketTest(unittest.TestCase):
+
+    def setUp(self):
+        self.path = os.path.join(tempfile.mkdtemp(), "apis.sock")
+        self.server = Server(self.path, Handler)
+        self.thread = threading.Thread(target=self.server.serve_forever, args=(0.05,), daemon=True)
+        self.thread.start()
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+        self.thread.join()
+        os.remove(self.path)
+        session.configure()
+
+    def test_to_url(self):
+        self.assertEqual('http+unix://%2Frun%2Fthemis%2Fapis.sock/twitter',
+                         unixsocket.to_url('unix:///run/themis/apis.sock:/twitter'))
+        self.assertEqual('http://localhost:8080/twitter', unixsocket.to_url('http://localhost:8080/twitter'))
+
+    def test_request(self):
+        url = unixsocket.to_url(f"unix://{self.path}:/twitter")
+        for _ in range(3):
+            response = session.request("GET", f"{url}/users/ricmontagnin")
+            self.assertEqual({'path': '/twitter/users/ricmontagnin'}, response.json())
+
+        # Connections are reused across requests
+        adapter = session.get_session().get_adapter(url)
+        self.assertEqual(1, adapter.get_connection(url).num_connections)
+
+    def test_endpoints(self):
+        with mock.patch.dict('os.environ', {'THEMIS_TWITTER_ENDPOINTS': f"unix://{self.path}:/twitter"}):
+            urls = mirrors.endpoints('twitter', 'https://themis.mainnet.desmos.network/twitter')
+
+        response = mirrors.request(urls, '/tweets/1392033585675317252')
+        self.assertEqual({'path': '/twitter/tweets/1392033585675317252'}, response.json())
+
+    def test_unreachable(self):
+        url = unixsocket.to_url(f"unix://{self.path}.missing:/twitter")
+        session.configure(max_retries=0)
+        with self.assertRaises(requests.exceptions.ConnectionError):
+            session.request("GET", f"{url}/users/ricmontagnin")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,252 @@
+import hashlib
+import json
+import os
+from typing import List
+
+import cryptography.hazmat.primitives.asymmetric.utils as crypto
+from cryptography.exceptions import InvalidSignature
+from cryptography.hazmat.primitives import hashes
+from cryptography.hazmat.primitives.asymmetric import ec
+
+from cache import LRUCache
+from ripemd160 import ripemd160
+
+# Maximum number of parsed public keys that are kept in memory
+PUBLIC_KEYS_CACHE_SIZE = int(os.environ.get("THEMIS_PUBLIC_KEYS_CACHE_SIZE", "1024"))
+
+# Maximum number of signature verification results that are kept in memory
+SIGNATURES_CACHE_SIZE = int(os.environ.get("THEMIS_SIGNATURES_CACHE_SIZE", "8192"))
+
+# Backend used to verify the signatures: "openssl", "secp256k1" or "auto" to use secp256k1 when available
+BACKEND = os.environ.get("THEMIS_VERIFICATION_BACKEND", "auto")
+
+CURVE = ec.SECP256K1()
+CURVE_ORDER = 0xFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFEBAAEDCE6AF48A03BBFD25E8CD0364141
+
+public_keys = LRUCache(PUBLIC_KEYS_CACHE_SIZE)
+signatures = LRUCache(SIGNATURES_CACHE_SIZE)
+
+
+class VerificationData:
+    """
+    Contains the data needed to verify the proof submitted by the user.
+    """
+
+    def __init__(self, address: str, pub_key: str, value: str, signature: str):
+        self.address = address
+        self.pub_key = pub_key
+        self.signature = signature
+        self.value = value
+
+
+class OpenSSLBackend:
+    """
+    Verifies the signatures using the OpenSSL implementation provided by the cryptography package.
+    """
+
+    name = "openssl"
+
+    def parse_public_key(self, pub_key: bytes) -> ec.EllipticCurvePublicKey:
+        return ec.EllipticCurvePublicKey.from_encoded_point(CURVE, pub_key)
+
+    def verify(self, public_key: ec.EllipticCurvePublicKey, r: int, s: int, message: bytes) -> bool:
+        try:
+            public_key.verify(crypto.encode_dss_signature(r, s), message, ec.ECDSA(hashes.SHA256()))
+            return True
+        except InvalidSignature:
+            return False
+
+
+class Secp256k1Backend:
+    """
+    Verifies the signatures using libsecp256k1, through the optional coincurve package.
+    """
+
+    name = "secp256k1"
+
+    def __init__(self):
+        import coincurve
+        from coincurve.ecdsa import cdata_to_der, deserialize_compact
+        self._coincurve = coincurve
+        self._to_der = lambda signature: cdata_to_der(deserialize_compact(signature))
+
+    def parse_public_key(self, pub_key: bytes):
+        return self._coincurve.PublicKey(pub_key)
+
+    def verify(self, public_key, r: int, s: int, message: bytes) -> bool:
+        # libsecp256k1 only accepts lower-S signatures, while OpenSSL accepts both forms
+        if s > CURVE_ORDER // 2:
+            s = CURVE_ORDER - s
+
+        signature = self._to_der(r.to_bytes(32, "big") + s.to_bytes(32, "big"))
+        return public_key.verify(signature, message)
+
+
+BACKENDS = {
+    OpenSSLBackend.name: OpenSSLBackend,
+    Secp256k1Backend.name: Secp256k1Backend,
+}
+
+_backend = None
+
+
+def new_backend(name: str = BACKEND):
+    """
+    Creates the verification backend having the given name.
+    :param name: Name of the backend (either "openssl" or "secp256k1"), or "auto" to use libsecp256k1 when available
+    and fall back to OpenSSL otherwise.
+    :return: The backend instance.
+    :raise Exception if the backend does not exist, or its dependencies are not installed.
+    """
+    if name == "auto":
+        try:
+            return Secp256k1Backend()
+        except ImportError:
+            return OpenSSLBackend()
+
+    if name not in BACKENDS:
+        raise Exception(f"Invalid verification backend: {name}")
+
+    return BACKENDS[name]()
+
+
+def get_backend():
+    """
+    Returns the backend used to verify the signatures, creating it if needed.
+    """
+    global _backend
+    if _backend is None:
+        _backend = new_backend()
+    return _backend
+
+
+def set_backend(name: str):
+    """
+    Replaces the backend used to verify the signatures.
+    :param name: Name of the backend to be used (see new_backend).
+    """
+    global _backend
+    _backend = new_backend(name)
+
+
+def validate_json(json: dict) -> bool:
+    """
+    Tells whether or not the given JSON is a valid signature JSON object.
+    :param json: JSON object to be checked.
+    :return: True if the provided JSON has a valid signature schema, or False otherwise.
+    """
+    return all(key in json for key in ['value', 'pub_key', 'signature', 'address'])
+
+
+def get_public_key(pub_key: str):
+    """
+    Returns the public key instance associated with the given HEX encoded compressed public key.
+    :param pub_key: HEX encoded compressed public key.
+    :return: The public key instance of the current backend.
+    :raise ValueError if the given value is not a valid Secp256k1 public key.
+    """
+    backend = get_backend()
+    key = (backend.name, pub_key.lower())
+    public_key = public_keys.get(key)
+    if public_key is None:
+        public_key = backend.parse_public_key(bytes.fromhex(pub_key))
+        public_keys.put(key, public_key)
+
+    return public_key
+
+
+def cache_key(data: VerificationData) -> tuple:
+    """
+    Returns the key under which the signature verification result of the given data is cached.
+    """
+    return data.pub_key.lower(), data.value.lower(), data.signature.lower()
+
+
+def verify_signature(data: VerificationData) -> bool:
+    """
+    Verifies the signature using the given pubkey and value.
+    :param data: Data used to verify the signature.
+    :return True if the signature is valid, False otherwise
+    """
+    if len(data.signature) != 128:
+        return False
+
+    key = cache_key(data)
+    valid = signatures.get(key)
+    if valid is None:
+        valid = _verify_signature(data)
+        signatures.put(key, valid)
+
+    return valid
+
+
+def verify_many(data: List[VerificationData]) -> List[bool]:
+    """
+    Verifies the signatures of all the given data.
+    Data sharing the same public key are verified one after the other so that the key is parsed only once, and
+    duplicated entries are verified only once.
+    :param data: List of data to be verified.
+    :return: A list containing, for each of the given data, True if its signature is valid or False otherwise.
+    """
+    results = {}
+    for item in sorted(data, key=lambda d: d.pub_key.lower()):
+        key = cache_key(item)
+        if key not in results:
+            results[key] = verify_signature(item)
+
+    return [results[cache_key(d)] for d in data]
+
+
+def _verify_signature(data: VerificationData) -> bool:
+    try:
+        # Read the r and s values of the signature
+        (r, s) = int(data.signature[:64], 16), int(data.signature[64:], 16)
+
+        # Get the public key instance
+        public_key = get_public_key(data.pub_key)
+
+        # Verify the signature
+        return get_backend().verify(public_key, r, s, bytes.fromhex(data.value))
+    except Exception:
+        return False
+
+
+def verify_address(data: VerificationData) -> bool:
+    """
+    Verifies that the given address is the one associated with the provided HEX encoded compact public key.
+    :param data: Data used to verify the address
+    """
+    s = hashlib.sha256(bytes.fromhex(data.pub_key)).digest()
+    r = ripemd160(s)
+    return data.address.upper() == r.hex().upper()
+
+
+def cache_stats() -> dict:
+    """
+    Returns the hits and misses counters of the public keys and signatures caches.
+    """
+    return {"public_keys": public_keys.stats(), "signatures": signatures.stats()}
+
+
+def save_cache(path: str):
+    """
+    Saves the signature verification results to the file at the given path, so that they can be loaded later.
+    :param path: Path of the file to be written.
+    """
+    entries = [[pub_key, value, signature, valid] for (pub_key, value, signature), valid in signatures.items()]
+    with open(path + ".tmp", "w") as file:
+        json.dump(entries, file)
+    os.replace(path + ".tmp", path)
+
+
+def load_cache(path: str):
+    """
+    Loads the signature verification results previously saved using save_cache, if the file exists.
+    :param path: Path of the file to be read.
+    """
+    if not os.path.exists(path):
+        return
+
+    with open(path) as file:
+        for pub_key, value, signature, valid in json.load(file):
+            signatures.put((pub_key, value, signature), valid)
@@ -0,0 +1,97 @@
+import importlib.util
+import os
+import tempfile
+import unittest
+
+import verification
+
+VALID_DATA = verification.VerificationData(
+    '8902A4822B87C1ADED60AE947044E614BD4CAEE2',
+    '033024e9e0ad4f93045ef5a60bb92171e6418cd13b082e7a7bc3ed05312a0b417d',
+    '7269636d6f6e7461676e696e',
+    'a00a7d5bd45e42615645fcaeb4d800af22704e54937ab235e5e50bebd38e88b765fdb696c22712c0cab1176756b6346cbc11481c544d1f7828cb233620c06173',
+)
+
+INVALID_DATA = verification.VerificationData(
+    '8902A4822B87C1ADED60AE947044E614BD4CAEE2',
+    '033024e9e0ad4f93045ef5a60bb92171e6418cd13b082e7a7bc3ed05312a0b417d',
+    '7269636d6f6e7461676e69',
+    'a00a7d5bd45e42615645fcaeb4d800af22704e54937ab235e5e50bebd38e88b765fdb696c22712c0cab1176756b6346cbc11481c544d1f7828cb233620c06173',
+)
+
+HAS_COINCURVE = importlib.util.find_spec('coincurve') is not None
+
+
+def high_s(data: verification.VerificationData) -> verification.VerificationData:
+    """
+    Returns a copy of the given data having the same signature, expressed in its upper-S form.
+    """
+    s = verification.CURVE_ORDER - int(data.signature[64:], 16)
+    return verification.VerificationData(data.address, data.pub_key, data.value, data.signature[:64] + f'{s:064x}')
+
+
+class VerificationTest(unittest.TestCase):
+
+    def setUp(self):
+        verification.public_keys.clear()
+        verification.signatures.clear()
+
+    def tearDown(self):
+        verification.set_backend(verification.BACKEND)
+
+    def test_backends(self):
+        backends = ['openssl']
+        if HAS_COINCURVE:
+            backends.append('secp256k1')
+
+        for backend in backends:
+            verification.set_backend(backend)
+            verification.signatures.clear()
+            self.assertEqual(backend, verification.get_backend().name)
+            self.assertTrue(verification.verify_signature(VALID_DATA), backend)
+            self.assertTrue(verification.verify_signature(high_s(VALID_DATA)), backend)
+            self.assertFalse(verification.verify_signature(INVALID_DATA), backend)
+
+        with self.assertRaises(Exception):
+            verification.set_backend('invalid')
+
+    def test_verify_many(self):
+        data = [VALID_DATA, INVALID_DATA, VALID_DATA, high_s(VALID_DATA)]
+        self.assertEqual([True, False, True, True], verification.verify_many(data))
+        self.assertEqual(3, verification.cache_stats()['signatures']['misses'])
+
+    def test_verify_signature_cache(self):
+        self.assertTrue(verification.verify_signature(VALID_DATA))
+        self.assertTrue(verification.verify_signature(VALID_DATA))
+        self.assertFalse(verification.verify_signature(INVALID_DATA))
+        self.assertFalse(verification.verify_signature(INVALID_DATA))
+
+        stats = verification.cache_stats()
+        self.assertEqual(2, stats['signatures']['hits'])
+        self.assertEqual(2, stats['signatures']['misses'])
+
+        # The public key is shared by both the valid and invalid data, so it should be parsed only once
+        self.assertEqual(1, stats['public_keys']['hits'])
+        self.assertEqual(1, stats['public_keys']['misses'])
+
+    def test_save_and_load_cache(self):
+        verification.verify_signature(VALID_DATA)
+        verification.verify_signature(INVALID_DATA)
+
+        path = os.path.join(tempfile.mkdtemp(), 'signatures.json')
+        verification.save_cache(path)
+
+        verification.signatures.clear()
+        verification.load_cache(path)
+        self.assertEqual(2, len(verification.signatures))
+
+        self.assertTrue(verification.verify_signature(VALID_DATA))
+        self.assertFalse(verification.verify_signature(INVALID_DATA))
+        self.assertEqual(2, verification.cache_stats()['signatures']['hits'])
+
+        # Loading a missing file should not fail
+        verification.load_cache(path + '.missing')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,215 @@
+import asyncio
+import multiprocessing
+import os
+import queue
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import List, Optional, Tuple, Union
+
+import aio
+import metrics
+import verification
+from verification import VerificationData
+
+# Whether the daemon and batch modes should verify the signatures inside a process pool
+ENABLED = os.environ.get("THEMIS_VERIFICATION_POOL", "1") != "0"
+
+# Number of processes verifying the signatures when the pool is started. 0 means one for each CPU core
+WORKERS = int(os.environ.get("THEMIS_VERIFICATION_WORKERS", "0"))
+
+# Maximum number of verifications sent to a process at once, so that the IPC cost is shared among them
+CHUNK_SIZE = int(os.environ.get("THEMIS_VERIFICATION_CHUNK_SIZE", "32"))
+
+# Maximum number of verifications waiting to be sent to a process. Once reached, new verifications wait for a slot
+MAX_PENDING = int(os.environ.get("THEMIS_VERIFICATION_MAX_PENDING", "1024"))
+
+_pool = None
+_lock = threading.Lock()
+
+
+def _verify(data: VerificationData) -> Tuple[bool, bool]:
+    """
+    Verifies the signature of the given data and, only if it is valid, its address. The public key of a valid signature
+    is always a valid HEX string, while the one of an invalid signature might not be.
+    """
+    signature_valid = verification.verify_signature(data)
+    return signature_valid, signature_valid and verification.verify_address(data)
+
+
+def _verify_chunk(jobs: List[Tuple[str, str, str, str]]) -> List[Union[Tuple[bool, bool], Exception]]:
+    """
+    Verifies the signature and address of each of the given (address, pub_key, value, signature) tuples.
+    This runs inside the worker processes.
+    :return: For each job, either its (signature valid, address valid) tuple or the exception it raised, so that a
+    malformed job only fails the invocation that submitted it.
+    """
+    results = []
+    for job in jobs:
+        try:
+            results.append(_verify(VerificationData(*job)))
+        except Exception as err:
+            results.append(err)
+    return results
+
+
+class VerificationPool:
+    """
+    Verifies signatures and addresses inside a pool of processes, so that the CPU-bound verifications of many
+    concurrent invocations do not compete for the GIL.
+
+    Verifications are queued and sent to the processes in chunks of at most the given size. Both the queue and the
+    number of chunks being verified at the same time are bounded, so that memory usage stays flat however many
+    verifications are requested: once they are full, new verifications wait for a slot.
+    """
+
+    def __init__(self, workers: int, chunk_size: int = CHUNK_SIZE, max_pending: int = MAX_PENDING):
+        self.workers = workers
+        self.chunk_size = chunk_size
+        # Processes are spawned rather than forked, since the parent process is running other threads
+        self._executor = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn"))
+        self._queue = queue.Queue(maxsize=max_pending)
+        self._chunks = threading.BoundedSemaphore(workers * 2)
+        self._thread = threading.Thread(target=self._dispatch, daemon=True)
+        self._thread.start()
+
+    def submit(self, data: VerificationData, block: bool = True) -> Future:
+        """
+        Queues the verification of the given data, waiting for a slot if too many verifications are pending.
+        :param block: Whether to wait for a slot. If False and no slot is free, queue.Full is raised.
+        :return: A future resolving to a (signature valid, address valid) tuple. Once queued, the verification cannot
+        be cancelled.
+        """
+        future = Future()
+        future.set_running_or_notify_cancel()
+        self._queue.put(((data.address, data.pub_key, data.value, data.signature), future), block=block)
+        return future
+
+    def _dispatch(self):
+        while True:
+            job = self._queue.get()
+            if job is None:
+                return
+
+            # Send together all the verifications that are already waiting, up to the chunk size
+            chunk = [job]
+            while len(chunk) < self.chunk_size:
+                try:
+                    job = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+
+                if job is None:
+                    self._send(chunk)
+                    return
+                chunk.append(job)
+
+            self._send(chunk)
+
+    def _send(self, chunk: list):
+        self._chunks.acquire()
+        metrics.increment("verifier.chunks")
+        metrics.increment("verifier.jobs", len(chunk))
+
+        try:
+            result = self._executor.submit(_verify_chunk, [job for job, _ in chunk])
+        except Exception as err:
+            self._chunks.release()
+            for _, future in chunk:
+                future.set_exception(err)
+            return
+
+        result.add_done_callback(lambda done: self._resolve(chunk, done))
+
+    def _resolve(self, chunk: list, done: Future):
+        self._chunks.release()
+        try:
+            results = done.result()
+        except Exception as err:
+            for _, future in chunk:
+                future.set_exception(err)
+            return
+
+        for (_, future), result in zip(chunk, results):
+            if isinstance(result, Exception):
+                future.set_exception(result)
+            else:
+                future.set_result(result)
+
+    def shutdown(self):
+        """
+        Verifies all the pending data, and stops the processes.
+        """
+        self._queue.put(None)
+        self._thread.join()
+        self._executor.shutdown(wait=True)
+
+
+def start(workers: Optional[int] = None):
+    """
+    Starts the process pool used by verify, unless it is already running.
+    :param workers: Number of processes. If None, THEMIS_VERIFICATION_WORKERS is used, or the number of CPU cores.
+    """
+    global _pool
+    with _lock:
+        if _pool is None:
+            _pool = VerificationPool(workers or WORKERS or os.cpu_count() or 1)
+
+
+def stop():
+    """
+    Stops the process pool, if running. Following verifications run inside the calling thread.
+    """
+    global _pool
+    with _lock:
+        pool, _pool = _pool, None
+
+    if pool is not None:
+        pool.shutdown()
+
+
+def verify(data: VerificationData) -> Tuple[bool, bool]:
+    """
+    Verifies the signature of the given data and, only if it is valid, its address.
+    When the process pool is running, signatures that are not cached yet are verified inside one of its processes,
+    and the result is cached inside the calling process as well. Otherwise, everything runs inside the calling thread.
+    :return: A (signature valid, address valid) tuple.
+    """
+    pool = _pool
+    if pool is None or len(data.signature) != 128:
+        return _verify(data)
+
+    key = verification.cache_key(data)
+    signature_valid = verification.signatures.get(key)
+    if signature_valid is not None:
+        return signature_valid, signature_valid and verification.verify_address(data)
+
+    signature_valid, address_valid = pool.submit(data).result()
+    verification.signatures.put(key, signature_valid)
+    return signature_valid, address_valid
+
+
+async def verify_async(data: VerificationData) -> Tuple[bool, bool]:
+    """
+    Asynchronous version of verify. When the process pool is running, the coroutine awaits the verification performed
+    by the pool without holding any thread of the shared executor, which is left to the network operations.
+    Otherwise, the verification runs inside the shared executor.
+    :return: A (signature valid, address valid) tuple.
+    """
+    pool = _pool
+    if pool is None or len(data.signature) != 128:
+        return await aio.run(_verify, data)
+
+    key = verification.cache_key(data)
+    signature_valid = verification.signatures.get(key)
+    if signature_valid is not None:
+        return signature_valid, signature_valid and verification.verify_address(data)
+
+    try:
+        future = pool.submit(data, block=False)
+    except queue.Full:
+        # Wait for a slot without blocking the event loop
+        future = await aio.run(pool.submit, data)
+
+    signature_valid, address_valid = await asyncio.wrap_future(future)
+    verification.signatures.put(key, signature_valid)
+    return signature_valid, address_valid
@@ -0,0 +1,90 @@
+import asyncio
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from unittest import mock
+
+import aio
+import metrics
+import verification
+import verifier
+from verification import VerificationData
+from verification_test import INVALID_DATA, VALID_DATA
+
+
+class VerifierTest(unittest.TestCase):
+
+    def setUp(self):
+        verification.signatures.clear()
+        metrics.reset()
+
+    def tearDown(self):
+        verifier.stop()
+
+    def test_verify_inline(self):
+        self.assertEqual((True, True), verifier.verify(VALID_DATA))
+        self.assertEqual((False, False), verifier.verify(INVALID_DATA))
+
+    def test_verify_malformed_pub_key(self):
+        data = VerificationData(VALID_DATA.address, "zz", VALID_DATA.value, VALID_DATA.signature)
+        self.assertEqual((False, False), verifier.verify(data))
+
+    def test_verify_pool(self):
+        verifier.start(2)
+
+        data = [VALID_DATA, INVALID_DATA] * 50
+        with ThreadPoolExecutor(max_workers=20) as executor:
+            results = list(executor.map(verifier.verify, data))
+
+        self.assertEqual([(True, True), (False, False)] * 50, results)
+
+        # Results are cached inside the calling process as well
+        self.assertTrue(verification.signatures.get(verification.cache_key(VALID_DATA)))
+
+        counters = metrics.snapshot()['counters']
+        self.assertLessEqual(counters['verifier.jobs'], len(data))
+
+    def test_verify_async(self):
+        self.assertEqual((True, True), asyncio.run(verifier.verify_async(VALID_DATA)))
+        verification.signatures.clear()
+
+        async def verify_all(data):
+            return await asyncio.gather(*[verifier.verify_async(item) for item in data])
+
+        # Verifications performed by the pool do not hold any thread of the shared executor
+        verifier.start(2)
+        data = [VALID_DATA, INVALID_DATA] * 50
+        with mock.patch.object(aio, 'run', side_effect=AssertionError('executor thread used')):
+            self.assertEqual([(True, True), (False, False)] * 50, asyncio.run(verify_all(data)))
+
+        # Known signatures do not leave the calling process
+        chunks = metrics.snapshot()['counters']['verifier.chunks']
+        self.assertEqual((True, True), asyncio.run(verifier.verify_async(VALID_DATA)))
+        self.assertEqual(chunks, metrics.snapshot()['counters']['verifier.chunks'])
+
+    def test_pool_chunks(self):
+        pool = verifier.VerificationPool(1, chunk_size=8, max_pending=64)
+        try:
+            # Verifications queued while the process is busy are sent together
+            futures = [pool.submit(VALID_DATA) for _ in range(32)]
+            self.assertEqual([(True, True)] * 32, [future.result(timeout=30) for future in futures])
+            self.assertLess(metrics.snapshot()['counters']['verifier.chunks'], 32)
+        finally:
+            pool.shutdown()
+
+    def test_pool_job_failure(self):
+        pool = verifier.VerificationPool(1, chunk_size=8, max_pending=64)
+        try:
+            # A job failing inside the process does not fail the other jobs of its chunk
+            malformed = VerificationData(None, VALID_DATA.pub_key, VALID_DATA.value, VALID_DATA.signature)
+            bad_key = VerificationData(VALID_DATA.address, "zz", VALID_DATA.value, VALID_DATA.signature)
+            futures = [pool.submit(data) for data in [VALID_DATA] * 3 + [malformed, bad_key] + [VALID_DATA] * 3]
+
+            self.assertRaises(AttributeError, futures[3].result, timeout=30)
+            results = [future.result(timeout=30) for i, future in enumerate(futures) if i != 3]
+            self.assertEqual([(True, True)] * 3 + [(False, False)] + [(True, True)] * 3, results)
+        finally:
+            pool.shutdown()
+
+
+if __name__ == '__main__':
+    unittest.main()